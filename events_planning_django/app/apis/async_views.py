@@ -0,0 +1,308 @@
+import time
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views import View
+from rest_framework.exceptions import (
+    APIException,
+    NotAuthenticated,
+    NotFound,
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from app.caching.generations import CacheGenerations
+from app.caching.metrics import CacheMetrics
+from app.caching.responses import (
+    build_etag,
+    build_response_key,
+    get_origin,
+    get_query_defaults,
+    normalize_path,
+)
+from app.compression import ResponseCompressor
+from app.connections import get_async_redis
+from app.models import Event, Ticket, Order
+from .authentication import AsyncTokenAuthentication, SignedTokenAuthentication
+from .filters import EventFilter, TicketFilter
+from .planner import QueryPlanner
+from .renderers import ORJSONRenderer
+from .pagination import EventPagination, TicketPagination
+from .serializers import EventSerializer, TicketSerializer
+from . import permissions as custom_permissions
+
+
+class AsyncReadView(View):
+    """Read-only async view running the same auth, permissions, filters and
+    serializers as the DRF views, with the async ORM and an async Redis cache.
+    """
+
+    authenticators = [SignedTokenAuthentication(), AsyncTokenAuthentication()]
+    renderer = ORJSONRenderer()
+    permission_classes = []
+    filterset_class = None
+    search_fields = None
+    pagination_class = None
+    cache_resource = None
+    cache_timeout = 60 * 60 * 2
+
+    async def get(self, request, *args, **kwargs):
+        request = Request(request)
+        try:
+            request.user = await self.authenticate(request)
+            self.check_permissions(request)
+
+            key = await self.get_cache_key(request, *args, **kwargs)
+            if key is None:
+                return self.render_body(
+                    self.renderer.render(await self.get_data(request, *args, **kwargs))
+                )
+
+            etag = build_etag(key)
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                await CacheMetrics.arecord(self.cache_resource, not_modified=1)
+            else:
+                encoding = ResponseCompressor.negotiate(request)
+                encoded_key = f"{key}:{encoding}"
+                if encoding is None:
+                    body, encoded = await get_async_redis().get(key), None
+                else:
+                    body, encoded = await get_async_redis().mget(key, encoded_key)
+                if body is not None:
+                    await CacheMetrics.arecord(self.cache_resource, hits=1)
+                else:
+                    started = time.monotonic()
+                    data = await self.get_data(request, *args, **kwargs)
+                    body = self.renderer.render(data)
+                    await get_async_redis().set(key, body, ex=self.cache_timeout)
+                    encoded = None
+                    await CacheMetrics.arecord(
+                        self.cache_resource,
+                        misses=1,
+                        fills=1,
+                        fill_ms=(time.monotonic() - started) * 1000,
+                        bytes=len(body),
+                    )
+                response = self.render_body(body)
+                response["ETag"] = etag
+                if encoding is not None:
+                    response = await self.compress(
+                        response, encoding, key, encoded_key, encoded
+                    )
+                return response
+            response["ETag"] = etag
+            return response
+
+        except APIException as exc:
+            response = self.render_body(
+                self.renderer.render({"detail": exc.detail}), status=exc.status_code
+            )
+            if isinstance(exc, NotAuthenticated):  # a 401 names the scheme
+                scheme = self.authenticators[0].authenticate_header(request)
+                response["WWW-Authenticate"] = scheme
+            return response
+
+    async def authenticate(self, request):
+        forced = getattr(request._request, "_force_auth_user", None)
+        if forced is not None:  # authenticated once for a batch
+            return forced
+        for authenticator in self.authenticators:
+            result = await authenticator.aauthenticate(request)
+            if result is not None:
+                return result[0]
+        return AnonymousUser()
+
+    def check_permissions(self, request):
+        """Deny the request unless every permission grants it, as
+        ``APIView.check_permissions`` does.
+
+        Raises:
+            NotAuthenticated: A permission refused an anonymous request
+            PermissionDenied: A permission refused an authenticated request
+        """
+        for permission in self.permission_classes:
+            permission = permission()
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise NotAuthenticated()
+                raise PermissionDenied(
+                    detail=getattr(permission, "message", None),
+                    code=getattr(permission, "code", None),
+                )
+
+    async def compress(self, response, encoding, key, encoded_key, encoded):
+        """Compress a cached response, storing its compressed body next to
+        the entry, for the entry's remaining lifetime, unless it was read."""
+        if not ResponseCompressor.should_compress(response):
+            return response
+        patch_vary_headers(response, ["Accept-Encoding"])
+        if encoded is None:
+            encoded = ResponseCompressor.compress(response.content, encoding)
+            ttl = await get_async_redis().ttl(key)
+            await get_async_redis().set(
+                encoded_key, encoded, ex=ttl if ttl > 0 else self.cache_timeout
+            )
+        if len(encoded) >= len(response.content):
+            return response
+        return ResponseCompressor.apply(response, encoding, encoded)
+
+    def render_body(self, body, status=200):
+        return HttpResponse(body, content_type=self.renderer.media_type, status=status)
+
+    @property
+    def paginator(self):
+        if self.pagination_class is None:
+            return None
+        return self.pagination_class()
+
+    def get_cache_scopes(self, request, *args, **kwargs):
+        """The scopes of ``cache_resource`` the response is built under."""
+        return [None]
+
+    def get_cache_variant(self, request, *args, **kwargs):
+        return None
+
+    async def get_cache_key(self, request, *args, **kwargs):
+        """Build the cache key of a request, or None to skip caching.
+
+        Keys embed the same generation counters as the sync views' entries,
+        so the signal receivers invalidate both at once.
+        """
+        if self.cache_resource is None:
+            return None
+        generations = await CacheGenerations.aget_many(
+            [
+                CacheGenerations.key(self.cache_resource, scope)
+                for scope in self.get_cache_scopes(request, *args, **kwargs)
+            ]
+        )
+        return cache.make_key(
+            build_response_key(
+                self.cache_resource,
+                generations,
+                normalize_path(request, get_query_defaults(self.paginator)),
+                self.get_cache_variant(request, *args, **kwargs),
+                self.renderer.media_type,
+                get_origin(request),
+            )
+        )
+
+    def filter_queryset(self, request, queryset):
+        if self.filterset_class is not None:
+            filterset = self.filterset_class(
+                request.query_params, queryset=queryset, request=request
+            )
+            if not filterset.is_valid():
+                raise ValidationError(filterset.errors)
+            queryset = filterset.qs
+        if self.search_fields:
+            queryset = SearchFilter().filter_queryset(request, queryset, self)
+        return queryset
+
+    async def get_data(self, request, *args, **kwargs):
+        raise NotImplementedError("Subclasses must implement get_data()")
+
+
+class AsyncEventListView(AsyncReadView):
+    filterset_class = EventFilter
+    search_fields = ["title", "organiser__username"]
+    pagination_class = EventPagination
+    cache_resource = "events"
+
+    async def get_data(self, request):
+        queryset = self.filter_queryset(
+            request,
+            QueryPlanner.apply(
+                Event.objects.all(), EventSerializer(context={"request": request})
+            ),
+        )
+        paginator = self.paginator
+        page = await paginator.apaginate_queryset(queryset, request)
+        return paginator.get_paginated_response(
+            EventSerializer(page, many=True, context={"request": request}).data
+        ).data
+
+
+class AsyncEventDetailView(AsyncReadView):
+    cache_resource = "events"
+
+    def get_cache_scopes(self, request, pk):
+        return [f"event:{pk}"]
+
+    async def get_data(self, request, pk):
+        try:
+            event = await QueryPlanner.apply(
+                Event.objects.all(), EventSerializer(context={"request": request})
+            ).aget(pk=pk)
+        except Event.DoesNotExist:
+            raise NotFound("Event not found.")
+        return EventSerializer(event, context={"request": request}).data
+
+
+class AsyncTicketListView(AsyncReadView):
+    permission_classes = [custom_permissions.IsOrganiser]
+    filterset_class = TicketFilter
+    search_fields = ["ticket_code", "event__title", "attendee__username"]
+    pagination_class = TicketPagination
+    cache_resource = "tickets"
+
+    def get_cache_scopes(self, request):
+        return [f"organiser:{request.user.id}"]
+
+    def get_cache_variant(self, request):
+        # tickets are scoped to the organiser, so is their cache entry
+        return f"user-{request.user.id}"
+
+    async def get_data(self, request):
+        queryset = self.filter_queryset(
+            request,
+            QueryPlanner.apply(
+                Ticket.objects.filter(event__organiser=request.user),
+                TicketSerializer(context={"request": request}),
+            ),
+        )
+        paginator = self.paginator
+        page = await paginator.apaginate_queryset(queryset, request)
+        return paginator.get_paginated_response(
+            TicketSerializer(page, many=True, context={"request": request}).data
+        ).data
+
+
+class AsyncOrganiserDashboardView(AsyncReadView):
+    permission_classes = [custom_permissions.IsOrganiser]
+    cache_resource = "dashboard"
+    cache_timeout = 60 * 2
+
+    def get_cache_scopes(self, request):
+        return [f"organiser:{request.user.id}"]
+
+    def get_cache_variant(self, request):
+        return f"user-{request.user.id}"
+
+    async def get_data(self, request):
+        user = request.user
+        events = Event.objects.filter(organiser=user)
+        tickets = Ticket.objects.filter(event__organiser=user)
+
+        return {
+            "events_count": await events.acount(),
+            "orders_count": await Order.objects.for_organiser(user).acount(),
+            "tickets": {
+                "count": await tickets.acount(),
+                "sold": await tickets.filter(attendee__isnull=False).acount(),
+                "unsold": await tickets.filter(attendee__isnull=True).acount(),
+            },
+            "events": [
+                event
+                async for event in events.annotate(
+                    tickets_sold=Count("tickets", Q(tickets__attendee__isnull=False)),
+                    tickets_total=Count("tickets"),
+                )
+                .values("id", "title", "tickets_sold", "tickets_total")
+                .order_by("-date_time")[:5]
+            ],
+        }
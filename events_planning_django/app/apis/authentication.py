@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from drf_spectacular.plumbing import build_bearer_security_scheme_object
+from rest_framework.authentication import (
+    BaseAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.exceptions import AuthenticationFailed
+from app.connections import get_async_redis
+from app.services.tokens import AccessTokenService
+
+
+def get_credentials(request, keyword):
+    """Returns the credentials of an ``Authorization: <keyword> <credentials>``
+    header, or None when the header uses another scheme."""
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != keyword.lower().encode():
+        return None
+
+    if len(auth) != 2:
+        raise AuthenticationFailed("Invalid token header.")
+
+    try:
+        return auth[1].decode()
+    except UnicodeError:
+        raise AuthenticationFailed("Invalid token header.")
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    """Authenticates ``Authorization: Bearer <token>`` signed access tokens.
+
+    ``request.auth`` is set to the verified token payload.
+    """
+
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        token = get_credentials(request, self.keyword)
+        if token is None:
+            return None
+
+        try:
+            return AccessTokenService.authenticate(token)
+        except ValueError as e:
+            raise AuthenticationFailed(str(e))
+
+    async def aauthenticate(self, request):
+        """Async counterpart of ``authenticate`` for async views."""
+        token = get_credentials(request, self.keyword)
+        if token is None:
+            return None
+
+        try:
+            payload = AccessTokenService.verify(token)
+            keys = AccessTokenService.lookup_keys(payload)
+            values = await get_async_redis().mget([cache.make_key(k) for k in keys])
+            user = AccessTokenService.resolve(
+                payload,
+                {
+                    key: cache.client.decode(value)
+                    for key, value in zip(keys, values)
+                    if value is not None
+                },
+            )
+            if user is None:
+                user = await AccessTokenService.aload_principal(payload["uid"])
+        except ValueError as e:
+            raise AuthenticationFailed(str(e))
+
+        return user, payload
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class AsyncTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication with a coroutine counterpart for async views."""
+
+    async def aauthenticate(self, request):
+        """Resolve the user of a ``Token <key>`` header with the async ORM.
+
+        Returns:
+            tuple | None: ``(user, token)``, or None when no token header is sent
+        """
+        key = get_credentials(request, self.keyword)
+        if key is None:
+            return None
+
+        try:
+            token = await self.get_model().objects.select_related("user").aget(key=key)
+        except self.get_model().DoesNotExist:
+            raise AuthenticationFailed("Invalid token.")
+
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive or deleted.")
+
+        return token.user, token
+
+
+class SignedTokenScheme(OpenApiAuthenticationExtension):
+    target_class = "app.apis.authentication.SignedTokenAuthentication"
+    name = "SignedTokenAuth"
+
+    def get_security_definition(self, auto_schema):
+        return build_bearer_security_scheme_object(
+            header_name="AUTHORIZATION", token_prefix="Bearer"
+        )
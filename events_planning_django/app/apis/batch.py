@@ -0,0 +1,197 @@
+import inspect
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_to_bytes
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.urls import Resolver404, resolve
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
+from rest_framework import views
+from .renderers import ORJSONRenderer
+from .serializers import BatchSerializer
+
+logger = logging.getLogger("app")
+
+# headers of the batch request its sub-requests do not inherit: their body
+# is always JSON, they are authenticated with the batch's user and their
+# responses are neither compressed nor conditional
+EXCLUDED_META = {
+    "CONTENT_TYPE",
+    "CONTENT_LENGTH",
+    "HTTP_AUTHORIZATION",
+    "HTTP_ACCEPT_ENCODING",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+}
+
+
+async def _awaited(awaitable):
+    return await awaitable
+
+
+class BatchDispatcher:
+    """Runs the sub-requests of a batch through the URL router, as the
+    handler would, without repeating authentication and middleware.
+
+    Sub-requests run in order, except that consecutive reads run at once on
+    ``BATCH_REQUESTS["MAX_WORKERS"]`` threads; writes wait for the reads
+    before them and the reads after them wait for the write. Each
+    sub-request commits on its own, a batch is not atomic.
+    """
+
+    renderer = ORJSONRenderer()
+
+    def __init__(self, request):
+        self.request = request
+
+    def run(self, specs):
+        """Dispatch sub-requests.
+
+        Args:
+            specs (list): Validated ``BatchRequestSerializer`` data
+        Returns:
+            list: The encoded result of each sub-request, in order
+        """
+        results = [None] * len(specs)
+        reads = []
+        with ThreadPoolExecutor(settings.BATCH_REQUESTS["MAX_WORKERS"]) as executor:
+            for i, spec in enumerate(specs):
+                if spec["method"] == "GET":
+                    reads.append(i)
+                    continue
+                self.run_reads(executor, specs, reads, results)
+                reads = []
+                results[i] = self.encode(spec, *self.dispatch(spec))
+            self.run_reads(executor, specs, reads, results)
+        return results
+
+    def run_reads(self, executor, specs, reads, results):
+        if len(reads) == 1:  # not worth a thread
+            outcomes = [self.dispatch(specs[reads[0]])]
+        else:
+            outcomes = executor.map(self.dispatch_in_thread, [specs[i] for i in reads])
+        for i, outcome in zip(reads, outcomes):
+            results[i] = self.encode(specs[i], *outcome)
+
+    def dispatch_in_thread(self, spec):
+        try:
+            return self.dispatch(spec)
+        finally:
+            connections.close_all()  # the thread's, it is not reused
+
+    def dispatch(self, spec):
+        """Run a sub-request.
+
+        Returns:
+            tuple: The status code, content type and body of its response
+        """
+        sub = self.build_request(spec)
+        try:
+            match = resolve(sub.path_info)
+        except Resolver404:
+            return self.error(404, "Not found.")
+        if getattr(match.func, "view_class", None) is BatchView:
+            return self.error(400, "Batches cannot be nested.")
+
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+            if inspect.isawaitable(response):  # an async view
+                response = async_to_sync(_awaited)(response)
+            if hasattr(response, "render"):
+                response.render()  # runs post-render callbacks, e.g. caching
+        except Http404:
+            return self.error(404, "Not found.")
+        except Exception:
+            logger.exception("Batched %s %s failed", spec["method"], spec["path"])
+            return self.error(500, "A server error occurred.")
+
+        if response.streaming:
+            response.close()
+            return self.error(400, "Streaming responses cannot be batched.")
+        return (
+            response.status_code,
+            response.get("Content-Type", ""),
+            response.content,
+        )
+
+    def build_request(self, spec):
+        path, _, query = spec["path"].partition("?")
+        body = self.renderer.render(spec["body"]) if "body" in spec else b""
+        meta = {
+            key: value
+            for key, value in self.request.META.items()
+            if key not in EXCLUDED_META
+        }
+        meta.update(
+            {
+                "REQUEST_METHOD": spec["method"],
+                "PATH_INFO": unquote_to_bytes(path).decode("iso-8859-1"),
+                "QUERY_STRING": query,
+                "CONTENT_TYPE": "application/json",
+                "CONTENT_LENGTH": str(len(body)),
+                "HTTP_ACCEPT": "application/json",
+                "wsgi.input": io.BytesIO(body),
+                # ASGI requests carry their scheme outside META, and
+                # responses build absolute links with it
+                "wsgi.url_scheme": self.request.scheme,
+            }
+        )
+        sub = WSGIRequest(meta)
+        if self.request.user.is_authenticated:  # authenticated once per batch
+            sub._force_auth_user = self.request.user
+            sub._force_auth_token = self.request.auth
+        return sub
+
+    def error(self, status_code, detail):
+        body = self.renderer.render({"detail": detail})
+        return status_code, "application/json", body
+
+    def encode(self, spec, status_code, content_type, content):
+        """Encode a result, splicing JSON bodies in as they were rendered."""
+        head = {"status": status_code}
+        if "id" in spec:
+            head = {"id": spec["id"], **head}
+        if not content:
+            body = b"null"
+        elif content_type.startswith("application/json"):
+            body = content
+        else:
+            body = self.renderer.render(content.decode("utf-8", "replace"))
+        return self.renderer.render(head)[:-1] + b',"body":' + body + b"}"
+
+
+class BatchView(views.APIView):
+    """Folds several API calls into one round trip.
+
+    The batch is authenticated once and its sub-requests run with its user.
+    Responses come back in order, each with its status code and body.
+    """
+
+    @extend_schema(
+        request=BatchSerializer,
+        responses={200: OpenApiResponse(description="The sub-requests' responses.")},
+        examples=[
+            OpenApiExample(
+                "Home screen",
+                request_only=True,
+                value={
+                    "requests": [
+                        {"id": "events", "path": "/api/events/?page_size=5"},
+                        {"id": "orders", "path": "/api/orders/"},
+                    ]
+                },
+            )
+        ],
+    )
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = BatchDispatcher(request).run(serializer.validated_data["requests"])
+        return HttpResponse(
+            b'{"responses":[' + b",".join(results) + b"]}",
+            content_type="application/json",
+        )
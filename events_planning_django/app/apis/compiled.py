@@ -0,0 +1,180 @@
+import datetime
+import decimal
+from operator import attrgetter
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+
+# fields whose ``to_representation`` is exactly a builtin conversion
+CONVERTERS = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+}
+
+
+def _identity(value):
+    return value
+
+
+def _datetime_converter(field):
+    """``DateTimeField.to_representation`` with the timezone and format
+    resolved once, for aware datetimes rendered in ISO 8601."""
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, "timezone") else None
+    if field_timezone is None:
+        field_timezone = field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if type(value) is not datetime.datetime or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def _decimal_converter(field):
+    """``DecimalField.to_representation`` with the quantizing exponent and
+    context built once, for decimals rendered as strings."""
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    if not coerce_to_string or field.localize or field.decimal_places is None:
+        return field.to_representation
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if type(value) is not decimal.Decimal:
+            return field.to_representation(value)
+        return "{:f}".format(value.quantize(exponent, rounding, context))
+
+    return convert
+
+
+def _choice_converter(field):
+    choices = field.choice_strings_to_values
+
+    def convert(value):
+        if value == "":
+            return value
+        return choices.get(str(value), value)
+
+    return convert
+
+
+def _model_path(model, attrs):
+    """Whether ``attrs`` only goes through fields of ``model``, to-one
+    relations and then a field, which plain attribute access reads."""
+    for attr in attrs:
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return False
+        if field.many_to_many or field.one_to_many:
+            return False
+        model = field.related_model
+    return True
+
+
+class CompiledSerializerMixin:
+    """Renders model instances with accessors compiled once per serializer
+    instance, instead of DRF's per-field, per-object dispatch.
+
+    Every readable field becomes a getter and a converter:
+        - model field sources are read with ``operator.attrgetter``, falling
+          back to ``Field.get_attribute`` on a missing relation so defaults,
+          nulls and skipped fields behave as in DRF
+        - primary key related fields read the foreign key column
+        - char, integer and float fields convert with the builtin, and
+          choice, datetime and decimal fields resolve their choices,
+          timezone, format and quantizing once
+        - method fields call the bound method
+        - anything else keeps its ``get_attribute`` and ``to_representation``
+
+    The output is identical to ``Serializer.to_representation``, which
+    still renders anything but model instances, and everything when
+    ``use_compiled`` is off.
+    """
+
+    use_compiled = True
+
+    def compile_fields(self):
+        """Build the ``(name, getter, converter)`` of every readable field."""
+        model = getattr(getattr(self, "Meta", None), "model", None)
+        return [
+            (field.field_name, *self.compile_field(field, model))
+            for field in self._readable_fields
+        ]
+
+    def compile_field(self, field, model):
+        if isinstance(field, serializers.SerializerMethodField):
+            return _identity, getattr(self, field.method_name)
+
+        generic = (field.get_attribute, field.to_representation)
+        attrs = field.source_attrs
+        if model is None or not attrs or not _model_path(model, attrs):
+            return generic
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            model_field = model._meta.get_field(attrs[0])
+            if len(attrs) > 1 or not model_field.concrete or field.pk_field:
+                return generic
+            return self._fast_getter(field, model_field.attname), _identity
+
+        if type(field) is serializers.DateTimeField:
+            convert = _datetime_converter(field)
+        elif type(field) is serializers.DecimalField:
+            convert = _decimal_converter(field)
+        elif type(field) is serializers.ChoiceField:
+            convert = _choice_converter(field)
+        else:
+            convert = CONVERTERS.get(type(field), field.to_representation)
+        return self._fast_getter(field, ".".join(attrs)), convert
+
+    @staticmethod
+    def _fast_getter(field, path):
+        read = attrgetter(path)
+
+        def get(instance):
+            try:
+                return read(instance)
+            except (AttributeError, ObjectDoesNotExist):
+                return field.get_attribute(instance)
+
+        return get
+
+    def to_representation(self, instance):
+        if not self.use_compiled or not isinstance(instance, models.Model):
+            return super().to_representation(instance)
+        compiled = self.__dict__.get("_compiled_fields")
+        if compiled is None:
+            compiled = self.__dict__["_compiled_fields"] = self.compile_fields()
+
+        ret = {}
+        for name, get, convert in compiled:
+            try:
+                attribute = get(instance)
+            except SkipField:
+                continue
+            if attribute is None or (
+                isinstance(attribute, PKOnlyObject) and attribute.pk is None
+            ):
+                ret[name] = None
+            else:
+                ret[name] = convert(attribute)
+        return ret
@@ -0,0 +1,122 @@
+from collections import namedtuple
+from rest_framework import serializers
+
+
+class Expandable(
+    namedtuple("Expandable", "serializer_class many source", defaults=(False, None))
+):
+    """A nested serializer rendered only when asked for with ``?expand=``.
+
+    Args:
+        serializer_class (type): The nested serializer, a ``SparseFieldsetMixin``
+        many (bool): Whether the field is a to-many relation
+        source (str): The attribute the field reads, the field name by default
+
+    Unexpanded, a to-one relation renders as the related object's ID, from
+    the foreign key column, and a to-many relation is left out.
+    """
+
+
+def parse_fieldset(value):
+    """Parse a ``?fields=`` value such as ``id,event.title,event.date_time``.
+
+    Returns:
+        dict | None: The requested field names, each with the list of its
+        own requested subfields, empty for all; None when nothing was asked
+    """
+    if not value:
+        return None
+    fieldset = {}
+    for path in value.split(","):
+        name, _, rest = path.strip().partition(".")
+        if name:
+            subfields = fieldset.setdefault(name, [])
+            if rest:
+                subfields.append(rest)
+    return fieldset
+
+
+def parse_expand(value):
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Lets clients pick the fields of a serializer with ``?fields=`` and
+    opt into the nested serializers of ``Meta.expandable_fields`` with
+    ``?expand=``.
+
+    The query parameters apply to the top-level serializer; an expanded
+    serializer gets its subfields, e.g. ``title`` from ``event.title``. Left
+    out fields and unexpanded serializers are never instantiated, so
+    ``QueryPlanner`` joins and loads only what is rendered.
+    """
+
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self._fieldset = parse_fieldset(",".join(fields)) if fields else None
+        self._expand = set(expand) if expand is not None else None
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def get_query_fieldset(cls, request):
+        """Read the fieldset and expansions of a request.
+
+        Returns:
+            tuple: The ``parse_fieldset`` fieldset and the expanded names
+        """
+        if request is None:
+            return None, set()
+        params = request.query_params
+        return (
+            parse_fieldset(params.get(cls.fields_query_param)),
+            parse_expand(params.get(cls.expand_query_param)),
+        )
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fieldset(self):
+        if self._fieldset is not None or self._expand is not None:
+            return self._fieldset, self._expand or set()
+        if self._is_root():
+            return self.get_query_fieldset(self.context.get("request"))
+        return None, set()
+
+    @property
+    def is_sparse(self):
+        """Whether the serializer renders something else than its default
+        fields."""
+        fieldset, expand = self.get_fieldset()
+        return fieldset is not None or not expand.isdisjoint(
+            self.get_expandable_fields()
+        )
+
+    @classmethod
+    def get_expandable_fields(cls):
+        return getattr(cls.Meta, "expandable_fields", {})
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset, expand = self.get_fieldset()
+        if fieldset is not None:
+            fields = {name: f for name, f in fields.items() if name in fieldset}
+
+        for name, spec in self.get_expandable_fields().items():
+            if name not in fields:
+                continue
+            if name in expand:
+                fields[name] = spec.serializer_class(
+                    many=spec.many,
+                    read_only=True,
+                    source=spec.source,
+                    fields=fieldset.get(name) if fieldset else None,
+                    expand=(),
+                )
+            elif spec.many:
+                del fields[name]
+        return fields
@@ -1,7 +1,244 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
-class EventPagination(PageNumberPagination):
+class KeysetPagination(BasePagination):
+    """Paginates on a unique indexed ordering, seeking past the last row of
+    the previous page instead of counting and skipping rows, so every page
+    costs the same whatever its depth.
+
+    Pages link to each other with opaque cursors holding the ordering values
+    of the row they start after. The total count costs a full scan, so it is
+    only returned when asked for with ``?count=true``.
+    """
+
+    ordering = ("id",)  # must end with a unique field
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor."
+
+    # * -------------------#
+    # * CURSORS
+    # * -------------------#
+
+    def encode_cursor(self, values, reverse=False):
+        payload = json.dumps(
+            {
+                "v": [v.isoformat() if hasattr(v, "isoformat") else v for v in values],
+                "r": reverse,
+            },
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request, model):
+        """Read the cursor of a request.
+
+        Returns:
+            tuple | None: The ordering values the page starts after and
+            whether it is read backwards, or None on the first page
+        Raises:
+            NotFound: The cursor is malformed
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            )
+            values = payload["v"]
+            if len(values) != len(self.ordering):
+                raise ValueError("Cursor does not match the ordering")
+            values = [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+            return values, bool(payload.get("r"))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, instance):
+        return [
+            getattr(instance, instance._meta.get_field(name.lstrip("-")).attname)
+            for name in self.ordering
+        ]
+
+    # * -------------------#
+    # * PAGINATION
+    # * -------------------#
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+
+    def seek(self, ordering, values):
+        """Build the filter keeping the rows after ``values`` in ``ordering``:
+        ``(a, b) > (x, y)`` is ``a > x OR (a = x AND b > y)``."""
+        condition = Q()
+        for i, name in enumerate(ordering):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            step = Q(**{f"{field}__{lookup}": values[i]})
+            for previous, value in zip(ordering[:i], values[:i]):
+                step &= Q(**{previous.lstrip("-"): value})
+            condition |= step
+        return condition
+
+    def get_page_queryset(self, queryset, request):
+        """Order, seek and slice a queryset to the requested page, plus one
+        row telling whether there is a page after it."""
+        self.request = request
+        self.page_size_requested = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        values, self.reverse = cursor if cursor is not None else (None, False)
+        self.has_cursor = cursor is not None
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(
+                name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+            )
+        self.count = None
+        self.count_queryset = queryset if self.wants_count(request) else None
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek(ordering, values))
+        return queryset[: self.page_size_requested + 1]
+
+    def build_page(self, rows):
+        has_more = len(rows) > self.page_size_requested
+        rows = rows[: self.page_size_requested]
+        if self.reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.has_cursor, has_more
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if self.count_queryset is not None:
+            self.count = self.count_queryset.count()
+        return self.build_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views, with the async ORM."""
+        page_queryset = self.get_page_queryset(queryset, request)
+        if self.count_queryset is not None:
+            self.count = await self.count_queryset.acount()
+        return self.build_page([row async for row in page_queryset])
+
+    # * -------------------#
+    # * RESPONSE
+    # * -------------------#
+
+    def get_link(self, instance, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(self.get_position(instance), reverse),
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.get_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(), self.cursor_query_param
+            )
+        return self.get_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        body = {"next": self.get_next_link(), "previous": self.get_previous_link()}
+        if self.count is not None:
+            body["count"] = self.count
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {
+                    "type": "integer",
+                    "description": f"Only with ?{self.count_query_param}=true",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Also return the total number of results.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+
+class EventPagination(KeysetPagination):
+    ordering = ("date_time", "id")
     page_size = 10  # default items per page
     page_size_query_param = "page_size"  # allow ?page_size=20
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("id",)
+    page_size = 50
+    max_page_size = 500
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("id",)
+    page_size = 20
+    max_page_size = 100
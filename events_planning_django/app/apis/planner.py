@@ -0,0 +1,167 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class QueryPlan:
+    """What a queryset must join, prefetch and load for a serializer.
+
+    ``only`` is None when the serializer may read any field of the model,
+    e.g. through a ``SerializerMethodField``.
+    """
+
+    def __init__(self, prefetch_filters=None):
+        self.prefetch_filters = prefetch_filters or {}
+        self.select_related = set()
+        self.prefetch_related = []
+        self.only = set()
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only is not None:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+class QueryPlanner:
+    """Plans the ``select_related``, ``prefetch_related`` and ``only`` of a
+    queryset from the fields a serializer renders, so list endpoints run a
+    constant number of queries whatever the number of rows.
+
+    Sources are followed through the model's fields:
+        - a concrete field is loaded with ``only``
+        - a to-one relation rendered as its primary key needs no join
+        - a to-one relation traversed, nested or rendered whole is joined
+        - a to-many relation is prefetched, with a queryset planned for the
+          nested serializer when there is one
+
+    Sources the model does not define, such as properties and serializer
+    methods, may read anything, so their model is loaded in full.
+    Serializers can list fields they read besides their own in
+    ``required_model_fields``.
+    """
+
+    @classmethod
+    def apply(cls, queryset, serializer, prefetch_filters=None):
+        """Plan a queryset for a serializer.
+
+        Args:
+            queryset (QuerySet): The queryset the serializer renders rows of
+            serializer (Serializer): The serializer, bound to its context so
+                its fields reflect the request
+            prefetch_filters (dict): Conditions limiting the rows prefetched
+                for to-many relations, by lookup path, e.g. ``{"items": Q()}``
+        Returns:
+            QuerySet: The planned queryset
+        """
+        return cls.plan(serializer, queryset.model, prefetch_filters).apply(queryset)
+
+    @classmethod
+    def plan(cls, serializer, model, prefetch_filters=None):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        plan = QueryPlan(prefetch_filters)
+        cls._plan_serializer(plan, serializer, model, "")
+        return plan
+
+    @classmethod
+    def _plan_serializer(cls, plan, serializer, model, prefix):
+        for name in getattr(serializer, "required_model_fields", ()):
+            cls._load(plan, f"{prefix}{name}")
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if field.source == "*":  # reads the whole instance
+                cls._load_model(plan, model, prefix)
+                continue
+            cls._plan_source(plan, field, model, prefix, field.source_attrs)
+
+    @classmethod
+    def _plan_source(cls, plan, field, model, prefix, attrs):
+        for i, attr in enumerate(attrs):
+            last = i == len(attrs) - 1
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:  # a property or method
+                cls._load_model(plan, model, prefix)
+                return
+
+            if not model_field.is_relation:
+                cls._load(plan, f"{prefix}{attr}")
+                return
+
+            path = f"{prefix}{attr}"
+            related_model = model_field.related_model
+            if model_field.many_to_many or model_field.one_to_many:
+                plan.prefetch_related.append(
+                    cls._prefetch(plan, field if last else None, model_field, path)
+                )
+                return
+
+            if model_field.concrete:
+                cls._load(plan, path)  # the foreign key column
+                if last and isinstance(field, serializers.RelatedField):
+                    return  # rendered as the primary key
+            plan.select_related.add(path)
+            if last:
+                if isinstance(field, serializers.BaseSerializer):
+                    cls._plan_serializer(plan, field, related_model, f"{path}__")
+                else:  # rendered whole, e.g. with str()
+                    cls._load_model(plan, related_model, f"{path}__")
+                return
+            model, prefix = related_model, f"{path}__"
+
+    @classmethod
+    def _prefetch(cls, parent, field, model_field, path):
+        related_model = model_field.related_model
+        queryset = related_model._default_manager.all()
+        if path in parent.prefetch_filters:
+            queryset = queryset.filter(parent.prefetch_filters[path])
+
+        child = getattr(field, "child", None)
+        if isinstance(child, serializers.BaseSerializer):
+            plan = cls.plan(child, related_model)
+            if model_field.one_to_many:
+                cls._load(plan, model_field.field.name)  # to match rows to parents
+            queryset = plan.apply(queryset)
+        elif path not in parent.prefetch_filters:
+            return path
+        return Prefetch(path, queryset=queryset)
+
+    @staticmethod
+    def _load(plan, path):
+        if plan.only is not None:
+            plan.only.add(path)
+
+    @classmethod
+    def _load_model(cls, plan, model, prefix):
+        if not prefix:
+            plan.only = None
+            return
+        for field in model._meta.concrete_fields:
+            cls._load(plan, f"{prefix}{field.name}")
+
+
+class QueryPlannerMixin:
+    """Plans the queryset of a generic view's read actions with
+    ``QueryPlanner`` from the serializer they respond with."""
+
+    planned_actions = ("list", "retrieve")
+
+    def get_prefetch_filters(self):
+        """Conditions limiting the prefetched rows, see ``QueryPlanner.apply``."""
+        return {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        action = getattr(self, "action", None)
+        if self.request.method == "GET" and (
+            action is None or action in self.planned_actions
+        ):
+            queryset = QueryPlanner.apply(
+                queryset, self.get_serializer(), self.get_prefetch_filters()
+            )
+        return queryset
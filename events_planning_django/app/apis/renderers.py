@@ -0,0 +1,53 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_fallback_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # orjson encodes str, int, float, dict and list subclasses, datetimes and
+    # UUIDs natively; Decimal, lazy strings, timedeltas and querysets are
+    # encoded as DRF's JSONEncoder does
+    return _fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Renders JSON with orjson, several times faster than the stdlib ``json``
+    on large lists, falling back to ``JSONRenderer`` when orjson is not
+    installed or an indented response is asked for.
+
+    Output matches ``JSONRenderer``: compact, UTF-8, datetimes in ISO 8601
+    and Decimal as numbers.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+
+
+class ORJSONParser(JSONParser):
+    """Parses JSON request bodies with orjson, falling back to ``JSONParser``
+    when it is not installed."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
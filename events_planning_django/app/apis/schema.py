@@ -0,0 +1,61 @@
+from drf_spectacular.plumbing import get_lib_doc_excludes as get_drf_doc_excludes
+from drf_spectacular.utils import OpenApiParameter
+from app.caching.fragments import FragmentCachedSerializerMixin
+from .compiled import CompiledSerializerMixin
+from .fieldsets import SparseFieldsetMixin
+from .planner import QueryPlannerMixin
+
+
+def get_lib_doc_excludes():
+    """The classes whose docstrings the schema never describes a view or a
+    serializer with: DRF's, and the mixins explaining how responses are
+    built rather than what they hold."""
+    return [
+        *get_drf_doc_excludes(),
+        QueryPlannerMixin,
+        SparseFieldsetMixin,
+        CompiledSerializerMixin,
+        FragmentCachedSerializerMixin,
+    ]
+
+
+def fieldset_parameters(serializer_class):
+    """The ``?fields=`` and ``?expand=`` parameters of the actions responding
+    with a ``SparseFieldsetMixin`` serializer, for ``extend_schema``.
+
+    Args:
+        serializer_class (type): The serializer the action responds with
+    Returns:
+        list: The ``OpenApiParameter`` of each query parameter
+    """
+    names = ", ".join(serializer_class.Meta.fields)
+    fields = f"Comma-separated fields to render, of {names}."
+    expandable = serializer_class.get_expandable_fields()
+    if expandable:
+        name, spec = next(iter(expandable.items()))
+        fields += (
+            " Pick the fields of an expanded object as e.g. "
+            f"`{name}.{spec.serializer_class.Meta.fields[0]}`."
+        )
+    parameters = [
+        OpenApiParameter(
+            serializer_class.fields_query_param,
+            str,
+            description=f"{fields} Every field by default.",
+        )
+    ]
+    if expandable:
+        nested = "; ".join(
+            f"`{name}` ({'left out' if spec.many else 'its ID'} otherwise)"
+            for name, spec in expandable.items()
+        )
+        parameters.append(
+            OpenApiParameter(
+                serializer_class.expand_query_param,
+                str,
+                description=(
+                    f"Comma-separated fields to render as nested objects: {nested}."
+                ),
+            )
+        )
+    return parameters
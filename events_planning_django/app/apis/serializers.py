@@ -1,8 +1,14 @@
 from rest_framework import serializers
+from django.conf import settings
 from app.models import CustomUser, Event, Ticket, Order, OrderItem
+from app.caching.fragments import FragmentCachedSerializerMixin, FragmentListSerializer
+from .compiled import CompiledSerializerMixin
+from .fieldsets import Expandable, SparseFieldsetMixin
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    SparseFieldsetMixin, CompiledSerializerMixin, serializers.ModelSerializer
+):
 
     class Meta:
         model = CustomUser
@@ -38,11 +44,17 @@ class LoginSerializer(serializers.Serializer):
     password = serializers.CharField(write_only=True)
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(
+    FragmentCachedSerializerMixin,
+    SparseFieldsetMixin,
+    CompiledSerializerMixin,
+    serializers.ModelSerializer,
+):
     organiser = serializers.CharField(source="organiser.username", read_only=True)
 
     class Meta:
         model = Event
+        list_serializer_class = FragmentListSerializer
         fields = [
             "id",
             "title",
@@ -57,9 +69,11 @@ class EventSerializer(serializers.ModelSerializer):
         ]
 
 
-class TicketSerializer(serializers.ModelSerializer):
-    event = EventSerializer(read_only=True)
-    attendee = UserSerializer(read_only=True)
+class TicketSerializer(
+    SparseFieldsetMixin, CompiledSerializerMixin, serializers.ModelSerializer
+):
+    """A ticket, with the IDs of its event and attendee unless they are
+    expanded with ``?expand=event,attendee``."""
 
     class Meta:
         model = Ticket
@@ -70,9 +84,45 @@ class TicketSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
+        read_only_fields = fields
+        expandable_fields = {
+            "event": Expandable(EventSerializer),
+            "attendee": Expandable(UserSerializer),
+        }
+
+
+class ScanSerializer(serializers.Serializer):
+    code = serializers.CharField(max_length=32)
+    scanned_at = serializers.DateTimeField()
+
+
+class CheckInSerializer(serializers.Serializer):
+    """Codes scanned live, or ``scans`` synced by a gate that was offline,
+    each with the time it was scanned at."""
+
+    codes = serializers.ListField(
+        child=serializers.CharField(max_length=32),
+        allow_empty=False,
+        max_length=5000,
+        required=False,
+    )
+    scanned_at = serializers.DateTimeField(required=False)
+    scans = serializers.ListField(
+        child=ScanSerializer(),
+        allow_empty=False,
+        max_length=5000,
+        required=False,
+    )
+
+    def validate(self, data):
+        if ("codes" in data) == ("scans" in data):
+            raise serializers.ValidationError("Send either codes or scans.")
+        return data
 
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(
+    SparseFieldsetMixin, CompiledSerializerMixin, serializers.ModelSerializer
+):
     event = serializers.CharField()
     event_ticket_price = serializers.SerializerMethodField("get_event_ticket_price")
     subtotal = serializers.SerializerMethodField("get_subtotal")
@@ -99,9 +149,12 @@ class CreateOrderItemSerializer(serializers.Serializer):
         return value
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(
+    SparseFieldsetMixin, CompiledSerializerMixin, serializers.ModelSerializer
+):
+    """An order, with its items only when expanded with ``?expand=items``."""
+
     attendee = serializers.CharField(source="attendee.username", read_only=True)
-    items = OrderItemSerializer(many=True)
 
     class Meta:
         model = Order
@@ -113,8 +166,32 @@ class OrderSerializer(serializers.ModelSerializer):
             "items",
             "total_price",
         ]
+        expandable_fields = {
+            "items": Expandable(OrderItemSerializer, many=True),
+        }
 
 
 class CreateOrderSerializer(serializers.Serializer):
     items = CreateOrderItemSerializer(many=True)
     payment_method = serializers.ChoiceField(choices=Order.PaymentMethod.values)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=64)
+    method = serializers.ChoiceField(
+        choices=["GET", "POST", "PUT", "PATCH", "DELETE"], default="GET"
+    )
+    path = serializers.RegexField(r"^/api/", max_length=2048)
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        limit = settings.BATCH_REQUESTS["MAX_REQUESTS"]
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"A batch holds at most {limit} requests."
+            )
+        return value
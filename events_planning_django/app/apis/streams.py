@@ -0,0 +1,102 @@
+import asyncio
+import json
+from collections import defaultdict
+from django.http import Http404, StreamingHttpResponse
+from app.connections import get_async_redis
+from app.models import Event
+from app.services.availability import AvailabilityService
+import logging
+
+logger = logging.getLogger("app")
+
+
+class AvailabilityBroadcaster:
+    """Fans availability updates out to the SSE clients of this process.
+
+    A single Redis pattern subscription feeds every open stream, so an idle
+    connection costs one small queue rather than a Redis connection.
+    """
+
+    RECONNECT_DELAY = 1
+
+    def __init__(self):
+        self.queues = defaultdict(set)
+        self.task = None
+
+    def subscribe(self, event_id):
+        queue = asyncio.Queue(maxsize=1)
+        self.queues[event_id].add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.listen())
+        return queue
+
+    def unsubscribe(self, event_id, queue):
+        queues = self.queues.get(event_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.queues[event_id]
+
+    def dispatch(self, event_id, snapshot):
+        for queue in self.queues.get(event_id, ()):
+            if queue.full():  # slow client, only the latest count matters
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+    async def listen(self):
+        pattern = f"{AvailabilityService.CHANNEL_PREFIX}*"
+        prefix_length = len(AvailabilityService.CHANNEL_PREFIX)
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.psubscribe(pattern)
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    event_id = int(message["channel"][prefix_length:])
+                    self.dispatch(event_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Availability subscription lost, reconnecting")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+            finally:
+                await pubsub.aclose()
+
+
+broadcaster = AvailabilityBroadcaster()
+
+
+def format_event(snapshot):
+    return f"event: availability\ndata: {json.dumps(snapshot)}\n\n"
+
+
+async def availability_events(event_id, keepalive=15):
+    """Yield the current availability of an event, then every update."""
+    queue = broadcaster.subscribe(event_id)
+    try:
+        yield "retry: 5000\n" + format_event(
+            await AvailabilityService.asnapshot(event_id)
+        )
+        while True:
+            try:
+                snapshot = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+            else:
+                yield format_event(snapshot)
+    finally:
+        broadcaster.unsubscribe(event_id, queue)
+
+
+async def event_availability_stream(request, pk):
+    """Stream live ticket availability of an event as Server-Sent Events."""
+    if not await Event.objects.filter(pk=pk).aexists():
+        raise Http404("Event not found.")
+
+    response = StreamingHttpResponse(
+        availability_events(pk), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -6,7 +6,16 @@ from .views import (
     EventViewSet,
     TicketListView,
     OrderViewSet,
-    OrganiserDashboardView
+    OrganiserDashboardView,
+    CacheStatsView,
+)
+from .streams import event_availability_stream
+from .batch import BatchView
+from .async_views import (
+    AsyncEventListView,
+    AsyncEventDetailView,
+    AsyncTicketListView,
+    AsyncOrganiserDashboardView,
 )
 from drf_spectacular.views import (
     SpectacularAPIView,
@@ -25,6 +34,22 @@ urlpatterns = [
     path("logout/", UserLogoutView.as_view(), name="logout"),
     path("tickets/", TicketListView.as_view(), name="tickets"),
     path("stats/",OrganiserDashboardView.as_view(),name="stats"),
+    path("cache/stats/", CacheStatsView.as_view(), name="cache_stats"),
+    path("batch/", BatchView.as_view(), name="batch"),
+    path(
+        "events/<int:pk>/availability/stream/",
+        event_availability_stream,
+        name="event_availability_stream",
+    ),
+    # async read endpoints, served concurrently under ASGI
+    path("async/events/", AsyncEventListView.as_view(), name="async-events"),
+    path(
+        "async/events/<int:pk>/",
+        AsyncEventDetailView.as_view(),
+        name="async-event-detail",
+    ),
+    path("async/tickets/", AsyncTicketListView.as_view(), name="async-tickets"),
+    path("async/stats/", AsyncOrganiserDashboardView.as_view(), name="async-stats"),
     path("", include(router.urls)),
     # schemas and docs URLs
     path("schema/", SpectacularAPIView.as_view(api_version="v2"), name="schema"),
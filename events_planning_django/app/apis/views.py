@@ -1,3 +1,4 @@
+import itertools
 from rest_framework import views, generics
 from rest_framework import viewsets, status
 from rest_framework.response import Response
@@ -7,19 +8,30 @@ from rest_framework.exceptions import (
     APIException,
     ValidationError,
     NotAuthenticated,
+    PermissionDenied,
 )
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.db.models import Count , Q
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiExample
-from django.contrib.auth import authenticate, login, logout
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiResponse,
+    OpenApiExample,
+    OpenApiParameter,
+)
+from django.conf import settings
+from django.contrib.auth import authenticate, logout
 from app.models import CustomUser, Event, Ticket, Order, OrderItem
 from .filters import TicketFilter, EventFilter, OrderFilter
 from . import permissions as custom_permissions
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.permissions import (
+    IsAuthenticatedOrReadOnly,
+    IsAuthenticated,
+    IsAdminUser,
+)
 from .serializers import (
     UserSerializer,
     RegisterSerializer,
@@ -28,10 +40,20 @@ from .serializers import (
     TicketSerializer,
     OrderSerializer,
     CreateOrderSerializer,
+    CheckInSerializer,
 )
 from app.services.orders import OrderService
 from app.services.tickets import TicketService
-from .pagination import EventPagination
+from app.services.checkin import CheckInService
+from app.services.exports import TicketExportService
+from app.services.changes import ChangeFeedService
+from app.services.tokens import AccessTokenService
+from app.caching.responses import cache_response
+from app.caching.metrics import CacheMetrics
+from app.caching.tiered import tiered_cache
+from .planner import QueryPlannerMixin
+from .schema import fieldset_parameters
+from .pagination import EventPagination, TicketPagination, OrderPagination
 import logging
 
 
@@ -60,10 +82,13 @@ class UserLoginView(views.APIView):
 
         token, _ = Token.objects.get_or_create(user=user)
 
-        login(request, user)
-
         return Response(
-            {"user": UserSerializer(user).data, "access_token": token.key},
+            {
+                "user": UserSerializer(user).data,
+                "access_token": token.key,
+                "signed_token": AccessTokenService.issue(user),
+                "expires_in": AccessTokenService.ttl(),
+            },
             status=status.HTTP_200_OK,
         )
 
@@ -87,10 +112,13 @@ class UserRegisterView(views.APIView):
         user = serializer.create(serializer.validated_data)
         token, _ = Token.objects.get_or_create(user=user)
 
-        login(request, user)
-
         return Response(
-            {"user": UserSerializer(user).data, "access_token": token.key},
+            {
+                "user": UserSerializer(user).data,
+                "access_token": token.key,
+                "signed_token": AccessTokenService.issue(user),
+                "expires_in": AccessTokenService.ttl(),
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -104,6 +132,9 @@ class UserLogoutView(views.APIView):
     )
     def post(self, request):
 
+        if isinstance(request.auth, dict):  # signed access token payload
+            AccessTokenService.revoke(request.auth)
+
         logout(request)
 
         return Response(
@@ -111,20 +142,37 @@ class UserLogoutView(views.APIView):
         )
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(QueryPlannerMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     pagination_class = EventPagination
+    planned_actions = ("list", "retrieve", "by_organiser", "changes")
     filter_backends = [SearchFilter, DjangoFilterBackend]
     filterset_class = EventFilter
     search_fields = ["title", "organiser__username"]
 
-    @method_decorator(cache_page(60 * 60 * 2, key_prefix="list-events"))
+    @extend_schema(parameters=fieldset_parameters(EventSerializer))
+    @cache_response("events", 60 * 60 * 2, warm=True)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=fieldset_parameters(EventSerializer))
+    @cache_response(
+        "events", 60 * 60 * 2, scopes=lambda view, request, pk: [f"event:{pk}"]
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_permissions(self):
-        if self.action in ["create", "update", "partial_update", "destroy"]:
+        if self.action in [
+            "create",
+            "update",
+            "partial_update",
+            "destroy",
+            "checkin",
+            "checkin_bundle",
+            "export",
+        ]:
             permission_classes = [IsAuthenticated, custom_permissions.IsOrganiser]
         else:
             permission_classes = [IsAuthenticatedOrReadOnly]
@@ -133,12 +181,24 @@ class EventViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(organiser=self.request.user)
 
+    def get_owned_event(self):
+        event = self.get_object()
+        if event.organiser_id != self.request.user.id:
+            raise PermissionDenied("You can only manage your own events.")
+        return event
+
+    @extend_schema(parameters=fieldset_parameters(EventSerializer))
     @action(
         detail=False, methods=["get"], url_path="organiser/(?P<organiser_id>[^/.]+)"
     )
+    @cache_response(
+        "events",
+        60 * 60 * 2,
+        scopes=lambda view, request, organiser_id: [f"organiser:{organiser_id}"],
+    )
     def by_organiser(self, request, organiser_id=None):
         """Return all events by a specific organiser."""
-        events = Event.objects.filter(organiser__id=organiser_id)
+        events = self.get_queryset().filter(organiser__id=organiser_id)
         page = self.paginate_queryset(events)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -147,10 +207,154 @@ class EventViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "cursor", str, description="The cursor of the previous read."
+            ),
+            OpenApiParameter(
+                "page_size", int, description="Rows read per kind of change."
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description="Changes since the cursor."),
+            400: OpenApiResponse(description="Invalid or expired cursor."),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """Return what changed since ``?cursor=``: the events created or
+        updated, the IDs of those deleted and the availability of events
+        whose tickets changed.
+
+        Read on with the returned ``cursor`` while ``has_more`` is true,
+        then keep it for the next sync. Without a cursor every event is
+        returned, for a first sync.
+        """
+        try:
+            page_size = int(request.query_params.get("page_size", 0))
+        except ValueError:
+            page_size = 0
+        page_size = min(max(page_size, 0), settings.CHANGE_FEED["MAX_PAGE_SIZE"])
+        try:
+            changes = ChangeFeedService.read(
+                request.query_params.get("cursor"),
+                page_size or None,
+                self.get_queryset(),
+            )
+        except ValueError as e:
+            raise ValidationError({"detail": str(e)})
+
+        return Response(
+            {
+                "cursor": changes.cursor,
+                "has_more": changes.has_more,
+                "events": self.get_serializer(changes.events, many=True).data,
+                "deleted": changes.deleted,
+                "availability": changes.availability,
+            }
+        )
 
-class TicketListView(generics.ListAPIView):
+    @extend_schema(
+        request=CheckInSerializer,
+        responses={
+            200: OpenApiResponse(description="Status of every scanned code."),
+            403: OpenApiResponse(description="Event belongs to another organiser."),
+        },
+    )
+    @action(
+        detail=True,
+        methods=["POST"],
+        url_path="checkin",
+        url_name="event_checkin",
+        serializer_class=CheckInSerializer,
+    )
+    def checkin(self, request, pk=None):
+        """Admit a batch of scanned ticket codes."""
+        event = self.get_owned_event()
+        serializer = CheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        if "scans" in data:
+            codes = [(scan["code"], scan["scanned_at"]) for scan in data["scans"]]
+        else:
+            codes = data["codes"]
+        results = CheckInService.check_in(
+            event, codes, scanned_at=data.get("scanned_at")
+        )
+        admitted = sum(r == CheckInService.ADMITTED for r in results.values())
+        return Response(
+            {
+                "admitted": admitted,
+                "rejected": len(results) - admitted,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description="Hashed codes valid for entry."),
+            403: OpenApiResponse(description="Event belongs to another organiser."),
+        },
+    )
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="checkin-bundle",
+        url_name="event_checkin_bundle",
+    )
+    def checkin_bundle(self, request, pk=None):
+        """Export the codes still valid for entry, for offline gate devices."""
+        event = self.get_owned_event()
+        return Response(CheckInService.export_bundle(event), status=status.HTTP_200_OK)
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description="The tickets as CSV or NDJSON."),
+            400: OpenApiResponse(description="Unsupported export format."),
+            403: OpenApiResponse(description="Event belongs to another organiser."),
+        },
+    )
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="export",
+        url_name="event_export",
+    )
+    def export(self, request, pk=None):
+        """Stream the event's tickets with their attendee and order.
+
+        ``?file_format=csv|ndjson`` picks the format, CSV by default, and
+        ``?sold_only=true`` leaves out unsold tickets.
+        """
+        event = self.get_owned_event()
+        file_format = request.query_params.get("file_format", TicketExportService.CSV)
+        sold_only = request.query_params.get("sold_only", "").lower() in ("1", "true")
+        try:
+            chunks = TicketExportService.stream(event, file_format, sold_only)
+            first = next(chunks, "")  # surfaces format errors before streaming
+        except ValueError as e:
+            raise ValidationError({"detail": str(e)})
+
+        response = StreamingHttpResponse(
+            itertools.chain([first], chunks),
+            content_type=TicketExportService.CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="event-{event.id}-tickets.{file_format}"'
+        )
+        return response
+
+
+@extend_schema_view(
+    get=extend_schema(parameters=fieldset_parameters(TicketSerializer))
+)
+class TicketListView(QueryPlannerMixin, generics.ListAPIView):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
+    pagination_class = TicketPagination
     permission_classes = [IsAuthenticatedOrReadOnly, custom_permissions.IsOrganiser]
     filter_backends = [DjangoFilterBackend, SearchFilter]
     filterset_class = TicketFilter
@@ -163,14 +367,20 @@ class TicketListView(generics.ListAPIView):
             return queryset.filter(event__organiser=user)
         return queryset
 
-    @method_decorator(cache_page(60 * 60 * 2, key_prefix="list-tickets"))
+    @cache_response(
+        "tickets",
+        60 * 60 * 2,
+        scopes=lambda view, request: [f"organiser:{request.user.id}"],
+        variant=lambda view, request: f"user-{request.user.id}",
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(QueryPlannerMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
+    pagination_class = OrderPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = OrderFilter
 
@@ -181,25 +391,65 @@ class OrderViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
-    @method_decorator(cache_page(60 * 60 * 2, key_prefix="list-orders"))
+    def get_cache_scope(self):
+        """Attendees only see their own orders, organisers the orders of
+        their events, staff the full list."""
+        user = self.request.user
+        if user.user_type == CustomUser.UserType.ATTENDEE:
+            return f"attendee:{user.id}"
+        if user.user_type == CustomUser.UserType.ORGANISER:
+            return f"organiser:{user.id}"
+        return None
+
+    def get_cache_variant(self):
+        """Scoped lists differ per user, the counters of two scopes may be
+        equal."""
+        user = self.request.user
+        if user.user_type == CustomUser.UserType.ORGANISER:
+            return f"organiser-{user.id}"
+        return self.get_cache_scope() or "all"
+
+    @extend_schema(parameters=fieldset_parameters(OrderSerializer))
+    @cache_response(
+        "orders",
+        60 * 60 * 2,
+        scopes=lambda view, request: [view.get_cache_scope()],
+        variant=lambda view, request: view.get_cache_variant(),
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=fieldset_parameters(OrderSerializer))
+    @cache_response(
+        "orders",
+        60 * 60 * 2,
+        scopes=lambda view, request, pk: [view.get_cache_scope()],
+        variant=lambda view, request, pk: view.get_cache_variant(),
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return CreateOrderSerializer
         return OrderSerializer
 
+    def get_prefetch_filters(self):
+        # organisers only see the items of their own events
+        user = self.request.user
+        if user.user_type == CustomUser.UserType.ORGANISER:
+            return {"items": Q(event__organiser=user)}
+        return {}
+
     def get_queryset(self):
         user = self.request.user
+        queryset = super().get_queryset()
         if user.user_type == CustomUser.UserType.ATTENDEE:
-            return (
-                Order.objects.filter(attendee=user)
-                .select_related("attendee")
-                .prefetch_related("items__event")
-            )
+            return queryset.filter(attendee=user)
+        elif user.user_type == CustomUser.UserType.ORGANISER:
+            return queryset.for_organiser(user)
         else:
-            return super().get_queryset()
+            return queryset
 
     def create(self, request, *args, **kwargs):
         """Handle order creation via the service layer."""
@@ -313,11 +563,16 @@ class OrderViewSet(viewsets.ModelViewSet):
 class OrganiserDashboardView(views.APIView):
     permission_classes = [IsAuthenticated, custom_permissions.IsOrganiser]
     
-    @method_decorator(cache_page(60 * 2, key_prefix="dashboard"))
+    @cache_response(
+        "dashboard",
+        60 * 2,
+        scopes=lambda view, request: [f"organiser:{request.user.id}"],
+        variant=lambda view, request: f"user-{request.user.id}",
+    )
     def get(self, request):
         user = request.user
         events = Event.objects.filter(organiser=user)
-        orders = Order.objects.filter(items__event__organiser=user)
+        orders = Order.objects.for_organiser(user)
         tickets = Ticket.objects.filter(event__organiser=user)
         
         data = {
@@ -337,4 +592,19 @@ class OrganiserDashboardView(views.APIView):
             
         }
         
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+
+class CacheStatsView(views.APIView):
+    """Hit, miss, fill time and size counters of the response and fragment
+    caches per key prefix, and of this process' in-process cache tier."""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses={200: OpenApiResponse(description="Cache counters.")},
+    )
+    def get(self, request):
+        return Response(
+            {"responses": CacheMetrics.snapshot(), "local": tiered_cache.stats()}
+        )
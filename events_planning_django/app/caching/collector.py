@@ -0,0 +1,71 @@
+import threading
+from collections import defaultdict
+from django.db import connection, transaction
+from app.connections import get_redis
+import logging
+
+logger = logging.getLogger("app")
+
+
+class TransactionCollector:
+    """Collects the side effects of a transaction and flushes them once it
+    commits.
+
+    Side effects are items of a kind, e.g. generation keys to bump or events
+    whose availability to publish. A handler registered per kind turns the
+    deduplicated items of every kind into commands of one shared Redis
+    pipeline, and may return a callable run once the pipeline executed.
+    Outside a transaction, items are flushed right away. Items of a rolled
+    back transaction are dropped, or flushed with the next one, which only
+    costs a spurious invalidation.
+    """
+
+    handlers = {}
+    _local = threading.local()
+
+    @classmethod
+    def register(cls, kind, handler):
+        """Args:
+        kind (str): The kind of items the handler flushes
+        handler (callable): ``(items, pipe) -> callable | None``
+        """
+        cls.handlers[kind] = handler
+
+    @classmethod
+    def add(cls, kind, items):
+        """Collect items of a kind for the current transaction.
+
+        Args:
+            kind (str): A registered kind
+            items (Iterable): Hashable items, duplicates are flushed once
+        """
+        pending = getattr(cls._local, "pending", None)
+        if pending is None:
+            pending = cls._local.pending = defaultdict(set)
+        pending[kind].update(items)
+        if not cls._scheduled():
+            transaction.on_commit(cls.flush, robust=True)
+
+    @classmethod
+    def _scheduled(cls):
+        # the callback is gone after a rollback, and the pending items with it
+        return connection.in_atomic_block and any(
+            func == cls.flush for _, func, _ in connection.run_on_commit
+        )
+
+    @classmethod
+    def flush(cls):
+        """Run the handlers of everything collected so far. Idempotent."""
+        pending = getattr(cls._local, "pending", None)
+        cls._local.pending = None
+        if not pending:
+            return
+
+        pipe = get_redis().pipeline(transaction=False)
+        followups = [
+            cls.handlers[kind](items, pipe) for kind, items in pending.items() if items
+        ]
+        pipe.execute()
+        for followup in followups:
+            if followup is not None:
+                followup()
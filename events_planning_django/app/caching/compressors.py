@@ -0,0 +1,95 @@
+import zlib
+from django_redis.compressors.base import BaseCompressor
+from django_redis.exceptions import CompressorError
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# Compressed values start with MAGIC and a byte naming the codec. Pickles
+# start with b"\x80", so values stored before compression was enabled, or
+# left uncompressed, are told apart and read as they are.
+MAGIC = b"\xc1"
+
+
+class Codec:
+    def __init__(self, tag, compress, decompress, errors):
+        self.tag = tag
+        self.compress = compress
+        self.decompress = decompress
+        self.errors = errors
+
+
+def available_codecs(level=None):
+    """The codecs importable here, fastest to decompress first.
+
+    Args:
+        level (int): Compression level, or None for each codec's default
+    Returns:
+        dict: Codecs by name
+    """
+    codecs = {}
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level or 3)
+        decompressor = zstandard.ZstdDecompressor()
+        codecs["zstd"] = Codec(
+            b"s", compressor.compress, decompressor.decompress, zstandard.ZstdError
+        )
+    if lz4 is not None:
+        codecs["lz4"] = Codec(
+            b"l",
+            lambda value: lz4.frame.compress(value, compression_level=level or 0),
+            lz4.frame.decompress,
+            RuntimeError,
+        )
+    codecs["zlib"] = Codec(
+        b"z",
+        lambda value: zlib.compress(value, level or 1),
+        zlib.decompress,
+        zlib.error,
+    )
+    return codecs
+
+
+class ThresholdCompressor(BaseCompressor):
+    """Compresses values of at least ``COMPRESS_MIN_LENGTH`` bytes with the
+    best codec available, zstd, then lz4, then zlib, or the one named by the
+    ``COMPRESS_CODEC`` option. Any of them can be read back, so the codec
+    can change without flushing the cache.
+
+    Smaller values, and values compression does not shrink, are stored as
+    they are: counters and principals cost no CPU, and integers stay raw so
+    Redis can still INCR them.
+    """
+
+    def __init__(self, options):
+        super().__init__(options)
+        self.min_length = options.get("COMPRESS_MIN_LENGTH", 1024)
+        self.codecs = available_codecs(options.get("COMPRESS_LEVEL"))
+        self.codec = self.codecs[
+            options.get("COMPRESS_CODEC", next(iter(self.codecs)))
+        ]
+        self.by_tag = {codec.tag: codec for codec in self.codecs.values()}
+
+    def compress(self, value: bytes) -> bytes:
+        if len(value) < self.min_length:
+            return value
+        compressed = MAGIC + self.codec.tag + self.codec.compress(value)
+        return compressed if len(compressed) < len(value) else value
+
+    def decompress(self, value: bytes) -> bytes:
+        if value[:1] != MAGIC:
+            raise CompressorError("Value is not compressed")
+        codec = self.by_tag.get(value[1:2])
+        if codec is None:
+            raise CompressorError("Value was compressed with an unavailable codec")
+        try:
+            return codec.decompress(value[2:])
+        except codec.errors as e:
+            raise CompressorError from e
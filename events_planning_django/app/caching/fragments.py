@@ -0,0 +1,101 @@
+import hashlib
+from django.core.cache import cache
+from django.db import models
+from rest_framework import serializers
+from .metrics import CacheMetrics
+from .tiered import tiered_cache
+
+
+class FragmentCache:
+    """Caches the serialized representation of single objects.
+
+    Fragments are keyed by the object's ID and ``updated_at``, so a save
+    moves the object to a fresh key and needs no invalidation, which makes
+    them safe to keep in the in-process tier. Changes that
+    do not touch ``updated_at``, such as a renamed organiser, must ``forget``
+    the affected objects.
+    """
+
+    TIMEOUT = 60 * 60 * 24
+
+    @staticmethod
+    def prefix(serializer):
+        """The serializer's fields are part of the key, so serializers that
+        render the same model differently never share fragments."""
+        fields = hashlib.md5(",".join(serializer.fields).encode()).hexdigest()[:8]
+        return f"frag:{type(serializer).__name__}:{fields}"
+
+    @classmethod
+    def keys(cls, serializer, instances):
+        prefix = cls.prefix(serializer)
+        return [
+            f"{prefix}:{instance.pk}:"
+            f"{instance.updated_at.timestamp() if instance.updated_at else 0}"
+            for instance in instances
+        ]
+
+    @classmethod
+    def get_many(cls, serializer, instances):
+        """Serialize instances, reading every cached fragment with one MGET
+        and serializing and storing only the missing ones.
+
+        Args:
+            serializer (FragmentCachedSerializerMixin): The serializer to
+                render misses with
+            instances (list): The instances to serialize
+        Returns:
+            list: Their representations, in order
+        """
+        keys = cls.keys(serializer, instances)
+        fragments = tiered_cache.get_many(keys)
+        missing = {
+            key: serializer.serialize_fragment(instance)
+            for key, instance in zip(keys, instances)
+            if key not in fragments
+        }
+        CacheMetrics.record(
+            "fragments", hits=len(keys) - len(missing), misses=len(missing)
+        )
+        if missing:
+            cache.set_many(missing, cls.TIMEOUT)
+            fragments.update(missing)
+        return [fragments[key] for key in keys]
+
+    @classmethod
+    def forget(cls, serializer, instances):
+        tiered_cache.delete_many(cls.keys(serializer, instances))
+
+
+class FragmentListSerializer(serializers.ListSerializer):
+    """``list_serializer_class`` of fragment cached serializers."""
+
+    def to_representation(self, data):
+        if self.parent is not None or not self.child.is_fragment_cached():
+            return super().to_representation(data)
+        instances = list(data.all() if isinstance(data, models.Manager) else data)
+        return FragmentCache.get_many(self.child, instances)
+
+
+class FragmentCachedSerializerMixin:
+    """Serves a ModelSerializer's output from ``FragmentCache``. Pair it with
+    ``list_serializer_class = FragmentListSerializer``.
+
+    Top-level and ``many=True`` serialization read the cache; a serializer
+    nested as a field of another renders directly, as its parent's fragment
+    already covers it.
+    """
+
+    required_model_fields = ("updated_at",)  # part of the fragment keys
+
+    def is_fragment_cached(self):
+        # only the full representation is cached, the one ``forget`` drops,
+        # so a sparse fieldset cannot keep a renamed organiser around
+        return not getattr(self, "is_sparse", False)
+
+    def serialize_fragment(self, instance):
+        return super().to_representation(instance)
+
+    def to_representation(self, instance):
+        if self.parent is not None or not self.is_fragment_cached():
+            return self.serialize_fragment(instance)
+        return FragmentCache.get_many(self, [instance])[0]
@@ -0,0 +1,83 @@
+import time
+from django.core.cache import cache
+from app.connections import get_async_redis, get_redis
+from .tiered import tiered_cache
+
+
+class CacheGenerations:
+    """Generation counters that namespace cache keys per resource and scope.
+
+    Cached entries embed the generations they were built under, so bumping a
+    counter with a single INCR orphans every entry of that resource or scope
+    at once. Orphaned entries are never read again and age out by TTL.
+
+    Counters are read through the in-process tier, which bumps invalidate.
+    """
+
+    @staticmethod
+    def key(resource, scope=None):
+        """Build the counter key of a resource, optionally narrowed to a scope
+        such as ``organiser:12`` or ``event:7``."""
+        if scope is None:
+            return f"gen:{resource}"
+        return f"gen:{resource}:{scope}"
+
+    @staticmethod
+    def _seed():
+        # a missing counter starts from the clock, never from a value that
+        # entries still in the cache may have been built under
+        return int(time.time() * 1000)
+
+    @classmethod
+    def get_many(cls, keys):
+        """Read several counters in one round trip.
+
+        Args:
+            keys (list): Counter keys built with ``key()``
+        Returns:
+            list: The generation of every key, in order
+        """
+        values = tiered_cache.get_many(keys)
+        missing = {key: cls._seed() for key in keys if key not in values}
+        for key, seed in missing.items():
+            if not cache.add(key, seed, timeout=None):
+                missing[key] = cache.get(key, seed)
+        return [values.get(key, missing.get(key)) for key in keys]
+
+    @classmethod
+    async def aget_many(cls, keys):
+        """Async counterpart of ``get_many``."""
+        known, version = tiered_cache.peek(keys)
+        unknown = [key for key in keys if key not in known]
+        if unknown:
+            client = get_async_redis()
+            fetched = {}
+            values = await client.mget([cache.make_key(key) for key in unknown])
+            for key, value in zip(unknown, values):
+                if value is None:
+                    await client.set(cache.make_key(key), cls._seed(), nx=True)
+                    value = await client.get(cache.make_key(key))
+                else:
+                    fetched[key] = int(value)
+                known[key] = int(value)
+            tiered_cache.remember(fetched, version)
+        return [known[key] for key in keys]
+
+    @classmethod
+    def bump(cls, *keys, pipe=None):
+        """Advance one or more counters, orphaning every entry built under them.
+
+        Args:
+            keys (str): Counter keys built with ``key()``
+            pipe (Pipeline): Queue the commands on this pipeline instead, for
+                the caller to execute
+        """
+        keys = list(dict.fromkeys(keys))
+        queue = pipe if pipe is not None else get_redis().pipeline(transaction=False)
+        for key in keys:
+            raw_key = cache.make_key(key)
+            queue.set(raw_key, cls._seed(), nx=True)
+            queue.incr(raw_key)
+        tiered_cache.invalidate(keys, pipe=queue)
+        if pipe is None:
+            queue.execute()
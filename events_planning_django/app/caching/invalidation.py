@@ -0,0 +1,140 @@
+from collections import defaultdict
+from django.db.models import Q
+from app.models import Event, Order
+from app.apis.serializers import EventSerializer
+from .collector import TransactionCollector
+from .fragments import FragmentCache
+from .generations import CacheGenerations
+from .tiered import tiered_cache
+from .warming import HotPages
+
+# kinds of items collected for the transaction flush
+BUMP = "bump"
+DELETE = "delete"
+TICKETS_OF_EVENT = "tickets-of-event"
+ORDERS_OF_EVENT = "orders-of-event"
+ORGANISER_ORDERS_OF_EVENT = "organiser-orders-of-event"
+ORGANISER_ORDERS_OF_ORDER = "organiser-orders-of-order"
+WARM = "warm"
+
+
+class CacheInvalidation:
+    """Maps model changes to the cache entries they invalidate.
+
+    Changes are collected per transaction and applied once it commits, so a
+    request racing the write cannot cache the old rows under the new
+    generation, and saving many rows bumps every counter once.
+    """
+
+    @staticmethod
+    def _collect(*items):
+        TransactionCollector.add("cache", items)
+
+    @classmethod
+    def event_changed(cls, event):
+        """Invalidate the event lists, and the ticket and order lists that
+        embed the event."""
+        organiser = f"organiser:{event.organiser_id}"
+        cls._collect(
+            (BUMP, CacheGenerations.key("events")),
+            (BUMP, CacheGenerations.key("events", organiser)),
+            (BUMP, CacheGenerations.key("events", f"event:{event.id}")),
+            (BUMP, CacheGenerations.key("tickets", organiser)),
+            (BUMP, CacheGenerations.key("dashboard", organiser)),
+            (BUMP, CacheGenerations.key("orders")),
+            (BUMP, CacheGenerations.key("orders", organiser)),
+            (ORDERS_OF_EVENT, event.id),
+            (WARM, "events"),
+        )
+
+    @classmethod
+    def tickets_changed(cls, event_ids):
+        """Invalidate the ticket lists and dashboards of the events' organisers
+        only, ticket lists being scoped to the organiser.
+
+        Args:
+            event_ids (Iterable[int]): The events whose tickets changed
+        """
+        cls._collect(*((TICKETS_OF_EVENT, event_id) for event_id in event_ids))
+
+    @classmethod
+    def order_changed(cls, order):
+        """Invalidate the attendee's own order list, the order lists of the
+        organisers of its events, and the unscoped list staff read."""
+        cls._collect(
+            (BUMP, CacheGenerations.key("orders")),
+            (BUMP, CacheGenerations.key("orders", f"attendee:{order.attendee_id}")),
+            (ORGANISER_ORDERS_OF_ORDER, order.id),
+        )
+
+    @classmethod
+    def order_items_changed(cls, event_ids):
+        """Invalidate the order lists of the events' organisers, e.g. when
+        items are taken out of an order, which the order no longer leads to.
+
+        Args:
+            event_ids (Iterable[int]): The events of the changed items
+        """
+        cls._collect(
+            *((ORGANISER_ORDERS_OF_EVENT, event_id) for event_id in event_ids)
+        )
+
+    @classmethod
+    def organiser_changed(cls, user):
+        """Invalidate what embeds an organiser's username: their events'
+        fragments and the event lists showing them."""
+        events = Event.objects.filter(organiser=user).only("id", "updated_at")
+        cls._collect(
+            *((DELETE, key) for key in FragmentCache.keys(EventSerializer(), events)),
+            (BUMP, CacheGenerations.key("events")),
+            (BUMP, CacheGenerations.key("events", f"organiser:{user.id}")),
+            (BUMP, CacheGenerations.key("tickets", f"organiser:{user.id}")),
+        )
+
+    @staticmethod
+    def flush(items, pipe):
+        """Resolve the collected changes to counter keys with one query per
+        kind, and queue every bump and deletion on ``pipe``."""
+        collected = defaultdict(set)
+        for kind, value in items:
+            collected[kind].add(value)
+
+        bumps = collected[BUMP]
+        if collected[TICKETS_OF_EVENT]:
+            for organiser_id in (
+                Event.objects.filter(id__in=collected[TICKETS_OF_EVENT])
+                .values_list("organiser_id", flat=True)
+                .distinct()
+            ):
+                bumps.add(CacheGenerations.key("tickets", f"organiser:{organiser_id}"))
+                bumps.add(CacheGenerations.key("dashboard", f"organiser:{organiser_id}"))
+        if collected[ORGANISER_ORDERS_OF_EVENT] or collected[ORGANISER_ORDERS_OF_ORDER]:
+            for organiser_id in (
+                Event.objects.filter(
+                    Q(id__in=collected[ORGANISER_ORDERS_OF_EVENT])
+                    | Q(orderitem__order_id__in=collected[ORGANISER_ORDERS_OF_ORDER])
+                )
+                .values_list("organiser_id", flat=True)
+                .distinct()
+            ):
+                bumps.add(CacheGenerations.key("orders", f"organiser:{organiser_id}"))
+        if collected[ORDERS_OF_EVENT]:
+            for attendee_id in (
+                Order.objects.filter(items__event_id__in=collected[ORDERS_OF_EVENT])
+                .values_list("attendee_id", flat=True)
+                .distinct()
+            ):
+                bumps.add(CacheGenerations.key("orders", f"attendee:{attendee_id}"))
+
+        if collected[DELETE]:
+            tiered_cache.delete_many(collected[DELETE], pipe)
+        CacheGenerations.bump(*sorted(bumps), pipe=pipe)
+
+        def schedule_warming():
+            for resource in collected[WARM]:
+                HotPages.schedule(resource)
+
+        return schedule_warming
+
+
+TransactionCollector.register("cache", CacheInvalidation.flush)
@@ -0,0 +1,129 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from django.core.cache import cache
+from app.connections import get_async_redis, get_redis
+
+
+class CacheMetrics:
+    """Counts cache outcomes per key prefix, across processes.
+
+    Counts are buffered in the process and added to one Redis hash per
+    prefix with a single pipeline at most every ``FLUSH_INTERVAL`` seconds,
+    so recording costs no round trip on the request path. Async views
+    record with ``arecord``, which flushes on the async Redis client.
+
+    Recorded counters:
+        hits, stale, misses: how lookups were answered
+        not_modified: conditional requests answered with a 304
+        fills: entries stored, with ``fill_ms`` and ``bytes`` their totals
+    """
+
+    FLUSH_INTERVAL = 1.0
+
+    _pending = defaultdict(Counter)
+    _lock = threading.Lock()
+    _flushed_at = time.monotonic()
+
+    @staticmethod
+    def key(prefix):
+        return cache.make_key(f"cache-metrics:{prefix}")
+
+    @staticmethod
+    def prefixes_key():
+        return cache.make_key("cache-metrics")
+
+    @classmethod
+    def record(cls, prefix, **counts):
+        """Add to the counters of a prefix, e.g. ``record("events", hits=1)``."""
+        if cls._add(prefix, counts):
+            cls.flush()
+
+    @classmethod
+    async def arecord(cls, prefix, **counts):
+        """Add to the counters of a prefix from async code, flushing them
+        without blocking the event loop."""
+        if cls._add(prefix, counts):
+            await cls.aflush()
+
+    @classmethod
+    def _add(cls, prefix, counts):
+        """Buffer counts.
+
+        Returns:
+            bool: Whether the buffered counts are due to be flushed
+        """
+        with cls._lock:
+            cls._pending[prefix].update(counts)
+            return time.monotonic() - cls._flushed_at >= cls.FLUSH_INTERVAL
+
+    @classmethod
+    def _take_pending(cls):
+        with cls._lock:
+            pending, cls._pending = cls._pending, defaultdict(Counter)
+            cls._flushed_at = time.monotonic()
+        return pending
+
+    @classmethod
+    def _queue(cls, pipe, pending):
+        pipe.sadd(cls.prefixes_key(), *pending)
+        for prefix, counts in pending.items():
+            for field, amount in counts.items():
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat(cls.key(prefix), field, amount)
+                else:
+                    pipe.hincrby(cls.key(prefix), field, amount)
+
+    @classmethod
+    def flush(cls):
+        pending = cls._take_pending()
+        if pending:
+            pipe = get_redis().pipeline(transaction=False)
+            cls._queue(pipe, pending)
+            pipe.execute()
+
+    @classmethod
+    async def aflush(cls):
+        pending = cls._take_pending()
+        if pending:
+            pipe = get_async_redis().pipeline(transaction=False)
+            cls._queue(pipe, pending)
+            await pipe.execute()
+
+    @classmethod
+    def snapshot(cls):
+        """Read the counters of every prefix, with derived ratios.
+
+        Returns:
+            dict: The counters and ratios of every prefix
+        """
+        cls.flush()
+        redis = get_redis()
+        prefixes = sorted(p.decode() for p in redis.smembers(cls.prefixes_key()))
+        pipe = redis.pipeline(transaction=False)
+        for prefix in prefixes:
+            pipe.hgetall(cls.key(prefix))
+
+        snapshot = {}
+        for prefix, raw in zip(prefixes, pipe.execute()):
+            counts = {k.decode(): float(v) for k, v in raw.items()}
+            hits = counts.get("hits", 0) + counts.get("stale", 0)
+            lookups = hits + counts.get("misses", 0)
+            fills = counts.get("fills", 0)
+            snapshot[prefix] = {
+                **{k: v if k == "fill_ms" else int(v) for k, v in counts.items()},
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+                "avg_fill_ms": round(counts.get("fill_ms", 0) / fills, 2)
+                if fills
+                else None,
+                "avg_bytes": round(counts.get("bytes", 0) / fills) if fills else None,
+            }
+        return snapshot
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._pending = defaultdict(Counter)
+        redis = get_redis()
+        prefixes = [p.decode() for p in redis.smembers(cls.prefixes_key())]
+        redis.delete(cls.prefixes_key(), *(cls.key(prefix) for prefix in prefixes))
@@ -0,0 +1,304 @@
+import hashlib
+import math
+import random
+import time
+from collections import namedtuple
+from functools import wraps
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag, urlencode
+from app.compression import ResponseCompressor
+from .generations import CacheGenerations
+from .metrics import CacheMetrics
+from .warming import HotPages
+
+# how long a request may hold the right to fill an entry, and how long the
+# others wait for it when there is no stale copy to serve meanwhile
+FILL_LOCK_TIMEOUT = 10
+FILL_WAIT = 2
+FILL_POLL_INTERVAL = 0.05
+
+# XFetch: higher values refresh entries earlier
+EARLY_REFRESH_BETA = 1.0
+
+
+class CachedResponse(
+    namedtuple("CachedResponse", "content status content_type delta expires_at")
+):
+    """A rendered response with how long it took to compute (``delta``) and
+    when its entry expires, both in seconds."""
+
+    def should_refresh(self, beta=EARLY_REFRESH_BETA):
+        """Decide whether to recompute the entry before it expires.
+
+        The chance grows as expiry nears and with the cost of recomputing,
+        so one request refreshes an expensive entry while it is still served
+        to everyone else (probabilistic early expiration, "XFetch").
+        """
+        jitter = -self.delta * beta * math.log(1 - random.random())
+        return time.time() + jitter >= self.expires_at
+
+    def to_response(self):
+        return HttpResponse(
+            self.content, status=self.status, content_type=self.content_type
+        )
+
+
+def build_response_key(
+    resource,
+    generations,
+    full_path,
+    variant=None,
+    media_type="application/json",
+    origin="",
+):
+    """Build the cache key of a rendered response.
+
+    Args:
+        resource (str): The cached resource, e.g. ``events``
+        generations (list): The generations the response is built under
+        full_path (str): The request path and query string, normalized with
+            ``normalize_path``
+        variant (str): What else the response depends on, e.g. the user
+        media_type (str): The media type the response is rendered as
+        origin (str): The scheme and host of the request, see ``get_origin``
+    Returns:
+        str: The cache key
+    """
+    digest = hashlib.md5(f"{media_type} {origin}{full_path}".encode()).hexdigest()
+    generation = ".".join(str(g) for g in generations)
+    if variant is None:
+        return f"resp:{resource}:{generation}:{digest}"
+    return f"resp:{resource}:{variant}:{generation}:{digest}"
+
+
+def get_query_defaults(paginator):
+    """The query parameters a paginator treats as absent when set to these
+    values."""
+    if paginator is None:
+        return {}
+    defaults = {}
+    if getattr(paginator, "page_query_param", None):
+        defaults[paginator.page_query_param] = "1"
+    if getattr(paginator, "page_size_query_param", None) and paginator.page_size:
+        defaults[paginator.page_size_query_param] = str(paginator.page_size)
+    return defaults
+
+
+def normalize_path(request, defaults=None):
+    """Build the path and query string of a request in a canonical form, so
+    equivalent requests share a cache entry: parameters are sorted, and
+    empty ones or ones set to their default dropped.
+
+    Args:
+        request (Request): The request
+        defaults (dict): The default value of query parameters
+    Returns:
+        str: The normalized path
+    """
+    defaults = defaults or {}
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+        if value != "" and defaults.get(name) != value
+    )
+    if not params:
+        return request.path
+    return f"{request.path}?{urlencode(params)}"
+
+
+def get_origin(request):
+    """The scheme and host of a request, which responses embed in their
+    absolute pagination links, so they are part of the cache key."""
+    return f"{request.scheme}://{request.get_host()}"
+
+
+def build_latest_key(key):
+    """Build the key pointing at the latest entry of a response key, whatever
+    the generations it was built under."""
+    head, _, digest = key.rsplit(":", 2)
+    return f"latest:{head}:{digest}"
+
+
+def build_etag(key):
+    """Build the strong ETag of a response from its cache key, which changes
+    whenever one of the generations the response is built under does."""
+    return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+
+def wait_for_fill(key, timeout=FILL_WAIT):
+    """Poll for the entry another request is filling.
+
+    Returns:
+        CachedResponse | None: The entry, or None if it did not show up in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(FILL_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def cache_response(resource, timeout, scopes=None, variant=None, warm=False):
+    """Cache a view action's rendered response under generation counters.
+
+    Args:
+        resource (str): The cached resource
+        timeout (int): Seconds to keep the response
+        scopes (callable): ``(view, request, **kwargs) -> list`` of the scopes
+            of ``resource`` whose counters the response is built under, None
+            standing for the resource-wide counter. Defaults to ``[None]``.
+        variant (callable): ``(view, request, **kwargs) -> str`` of what else
+            the response depends on. Responses with a variant depend on the
+            credentials and are sent with ``Vary: Authorization``.
+        warm (bool): Count requests in ``HotPages`` so the hottest pages
+            are recomputed right after an invalidation. Only for responses
+            without a variant.
+
+    Responses carry an ETag built from the same key, so a matching
+    ``If-None-Match`` gets a 304 before the cache or the database is read.
+
+    Entries are also stored compressed with the content coding negotiated
+    by ``ResponseCompressor``, read in the same round trip as the entry, so
+    hits are not compressed again.
+
+    Only one request at a time fills a missing or refreshing entry. The
+    others are served the entry built under the previous generations while
+    it is filled, or wait for the fill when there is none.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            keys = [
+                CacheGenerations.key(resource, scope)
+                for scope in (
+                    scopes(self, request, **kwargs) if scopes is not None else [None]
+                )
+            ]
+            path = normalize_path(
+                request, get_query_defaults(getattr(self, "paginator", None))
+            )
+            key = build_response_key(
+                resource,
+                CacheGenerations.get_many(keys),
+                path,
+                variant(self, request, **kwargs) if variant is not None else None,
+                request.accepted_media_type,
+                get_origin(request),
+            )
+
+            def finalize(response, key=key):
+                patch_vary_headers(response, ["Accept"])
+                if variant is not None:
+                    patch_vary_headers(response, ["Authorization"])
+                if response.status_code in (200, 304):
+                    response["ETag"] = build_etag(key)
+                return response
+
+            encoding = ResponseCompressor.negotiate(request)
+
+            def encoded_key(key):
+                return f"{key}:{encoding}"
+
+            def compress(response, key, timeout, body=None):
+                """Compress a response, storing its compressed body unless
+                it was read from the cache."""
+                if encoding is None or not ResponseCompressor.should_compress(
+                    response
+                ):
+                    return response
+                patch_vary_headers(response, ["Accept-Encoding"])
+                if body is None:
+                    body = ResponseCompressor.compress(response.content, encoding)
+                    cache.set(encoded_key(key), body, max(1, int(timeout)))
+                if len(body) >= len(response.content):
+                    return response
+                return ResponseCompressor.apply(response, encoding, body)
+
+            def serve(entry, key=key, body=None):
+                return compress(
+                    finalize(entry.to_response(), key),
+                    key,
+                    entry.expires_at - time.time(),
+                    body,
+                )
+
+            not_modified = get_conditional_response(request, etag=build_etag(key))
+            if not_modified is not None:
+                CacheMetrics.record(resource, not_modified=1)
+                return finalize(not_modified)
+
+            if warm:
+                HotPages.record(resource, request.build_absolute_uri(path))
+
+            if encoding is None:
+                entry, encoded = cache.get(key), None
+            else:
+                found = cache.get_many([key, encoded_key(key)])
+                entry, encoded = found.get(key), found.get(encoded_key(key))
+            if entry is not None and not entry.should_refresh():
+                CacheMetrics.record(resource, hits=1)
+                return serve(entry, body=encoded)
+
+            lock = f"lock:{key}"
+            filling = cache.add(lock, 1, FILL_LOCK_TIMEOUT)
+            if not filling:
+                if entry is not None:  # refreshing early elsewhere
+                    CacheMetrics.record(resource, hits=1)
+                    return serve(entry, body=encoded)
+                stale_key = cache.get(build_latest_key(key))
+                stale = cache.get(stale_key) if stale_key is not None else None
+                if stale is not None:
+                    CacheMetrics.record(resource, stale=1)
+                    return serve(stale, stale_key)
+                entry = wait_for_fill(key)
+                if entry is not None:
+                    CacheMetrics.record(resource, hits=1)
+                    return serve(entry)
+
+            CacheMetrics.record(resource, misses=1)
+            started = time.monotonic()
+
+            def store(response):
+                entry = CachedResponse(
+                    response.content,
+                    response.status_code,
+                    response["Content-Type"],
+                    time.monotonic() - started,
+                    time.time() + timeout,
+                )
+                cache.set_many({key: entry, build_latest_key(key): key}, timeout)
+                compress(response, key, timeout)
+                if filling:
+                    cache.delete(lock)
+                CacheMetrics.record(
+                    resource,
+                    fills=1,
+                    fill_ms=entry.delta * 1000,
+                    bytes=len(entry.content),
+                )
+
+            try:
+                response = finalize(view_method(self, request, *args, **kwargs))
+            except Exception:
+                if filling:
+                    cache.delete(lock)
+                raise
+
+            if response.status_code == 200:
+                if hasattr(response, "add_post_render_callback"):
+                    response.add_post_render_callback(store)  # DRF renders later
+                else:
+                    store(response)
+            elif filling:
+                cache.delete(lock)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from app.connections import get_async_redis, get_redis
+import logging
+
+logger = logging.getLogger("app")
+
+MISSING = object()
+
+
+class LocalCache:
+    """A bounded, thread-safe LRU cache with a TTL, local to the process."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # advanced by every deletion, so fills racing one can be discarded
+        self.version = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_many(self, keys):
+        """Returns the live entries among ``keys``, refreshing their recency."""
+        found = {}
+        now = time.monotonic()
+        with self.lock:
+            for key in keys:
+                entry = self.entries.get(key)
+                if entry is None or entry[1] < now:
+                    self.misses += 1
+                    continue
+                self.entries.move_to_end(key)
+                self.hits += 1
+                found[key] = entry[0]
+        return found
+
+    def set_many(self, mapping, version=None):
+        """Store entries, unless ``version`` is given and entries were deleted
+        since it was read, as the values may predate the deletion."""
+        expires_at = time.monotonic() + self.timeout
+        with self.lock:
+            if version is not None and version != self.version:
+                return
+            for key, value in mapping.items():
+                self.entries[key] = (value, expires_at)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys):
+        with self.lock:
+            self.version += 1
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+        }
+
+
+class TieredCache:
+    """An in-process ``LocalCache`` in front of the default Redis cache.
+
+    Every write through this class publishes the written keys on a Redis
+    channel, and a daemon thread in each process drops them from its local
+    tier. The local tier is bypassed until that subscription is up, and
+    cleared whenever it is re-established, so a process never serves
+    entries whose invalidation it could have missed. The local TTL bounds
+    staleness should a message still be lost.
+
+    Values are shared by every thread of the process and must not be
+    mutated by callers.
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.local = LocalCache(max_entries, timeout)
+        self.listening = False
+        self.pid = None
+        self.start_lock = threading.Lock()
+
+    @property
+    def channel(self):
+        return cache.make_key("cache:invalidate")
+
+    def ensure_listener(self):
+        """Start the invalidation listener of this process, once per fork."""
+        if self.pid == os.getpid():
+            return
+        with self.start_lock:
+            if self.pid == os.getpid():
+                return
+            self.listening = False
+            self.local.clear()
+            self.pid = os.getpid()
+            threading.Thread(
+                target=self.listen, name="tiered-cache-invalidation", daemon=True
+            ).start()
+
+    def listen(self):
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        self.local.clear()
+                        self.listening = True
+                    elif message["type"] == "message":
+                        self.local.delete_many(json.loads(message["data"]))
+            except Exception:
+                logger.exception("Cache invalidation subscription lost, reconnecting")
+            finally:
+                self.listening = False
+                pubsub.close()
+            time.sleep(1)
+
+    def get_many(self, keys, negative=False):
+        """Read keys from the local tier, then the missing ones from Redis.
+
+        Args:
+            keys (list): The keys to read
+            negative (bool): Also remember locally which keys Redis does not
+                have. Only for keys that are written through this class.
+        Returns:
+            dict: The values of the keys that exist
+        """
+        self.ensure_listener()
+        if not self.listening:
+            return cache.get_many(keys)
+
+        version = self.local.version
+        values = self.local.get_many(keys)
+        missing = [key for key in keys if key not in values]
+        if missing:
+            fetched = cache.get_many(missing)
+            if negative:
+                fetched = {key: fetched.get(key, MISSING) for key in missing}
+            self.local.set_many(fetched, version)
+            values.update(fetched)
+        return {key: value for key, value in values.items() if value is not MISSING}
+
+    def peek(self, keys):
+        """Read keys from the local tier only, for callers that read Redis
+        themselves and ``remember`` what they read.
+
+        Returns:
+            tuple: ``(values, version)`` of the local tier
+        """
+        self.ensure_listener()
+        if not self.listening:
+            return {}, None
+        version = self.local.version
+        return self.local.get_many(keys), version
+
+    def remember(self, mapping, version):
+        """Fill the local tier with values read from Redis after ``peek``
+        returned ``version``."""
+        if version is not None and self.listening:
+            self.local.set_many(mapping, version)
+
+    def set_many(self, mapping, timeout):
+        cache.set_many(mapping, timeout)
+        self.invalidate(list(mapping))
+
+    def set(self, key, value, timeout):
+        cache.set(key, value, timeout)
+        self.invalidate([key])
+
+    def delete_many(self, keys, pipe=None):
+        keys = list(keys)
+        if pipe is None:
+            cache.delete_many(keys)
+        elif keys:
+            pipe.delete(*(cache.make_key(key) for key in keys))
+        self.invalidate(keys, pipe)
+
+    def invalidate(self, keys, pipe=None):
+        """Drop keys from the local tier of every process, e.g. after they
+        were changed in Redis directly.
+
+        Args:
+            keys (list): The keys to drop
+            pipe (Pipeline): Queue the publish on this pipeline instead
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        self.local.delete_many(keys)
+        (pipe or get_redis()).publish(self.channel, json.dumps(keys))
+
+    async def ainvalidate(self, keys):
+        """Async counterpart of ``invalidate``."""
+        keys = list(keys)
+        if not keys:
+            return
+        self.local.delete_many(keys)
+        await get_async_redis().publish(self.channel, json.dumps(keys))
+
+    def stats(self):
+        return {"listening": self.listening, **self.local.stats()}
+
+
+tiered_cache = TieredCache(
+    settings.TIERED_CACHE["MAX_ENTRIES"], settings.TIERED_CACHE["TIMEOUT"]
+)
@@ -0,0 +1,89 @@
+import random
+from urllib.parse import urlsplit
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import resolve
+from app.connections import get_redis
+from events_planning_django.celery import app as celery_app
+import logging
+
+logger = logging.getLogger("app")
+
+
+class HotPages:
+    """Tracks the most requested pages of a resource and re-warms them
+    after the resource is invalidated.
+
+    Request counts live in a Redis sorted set per resource, trimmed to the
+    ``KEEP`` most requested pages. Only one request in ``SAMPLE_RATE`` is
+    counted, for ``SAMPLE_RATE``, so serving a page rarely waits on Redis.
+    Every warm-up halves the counts, so the set follows current traffic.
+    """
+
+    LIMIT = 20
+    KEEP = 200
+    SAMPLE_RATE = 10
+    WARM_DELAY = 2
+
+    @staticmethod
+    def key(resource):
+        return cache.make_key(f"hot:{resource}")
+
+    @classmethod
+    def record(cls, resource, url):
+        """Count a request to an absolute URL of a resource, one time in
+        ``SAMPLE_RATE``."""
+        if random.randrange(cls.SAMPLE_RATE):
+            return
+        key = cls.key(resource)
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.zincrby(key, cls.SAMPLE_RATE, url)
+        pipe.zremrangebyrank(key, 0, -cls.KEEP - 1)
+        pipe.execute()
+
+    @classmethod
+    def top(cls, resource, limit=LIMIT):
+        return [
+            url.decode()
+            for url in get_redis().zrevrange(cls.key(resource), 0, limit - 1)
+        ]
+
+    @classmethod
+    def schedule(cls, resource):
+        """Warm the hot pages of a resource shortly, coalescing the
+        invalidations of a burst of writes into one warm-up."""
+        if cache.add(f"hot:{resource}:scheduled", 1, cls.WARM_DELAY):
+            celery_app.send_task(
+                "app.tasks.warm_hot_pages", args=[resource], countdown=cls.WARM_DELAY
+            )
+
+    @classmethod
+    def warm(cls, resource, limit=LIMIT):
+        """Replay the hottest anonymous requests of a resource through its
+        views so they fill the response cache.
+
+        Returns:
+            int: The number of pages warmed
+        """
+        warmed = 0
+        factory = RequestFactory()
+        for url in cls.top(resource, limit):
+            parts = urlsplit(url)
+            request = factory.get(
+                f"{parts.path}?{parts.query}",
+                HTTP_HOST=parts.netloc,
+                HTTP_ACCEPT="application/json",
+                secure=parts.scheme == "https",
+            )
+            match = resolve(parts.path)
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            if response.status_code == 200:
+                warmed += 1
+            else:
+                logger.warning(f"Warming {url} returned {response.status_code}")
+
+        key = cls.key(resource)
+        get_redis().zunionstore(key, {key: 0.5})
+        return warmed
@@ -0,0 +1,117 @@
+import gzip
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def available_encodings():
+    """The content codings importable here, preferred first.
+
+    Returns:
+        dict: Compress functions by coding name
+    """
+    encodings = {}
+    if brotli is not None:
+        encodings["br"] = lambda content: brotli.compress(content, quality=4)
+    if zstandard is not None:
+        encodings["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    encodings["gzip"] = lambda content: gzip.compress(
+        content, compresslevel=6, mtime=0
+    )
+    return encodings
+
+
+class ResponseCompressor:
+    """Negotiates and applies the content coding of HTTP responses.
+
+    Responses are compressed with the preferred coding the client accepts,
+    brotli, then zstd, then gzip, when their body is at least
+    ``RESPONSE_COMPRESSION["MIN_LENGTH"]`` bytes. Streaming responses, such
+    as exports and event streams, are sent as they are.
+    """
+
+    encodings = available_encodings()
+
+    @staticmethod
+    def min_length():
+        return getattr(settings, "RESPONSE_COMPRESSION", {}).get("MIN_LENGTH", 1024)
+
+    @classmethod
+    def negotiate(cls, request):
+        """Pick the coding of a request's response from its Accept-Encoding.
+
+        Returns:
+            str | None: The coding, or None to send the body as it is
+        """
+        header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if not header:
+            return None
+        accepted = {}
+        for part in header.split(","):
+            coding, *params = (p.strip() for p in part.split(";"))
+            quality = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0
+            if coding:
+                accepted[coding.lower()] = quality
+        wildcard = accepted.get("*", 0)
+        best, best_quality = None, 0
+        for coding in cls.encodings:  # preferred first, wins ties
+            quality = accepted.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    @classmethod
+    def should_compress(cls, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return False
+        return len(response.content) >= cls.min_length()
+
+    @classmethod
+    def compress(cls, content, encoding):
+        return cls.encodings[encoding](content)
+
+    @staticmethod
+    def apply(response, encoding, body):
+        """Replace a response's body with its ``encoding`` compressed form.
+
+        The ETag turns weak, as the compressed body differs byte for byte
+        from the one it was computed for; If-None-Match still matches it.
+        """
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
+
+    @classmethod
+    def process(cls, request, response):
+        """Compress a response if it is large enough and the client accepts
+        a coding. Always varies on Accept-Encoding when it could have."""
+        if not cls.should_compress(response):
+            return response
+        patch_vary_headers(response, ["Accept-Encoding"])
+        encoding = cls.negotiate(request)
+        if encoding is None:
+            return response
+        body = cls.compress(response.content, encoding)
+        if len(body) >= len(response.content):
+            return response
+        return cls.apply(response, encoding, body)
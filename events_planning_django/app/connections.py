@@ -0,0 +1,27 @@
+import asyncio
+import weakref
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis import asyncio as aioredis
+
+# async clients bind their connections to the loop they were first used on
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_redis():
+    """Returns the raw Redis client behind the default django-redis cache."""
+    return get_redis_connection("default")
+
+
+def get_async_redis():
+    """Returns an asyncio Redis client for the running event loop.
+
+    Returns:
+        redis.asyncio.Redis: The client, shared by everything on the loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = aioredis.Redis.from_url(settings.REDIS_URL)
+        _async_clients[loop] = client
+    return client
@@ -70,7 +70,9 @@ class TicketFactory(BaseFactory):
 
     def _get_defaults(self, **kwargs):
         return {
-            "ticket_code": kwargs.get("ticket_code", faker.unique.uuid4()),
+            "ticket_code": kwargs.get(
+                "ticket_code", faker.unique.hexify("^" * 23, upper=True)
+            ),
             "event": kwargs.get(
                 "event", None
             ),  # Should be set to a valid event instance
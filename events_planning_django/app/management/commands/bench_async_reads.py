@@ -0,0 +1,115 @@
+import asyncio
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+
+ENDPOINTS = {
+    "events": ("/api/events/", "/api/async/events/"),
+    "stats": ("/api/stats/", "/api/async/stats/"),
+    "tickets": ("/api/tickets/", "/api/async/tickets/"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second and memory per in-flight request of the "
+        "sync (WSGI) and async (ASGI) read endpoints, in-process"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", choices=sorted(ENDPOINTS), default="events"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=500, help="Requests per run"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=50, help="Requests in flight"
+        )
+        parser.add_argument(
+            "--token", help="Access token, required for the organiser endpoints"
+        )
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="Clear the cache before every request",
+        )
+
+    def handle(self, *args, **options):
+        if options["endpoint"] != "events" and not options["token"]:
+            raise CommandError("--token is required for this endpoint")
+
+        sync_path, async_path = ENDPOINTS[options["endpoint"]]
+        headers = {}
+        if options["token"]:
+            headers["authorization"] = f"Token {options['token']}"
+
+        for label, runner, path in (
+            ("WSGI", self.run_sync, sync_path),
+            ("ASGI", self.run_async, async_path),
+        ):
+            self.measure(label, runner, path, headers, options)
+
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def measure(self, label, runner, path, headers, options):
+        cache.clear()
+        tracemalloc.start()
+        started = time.perf_counter()
+        statuses = runner(path, headers, options)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        failed = sum(status != 200 for status in statuses)
+        self.stdout.write(
+            f"{label} {path}: {len(statuses) / elapsed:,.0f} req/s, "
+            f"{peak / options['concurrency'] / 1024:,.1f} KiB peak per "
+            f"in-flight request, {failed} failed"
+        )
+
+    def run_sync(self, path, headers, options):
+        def worker(count):
+            client = Client(headers=headers)
+            try:
+                return [self.fetch_sync(client, path, options) for _ in range(count)]
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(options["concurrency"]) as pool:
+            batches = pool.map(worker, self.split(options))
+        return [status for batch in batches for status in batch]
+
+    def fetch_sync(self, client, path, options):
+        if options["cold"]:
+            cache.clear()
+        return client.get(path).status_code
+
+    def run_async(self, path, headers, options):
+        async def worker(count):
+            client = AsyncClient(headers=headers)
+            statuses = []
+            for _ in range(count):
+                if options["cold"]:
+                    await cache.aclear()
+                statuses.append((await client.get(path)).status_code)
+            return statuses
+
+        async def main():
+            batches = await asyncio.gather(
+                *(worker(count) for count in self.split(options))
+            )
+            return [status for batch in batches for status in batch]
+
+        return asyncio.run(main())
+
+    @staticmethod
+    def split(options):
+        per_worker, extra = divmod(options["requests"], options["concurrency"])
+        return [
+            per_worker + (1 if i < extra else 0)
+            for i in range(options["concurrency"])
+        ]
@@ -0,0 +1,74 @@
+import pickle
+import time
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from app.caching.compressors import ThresholdCompressor, available_codecs
+from app.caching.responses import CachedResponse
+from app.connections import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stored size, encode and decode time and Redis hit latency "
+        "of a cached event list page, uncompressed and with every available codec"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size", type=int, default=50, help="Events on the benchmarked page"
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=200, help="Runs per measurement"
+        )
+
+    def handle(self, *args, **options):
+        value = pickle.dumps(
+            self.fetch_page(options["page_size"]), pickle.DEFAULT_PROTOCOL
+        )
+        self.stdout.write(f"Event list page with pickle: {len(value):,} bytes")
+
+        self.measure("none", None, value, options["iterations"])
+        for name in available_codecs():
+            compressor = ThresholdCompressor(
+                {"COMPRESS_CODEC": name, "COMPRESS_MIN_LENGTH": 0}
+            )
+            self.measure(name, compressor, value, options["iterations"])
+
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def fetch_page(self, page_size):
+        response = Client().get("/api/events/", {"page_size": page_size})
+        if response.status_code != 200:
+            raise CommandError(f"Event list returned {response.status_code}")
+        return CachedResponse(
+            response.content, response.status_code, response["Content-Type"], 0, 0
+        )
+
+    def measure(self, label, compressor, value, iterations):
+        encode = compressor.compress if compressor else (lambda v: v)
+        decode = compressor.decompress if compressor else (lambda v: v)
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            stored = encode(value)
+        encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            decode(stored)
+        decode_us = (time.perf_counter() - started) / iterations * 1e6
+
+        redis = get_redis()
+        key = cache.make_key(f"bench:codec:{label}")
+        redis.set(key, stored)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            decode(redis.get(key))
+        hit_us = (time.perf_counter() - started) / iterations * 1e6
+        redis.delete(key)
+
+        self.stdout.write(
+            f"{label:>5}: {len(stored):>9,} bytes ({len(stored) / len(value):6.1%}), "
+            f"encode {encode_us:8.1f} us, decode {decode_us:8.1f} us, "
+            f"hit {hit_us:8.1f} us"
+        )
@@ -0,0 +1,81 @@
+import io
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from app.apis.renderers import ORJSONParser, ORJSONRenderer, orjson
+from app.apis.serializers import EventSerializer, TicketSerializer
+from app.models import Event, Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the render and parse time of DRF's stdlib JSON classes and "
+        "the orjson ones on event and ticket list payloads"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size", type=int, default=50, help="Rows per benchmarked page"
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=200, help="Runs per measurement"
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed, nothing to compare")
+
+        page_size = options["page_size"]
+        events = list(Event.objects.select_related("organiser")[:page_size])
+        tickets = list(
+            Ticket.objects.select_related("event__organiser", "attendee")[:page_size]
+        )
+        if not events or not tickets:
+            raise CommandError("Seed events and tickets first")
+
+        payloads = {
+            "events": {
+                "next": None,
+                "previous": None,
+                "results": [EventSerializer().serialize_fragment(e) for e in events],
+            },
+            "tickets (expanded)": {
+                "next": None,
+                "previous": None,
+                "results": TicketSerializer(
+                    tickets, many=True, expand=["event", "attendee"]
+                ).data,
+            },
+        }
+        for label, payload in payloads.items():
+            self.compare(f"{label}, {len(payload['results'])} rows", payload, options)
+
+    def compare(self, label, payload, options):
+        iterations = options["iterations"]
+        body = JSONRenderer().render(payload)
+        self.stdout.write(f"{label}: {len(body):,} bytes")
+
+        timings = {}
+        for name, renderer, parser in (
+            ("json", JSONRenderer(), JSONParser()),
+            ("orjson", ORJSONRenderer(), ORJSONParser()),
+        ):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                renderer.render(payload)
+            render_us = (time.perf_counter() - started) / iterations * 1e6
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                parser.parse(io.BytesIO(body))
+            parse_us = (time.perf_counter() - started) / iterations * 1e6
+            timings[name] = (render_us, parse_us)
+
+        for name, (render_us, parse_us) in timings.items():
+            base_render, base_parse = timings["json"]
+            self.stdout.write(
+                f"  {name:<7} render {render_us:9.1f} us "
+                f"({base_render / render_us:4.1f}x)   "
+                f"parse {parse_us:9.1f} us ({base_parse / parse_us:4.1f}x)"
+            )
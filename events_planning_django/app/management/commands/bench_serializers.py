@@ -0,0 +1,71 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from app.apis.compiled import CompiledSerializerMixin
+from app.apis.serializers import EventSerializer, OrderSerializer, TicketSerializer
+from app.models import Event, Order, Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare objects serialized per second by DRF's field machinery and "
+        "the compiled read path, on event, ticket and order pages"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size", type=int, default=50, help="Rows per benchmarked page"
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=200, help="Pages per measurement"
+        )
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        events = list(Event.objects.select_related("organiser")[:page_size])
+        tickets = list(
+            Ticket.objects.select_related("event__organiser", "attendee")[:page_size]
+        )
+        orders = list(
+            Order.objects.select_related("attendee").prefetch_related(
+                "items__event"
+            )[:page_size]
+        )
+        if not events or not tickets:
+            raise CommandError("Seed events and tickets first")
+
+        cases = [
+            ("events", EventSerializer, events, {}),
+            ("tickets", TicketSerializer, tickets, {}),
+            (
+                "tickets ?expand=event,attendee",
+                TicketSerializer,
+                tickets,
+                {"expand": ["event", "attendee"]},
+            ),
+            ("orders ?expand=items", OrderSerializer, orders, {"expand": ["items"]}),
+        ]
+        for label, serializer_class, rows, kwargs in cases:
+            if rows:
+                self.compare(label, serializer_class, rows, kwargs, options["iterations"])
+
+    def measure(self, serializer_class, rows, kwargs, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            # a fresh serializer per page, as per request
+            serializer = serializer_class(**kwargs)
+            render = getattr(serializer, "serialize_fragment", serializer.to_representation)
+            for row in rows:
+                render(row)
+        return len(rows) * iterations / (time.perf_counter() - started)
+
+    def compare(self, label, serializer_class, rows, kwargs, iterations):
+        CompiledSerializerMixin.use_compiled = False
+        try:
+            drf = self.measure(serializer_class, rows, kwargs, iterations)
+        finally:
+            CompiledSerializerMixin.use_compiled = True
+        compiled = self.measure(serializer_class, rows, kwargs, iterations)
+        self.stdout.write(
+            f"{label:<32} DRF {drf:>10,.0f} obj/s   "
+            f"compiled {compiled:>10,.0f} obj/s   ({compiled / drf:.1f}x)"
+        )
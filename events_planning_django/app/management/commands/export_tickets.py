@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from app.models import Event
+from app.services.exports import TicketExportService
+
+
+class Command(BaseCommand):
+    help = (
+        "Export an event's tickets with their attendee and order as CSV or "
+        "NDJSON, streamed in constant memory"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("event_id", type=int, help="The exported event")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=list(TicketExportService.CONTENT_TYPES),
+            default=TicketExportService.CSV,
+            help="Output format (default: csv)",
+        )
+        parser.add_argument(
+            "--output", "-o", help="File to write to, standard output by default"
+        )
+        parser.add_argument(
+            "--sold-only",
+            action="store_true",
+            help="Only export tickets with an attendee",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            event = Event.objects.get(pk=options["event_id"])
+        except Event.DoesNotExist:
+            raise CommandError(f"Event {options['event_id']} does not exist")
+
+        chunks = TicketExportService.stream(
+            event, options["file_format"], options["sold_only"]
+        )
+        if options["output"] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(f"Exported event {event.id} to {options['output']}")
@@ -0,0 +1,28 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from app.compression import ResponseCompressor
+
+
+class CompressionMiddleware:
+    """Compresses responses with the content coding negotiated by
+    ``ResponseCompressor``. Responses already compressed, e.g. by the
+    response cache, are left as they are.
+
+    Runs natively under both WSGI and ASGI, so async views are not moved to
+    a thread to be compressed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return ResponseCompressor.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return ResponseCompressor.process(request, await self.get_response(request))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:52
+
+import base64
+import struct
+from django.db import migrations, models
+from django.utils.crypto import salted_hmac
+
+
+def issue_code(event_id, serial):
+    """TicketCodeService.issue as of this migration, frozen so later changes
+    to the code format do not change what it issued."""
+    payload = struct.pack(">II", event_id, serial)
+    signature = salted_hmac(
+        "app.services.codes.TicketCodeService", payload, algorithm="sha256"
+    ).digest()[:6]
+    return base64.b32encode(payload + signature).decode("ascii").rstrip("=")
+
+
+def reissue_ticket_codes(apps, schema_editor):
+    """Replace legacy ticket codes with signed ones, numbered per event."""
+    Event = apps.get_model("app", "Event")
+    Ticket = apps.get_model("app", "Ticket")
+
+    for event_id in Event.objects.values_list("id", flat=True).iterator():
+        tickets = list(Ticket.objects.filter(event_id=event_id).order_by("id"))
+        for serial, ticket in enumerate(tickets, start=1):
+            ticket.ticket_code = issue_code(event_id, serial)
+        Ticket.objects.bulk_update(tickets, ["ticket_code"], batch_size=1000)
+        Event.objects.filter(id=event_id).update(tickets_issued=len(tickets))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0012_alter_customuser_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='tickets_issued',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(reissue_ticket_codes, migrations.RunPython.noop),
+    ]
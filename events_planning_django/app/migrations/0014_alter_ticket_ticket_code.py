@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0013_event_tickets_issued_reissue_ticket_codes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='ticket_code',
+            field=models.CharField(max_length=24, unique=True),
+        ),
+    ]
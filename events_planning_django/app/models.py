@@ -1,7 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
-from datetime import timezone
+from django.utils import timezone
 from django.contrib.auth.models import UserManager
 
 
@@ -37,6 +37,78 @@ class SoftDeleteQureySet(models.QuerySet):  # Custom QuerySet to handle soft del
         return self.exclude(deleted_at__isnull=True)
 
 
+class TrackedFieldsMixin:
+    """Remembers the values of ``tracked_fields`` as loaded from or last saved
+    to the database, so changes are known without querying it again.
+
+    Fields deferred when the instance was loaded fall back to a query.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def snapshot_tracked_fields(self, fields=None):
+        """Record the current values of tracked fields as their saved values.
+
+        Args:
+            fields (Iterable[str]): Only these fields, e.g. after a save with
+                ``update_fields``. Defaults to every tracked field.
+        """
+        saved = self.__dict__.setdefault("_saved_values", {})
+        for name in self.tracked_fields if fields is None else fields:
+            if name not in self.tracked_fields:
+                continue
+            attname = self._meta.get_field(name).attname
+            if attname in self.__dict__:  # not deferred
+                saved[name] = self.__dict__[attname]
+
+    def get_saved_value(self, name):
+        """Returns the value a tracked field has in the database.
+
+        Raises:
+            ValueError: If the field is not tracked or the instance is unsaved
+        """
+        if name not in self.tracked_fields:
+            raise ValueError(f"{name} is not a tracked field.")
+        if self._state.adding:
+            raise ValueError("The instance has not been saved yet.")
+        saved = self.__dict__.get("_saved_values", {})
+        if name not in saved:
+            attname = self._meta.get_field(name).attname
+            saved[name] = (
+                type(self)
+                ._base_manager.filter(pk=self.pk)
+                .values_list(attname, flat=True)
+                .get()
+            )
+            self.__dict__["_saved_values"] = saved
+        return saved[name]
+
+    def has_changed(self, name):
+        """Whether a tracked field differs from its saved value. Always True
+        for unsaved instances."""
+        if self._state.adding:
+            return True
+        attname = self._meta.get_field(name).attname
+        return getattr(self, attname) != self.get_saved_value(name)
+
+    def changed_fields(self):
+        return [name for name in self.tracked_fields if self.has_changed(name)]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.snapshot_tracked_fields(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self.snapshot_tracked_fields(fields)
+
+
 class CustomUserManager(
     UserManager
 ):  # Custom manager to handle soft deletion by overriding the original UserManager
@@ -60,7 +132,7 @@ class CustomUserManager(
         return SoftDeleteQureySet(self.model, using=self._db).dead()
 
 
-class CustomUser(AbstractUser):
+class CustomUser(TrackedFieldsMixin, AbstractUser):
 
     class UserType(models.TextChoices):
         ATTENDEE = "attendee", "Attendee"
@@ -73,6 +145,7 @@ class CustomUser(AbstractUser):
     deleted_at = models.DateTimeField(blank=True, null=True)
 
     objects = CustomUserManager()
+    tracked_fields = ("username", "user_type", "is_active", "deleted_at")
 
     def is_attendee(self):
         """verifies if the user is an attendee
@@ -110,7 +183,7 @@ def validate_user_is_attendee(user):
         raise ValidationError("User must be an attendee.")
 
 
-class Event(models.Model):
+class Event(TrackedFieldsMixin, models.Model):
 
     class Status(models.TextChoices):
         SOON = "soon", "Soon"
@@ -128,9 +201,16 @@ class Event(models.Model):
     date_time = models.DateTimeField()
     event_status = models.CharField(choices=Status.choices, default=Status.SOON)
     tickets_amount = models.PositiveIntegerField()
+    tickets_issued = models.PositiveIntegerField(
+        default=0, editable=False
+    )  # serial of the last ticket code issued for this event
     ticket_price = models.FloatField(max_length=10)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, null=True)
+    # when tickets were last sold, reserved or released, for the change feed
+    availability_changed_at = models.DateTimeField(
+        null=True, blank=True, editable=False
+    )
 
     organiser = models.ForeignKey(
         CustomUser,
@@ -138,10 +218,53 @@ class Event(models.Model):
         related_name="events",
     )
 
+    tracked_fields = ("tickets_amount", "organiser")
+
+    class Meta:
+        indexes = [
+            # keyset pagination of the event lists
+            models.Index(fields=["date_time", "id"], name="event_date_time_id_idx"),
+            # scans of the change feed
+            models.Index(fields=["updated_at", "id"], name="event_updated_at_id_idx"),
+            models.Index(
+                fields=["availability_changed_at", "id"],
+                name="event_availability_id_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class EventTombstone(models.Model):
+    """Records a deleted event, for the change feed to report it."""
+
+    event_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"], name="tombstone_deleted_at_id_idx"),
+        ]
+
+
+class OrderQuerySet(models.QuerySet):
+
+    def for_organiser(self, organiser):
+        """Returns the orders with at least one item of the organiser's events,
+        each once, without joining the items into the rows.
+        Returns:
+            QuerySet: QuerySet of the organiser's orders
+        """
+        return self.filter(
+            models.Exists(
+                OrderItem.objects.filter(
+                    order=models.OuterRef("pk"), event__organiser=organiser
+                )
+            )
+        )
+
+
 class Order(models.Model):
     class PaymentMethod(models.TextChoices):
         CASH = "cash", "Cash"
@@ -166,6 +289,14 @@ class Order(models.Model):
         CustomUser, on_delete=models.CASCADE, related_name="orders"
     )
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # keyset pagination of an attendee's orders
+            models.Index(fields=["attendee", "id"], name="order_attendee_id_idx"),
+        ]
+
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
@@ -174,11 +305,11 @@ class OrderItem(models.Model):
     quantity = models.PositiveIntegerField(default=1)
 
 
-class Ticket(models.Model):
+class Ticket(TrackedFieldsMixin, models.Model):
 
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="tickets")
 
-    ticket_code = models.CharField(max_length=255, unique=True)
+    ticket_code = models.CharField(max_length=24, unique=True)
     attendee = models.ForeignKey(
         CustomUser,
         null=True,
@@ -196,3 +327,12 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True, null=True)
     reserved_until = models.DateTimeField(null=True, blank=True)
+    checked_in_at = models.DateTimeField(null=True, blank=True)
+
+    tracked_fields = ("ticket_code", "checked_in_at")
+
+    class Meta:
+        indexes = [
+            # keyset pagination of an event's tickets
+            models.Index(fields=["event", "id"], name="ticket_event_id_idx"),
+        ]
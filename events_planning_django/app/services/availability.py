@@ -0,0 +1,143 @@
+import datetime
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from app.models import Event, Ticket
+from app.connections import get_redis
+from app.caching.collector import TransactionCollector
+from logging import getLogger
+
+logger = getLogger("app")
+
+
+class AvailabilityService:
+    """Computes and broadcasts how many tickets are left per event."""
+
+    CHANNEL_PREFIX = "availability:"
+
+    COUNTS = {
+        "total": Count("id"),
+        "sold": Count("id", filter=Q(attendee__isnull=False)),
+        "reserved": Count(
+            "id", filter=Q(attendee__isnull=True, order_item__isnull=False)
+        ),
+    }
+
+    @classmethod
+    def channel(cls, event_id):
+        return f"{cls.CHANNEL_PREFIX}{event_id}"
+
+    @staticmethod
+    def _as_snapshot(event_id, total, sold, reserved):
+        return {
+            "event_id": event_id,
+            "total": total,
+            "sold": sold,
+            "reserved": reserved,
+            "available": total - sold - reserved,
+        }
+
+    @classmethod
+    def snapshot(cls, event_ids):
+        """Count the tickets of several events in a single query.
+
+        Args:
+            event_ids (Iterable[int]): The events to count
+        Returns:
+            dict: Availability snapshots keyed by event ID
+        """
+        event_ids = set(event_ids)
+        snapshots = {
+            event_id: cls._as_snapshot(event_id, 0, 0, 0) for event_id in event_ids
+        }
+        rows = (
+            Ticket.objects.filter(event_id__in=event_ids)
+            .values("event_id")
+            .annotate(**cls.COUNTS)
+            .order_by()
+        )
+        for row in rows:
+            snapshots[row["event_id"]] = cls._as_snapshot(**row)
+        return snapshots
+
+    @classmethod
+    async def asnapshot(cls, event_id):
+        """Async counterpart of ``snapshot`` for a single event."""
+        counts = await Ticket.objects.filter(event_id=event_id).aaggregate(
+            **cls.COUNTS
+        )
+        return cls._as_snapshot(event_id, **counts)
+
+    @classmethod
+    def publish(cls, event_ids, pipe=None):
+        """Publish the current availability of the given events.
+
+        Args:
+            event_ids (Iterable[int]): The events to publish
+            pipe (Pipeline): Queue the messages on this pipeline instead, for
+                the caller to execute
+        """
+        if not event_ids:
+            return
+
+        queue = pipe if pipe is not None else get_redis().pipeline(transaction=False)
+        for event_id, snapshot in cls.snapshot(event_ids).items():
+            queue.publish(cls.channel(event_id), json.dumps(snapshot))
+        if pipe is None:
+            queue.execute()
+
+    @staticmethod
+    def stamp(event_ids):
+        """Stamp the events' ``availability_changed_at`` for the change feed,
+        once per event and CHANGE_FEED["AVAILABILITY_COALESCE_SECONDS"].
+
+        The stamp is set to the end of that window, so the feed reports the
+        event, with its availability as of then or later, after every change
+        in the window, and those changes need no write of the event row.
+        """
+        window = settings.CHANGE_FEED["AVAILABILITY_COALESCE_SECONDS"]
+        due = list(event_ids)
+        keys = [
+            cache.make_key(f"availability:stamped:{event_id}") for event_id in due
+        ]
+        if window > 0 and due:
+            pipe = get_redis().pipeline(transaction=False)
+            for key in keys:
+                pipe.set(key, 1, nx=True, ex=window)
+            claimed = pipe.execute()
+            keys = [key for key, ok in zip(keys, claimed) if ok]
+            due = [event_id for event_id, ok in zip(due, claimed) if ok]
+        if not due:
+            return
+
+        try:
+            Event.objects.filter(id__in=due).update(
+                availability_changed_at=timezone.now()
+                + datetime.timedelta(seconds=window)
+            )
+        except Exception:
+            if window > 0:
+                get_redis().delete(*keys)  # so the next change stamps them
+            raise
+
+    @classmethod
+    def flush(cls, event_ids, pipe):
+        """Stamp the availability of events for the change feed, and publish
+        it on ``pipe``."""
+        cls.stamp(event_ids)
+        cls.publish(event_ids, pipe)
+
+    @classmethod
+    def notify_changed(cls, event_ids):
+        """Publish and stamp the availability of the given events once the
+        current transaction commits, once per event however often it changed.
+
+        Args:
+            event_ids (Iterable[int]): The events whose inventory changed
+        """
+        TransactionCollector.add("availability", event_ids)
+
+
+TransactionCollector.register("availability", AvailabilityService.flush)
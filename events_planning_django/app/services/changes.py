@@ -0,0 +1,203 @@
+import base64
+import datetime
+import json
+from collections import namedtuple
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from app.models import Event, EventTombstone
+from app.services.availability import AvailabilityService
+
+ChangeSet = namedtuple(
+    "ChangeSet", ["events", "deleted", "availability", "cursor", "has_more"]
+)
+
+
+class ChangeFeedService:
+    """Reads what changed about events since a cursor, so clients resync in
+    proportion to the changes rather than to the catalog.
+
+    Three streams are scanned on their own ``(timestamp, id)`` index, each
+    from its own watermark held in the cursor:
+        - events created or updated, on ``Event.updated_at``
+        - events deleted, on ``EventTombstone.deleted_at``
+        - events whose tickets were sold, reserved or released, on
+          ``Event.availability_changed_at``
+
+    Without a cursor the feed walks every event, then follows deletions and
+    availability from when the walk started. Rows younger than
+    ``CHANGE_FEED["SETTLE_SECONDS"]`` are left for the next read, so rows of
+    transactions committing late are not skipped over.
+    """
+
+    EVENTS = "e"
+    DELETED = "d"
+    AVAILABILITY = "a"
+
+    # * -------------------#
+    # * CURSORS
+    # * -------------------#
+
+    @staticmethod
+    def encode_cursor(positions):
+        payload = json.dumps(
+            {
+                stream: [changed_at.isoformat() if changed_at else None, pk]
+                for stream, (changed_at, pk) in positions.items()
+            },
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode_cursor(cls, cursor):
+        """Read the watermarks of a cursor.
+
+        Raises:
+            ValueError: The cursor is malformed, or older than the tombstones
+        """
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            )
+            positions = {}
+            for stream in (cls.EVENTS, cls.DELETED, cls.AVAILABILITY):
+                changed_at, pk = payload[stream]
+                if changed_at is not None:
+                    changed_at = datetime.datetime.fromisoformat(changed_at)
+                positions[stream] = (changed_at, int(pk))
+            retention = datetime.timedelta(
+                days=settings.CHANGE_FEED["TOMBSTONE_DAYS"]
+            )
+            expired = positions[cls.DELETED][0] < timezone.now() - retention
+        except Exception:
+            raise ValueError("Invalid cursor.")
+        if expired:  # the tombstones it would read on from may be pruned
+            raise ValueError("Cursor expired, resync without a cursor.")
+        return positions
+
+    # * -------------------#
+    # * FEED
+    # * -------------------#
+
+    @classmethod
+    def read(cls, cursor=None, page_size=None, events=None):
+        """Read a page of changes.
+
+        Args:
+            cursor (str): The cursor of the previous read, None to start over
+            page_size (int): Rows scanned per stream, CHANGE_FEED["PAGE_SIZE"]
+                by default
+            events (QuerySet): The events to render, e.g. planned for a
+                serializer. Defaults to every event
+        Returns:
+            ChangeSet: The changed events, the IDs of the deleted ones and the
+            availability snapshots of both changed and restocked events, with
+            the cursor to read on from and whether more changes are waiting
+        Raises:
+            ValueError: The cursor is malformed or expired
+        """
+        page_size = page_size or settings.CHANGE_FEED["PAGE_SIZE"]
+        horizon = timezone.now() - datetime.timedelta(
+            seconds=settings.CHANGE_FEED["SETTLE_SECONDS"]
+        )
+        if cursor:
+            positions = cls.decode_cursor(cursor)
+        else:
+            positions = {
+                cls.EVENTS: (None, 0),
+                cls.DELETED: (horizon, 0),
+                cls.AVAILABILITY: (horizon, 0),
+            }
+
+        changed, more_events, positions[cls.EVENTS] = cls._scan(
+            events if events is not None else Event.objects.all(),
+            "updated_at",
+            positions[cls.EVENTS],
+            horizon,
+            page_size,
+        )
+        tombstones, more_deleted, positions[cls.DELETED] = cls._scan(
+            EventTombstone.objects.all(),
+            "deleted_at",
+            positions[cls.DELETED],
+            horizon,
+            page_size,
+        )
+        restocked, more_availability, positions[cls.AVAILABILITY] = cls._scan(
+            Event.objects.only("id", "availability_changed_at"),
+            "availability_changed_at",
+            positions[cls.AVAILABILITY],
+            horizon,
+            page_size,
+        )
+
+        alive = {event.id for event in changed}  # an ID reused after a delete
+        deleted = sorted({t.event_id for t in tombstones} - alive)
+        snapshots = AvailabilityService.snapshot(
+            (alive | {event.id for event in restocked}) - set(deleted)
+        )
+        return ChangeSet(
+            events=changed,
+            deleted=deleted,
+            availability=[snapshots[event_id] for event_id in sorted(snapshots)],
+            cursor=cls.encode_cursor(positions),
+            has_more=more_events or more_deleted or more_availability,
+        )
+
+    @staticmethod
+    def _scan(queryset, field, position, horizon, page_size):
+        """Read the rows after ``position`` in ``(field, id)`` order, up to
+        ``horizon``.
+
+        Returns:
+            tuple: The rows, whether more are waiting, and the position to
+            scan on from
+        """
+        changed_at, pk = position
+        queryset = queryset.filter(**{f"{field}__lte": horizon})
+        if changed_at is not None:
+            queryset = queryset.filter(
+                Q(**{f"{field}__gt": changed_at})
+                | Q(**{field: changed_at, "id__gt": pk})
+            )
+        rows = list(queryset.order_by(field, "id")[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if rows:
+            position = (getattr(rows[-1], field), rows[-1].id)
+        if not has_more and (position[0] is None or position[0] < horizon):
+            # everything up to the horizon was read, so idle streams move on
+            # and their cursor does not expire
+            position = (horizon, 0)
+        return rows, has_more, position
+
+    # * -------------------#
+    # * RECORDING CHANGES
+    # * -------------------#
+
+    @staticmethod
+    def event_deleted(event):
+        EventTombstone.objects.create(event_id=event.id)
+
+    @staticmethod
+    def organiser_renamed(organiser):
+        """Events render their organiser's username, so renaming them
+        changes each of their events."""
+        Event.objects.filter(organiser=organiser).update(updated_at=timezone.now())
+
+    @staticmethod
+    def prune_tombstones():
+        """Delete the tombstones a day older than CHANGE_FEED["TOMBSTONE_DAYS"],
+        so no cursor still accepted can read on from them.
+
+        Returns:
+            int: The number of tombstones deleted
+        """
+        retention = datetime.timedelta(
+            days=settings.CHANGE_FEED["TOMBSTONE_DAYS"] + 1
+        )
+        deleted, _ = EventTombstone.objects.filter(
+            deleted_at__lt=timezone.now() - retention
+        ).delete()
+        return deleted
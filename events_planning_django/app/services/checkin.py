@@ -0,0 +1,180 @@
+import base64
+import datetime
+import hashlib
+import os
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from app.connections import get_redis
+from app.models import Ticket
+from app.services.codes import TicketCodeService
+from logging import getLogger
+
+logger = getLogger("app")
+
+
+class CheckInService:
+    """Admits scanned tickets at the venue gates in batches."""
+
+    ADMITTED = "admitted"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+    NOT_SOLD = "not_sold"
+    ALREADY_CHECKED_IN = "already_checked_in"
+
+    BUNDLE_ALGORITHM = "blake2b-64"
+    BUNDLE_DIGEST_SIZE = 8
+
+    # how long after an event starts its admitted codes are still remembered
+    SCANNED_MARGIN = datetime.timedelta(days=1)
+
+    @staticmethod
+    def scanned_key(event_id):
+        """The Redis set of the codes admitted for an event, so repeated
+        scans are answered without touching the database."""
+        return cache.make_key(f"checkin:scanned:{event_id}")
+
+    @classmethod
+    def forget(cls, event_id, codes=None):
+        """Drop codes from an event's scan set, e.g. when their check-in is
+        undone or they are re-issued, or the whole set.
+
+        Args:
+            event_id (int): The event
+            codes (Iterable[str]): The codes to drop. Defaults to every code
+        """
+        if codes is None:
+            get_redis().delete(cls.scanned_key(event_id))
+        elif codes := list(codes):
+            get_redis().srem(cls.scanned_key(event_id), *codes)
+
+    @classmethod
+    def check_in(cls, event, codes, scanned_at=None):
+        """Admit a batch of scanned ticket codes for an event.
+
+        Codes are verified by signature first, duplicates are caught in the
+        event's scan set, kept in Redis until a day after the event, and the
+        remaining tickets are marked as used with a single UPDATE.
+        Args:
+            event (Event): The event being checked in
+            codes (list): The scanned ticket codes, or ``(code, scanned_at)``
+                pairs of codes scanned offline
+            scanned_at (datetime): When the codes without their own time were
+                scanned. Defaults to now
+        Returns:
+            dict: The status of every distinct submitted code, keyed by code
+        """
+        results = {}
+        candidates = {}  # code -> when it was scanned
+        scanned_at = scanned_at or timezone.now()
+
+        for scan in codes:
+            code, at = (scan, scanned_at) if isinstance(scan, str) else scan
+            code = code.strip().upper()
+            if code in results or code in candidates:
+                continue  # repeated within the batch, reported once
+            if not TicketCodeService.is_valid(code, event_id=event.id):
+                results[code] = cls.INVALID
+            else:
+                candidates[code] = at
+
+        key = cls.scanned_key(event.id)
+        if candidates:
+            pending = list(candidates)
+            for code, scanned in zip(pending, get_redis().smismember(key, pending)):
+                if scanned:
+                    results[code] = cls.DUPLICATE
+                    del candidates[code]
+
+        if candidates:
+            results.update(cls._admit(event, candidates))
+
+        admitted = [
+            code
+            for code in candidates
+            if results[code] in (cls.ADMITTED, cls.ALREADY_CHECKED_IN)
+        ]
+        if admitted:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.sadd(key, *admitted)
+            pipe.expireat(key, event.date_time + cls.SCANNED_MARGIN)
+            pipe.execute()
+
+        logger.info(
+            f"Checked in {sum(r == cls.ADMITTED for r in results.values())}"
+            f"/{len(results)} tickets for event {event.id}"
+        )
+        return results
+
+    @classmethod
+    @transaction.atomic
+    def _admit(cls, event, codes):
+        """Mark the sold tickets among ``codes``, a dict of when each code was
+        scanned, as checked in at that time."""
+        results = dict.fromkeys(codes, cls.INVALID)
+        admitted = []
+
+        tickets = (
+            Ticket.objects.select_for_update()
+            .filter(event=event, ticket_code__in=codes)
+            .values_list("ticket_code", "attendee_id", "checked_in_at")
+        )
+        for code, attendee_id, checked_in_at in tickets:
+            if attendee_id is None:
+                results[code] = cls.NOT_SOLD
+            elif checked_in_at is not None:
+                results[code] = cls.ALREADY_CHECKED_IN
+            else:
+                results[code] = cls.ADMITTED
+                admitted.append(code)
+
+        if admitted:
+            times = {codes[code] for code in admitted}
+            if len(times) == 1:
+                checked_in_at = times.pop()
+            else:
+                checked_in_at = Case(
+                    *(
+                        When(ticket_code=code, then=Value(codes[code]))
+                        for code in admitted
+                    ),
+                    output_field=DateTimeField(),
+                )
+            Ticket.objects.filter(event=event, ticket_code__in=admitted).update(
+                checked_in_at=checked_in_at
+            )
+        return results
+
+    @classmethod
+    def export_bundle(cls, event):
+        """Build a compact bundle of the codes still valid for entry.
+
+        Gate devices hash scanned codes with the bundle's salt and look the
+        digest up in the sorted list, so they can validate offline without
+        holding the codes themselves.
+        Args:
+            event (Event): The event to export
+        Returns:
+            dict: The bundle
+        """
+        salt = os.urandom(16)
+        digests = sorted(
+            hashlib.blake2b(
+                code.encode("ascii"), digest_size=cls.BUNDLE_DIGEST_SIZE, salt=salt
+            ).digest()
+            for code in Ticket.objects.filter(
+                event=event, attendee__isnull=False, checked_in_at__isnull=True
+            )
+            .values_list("ticket_code", flat=True)
+            .iterator(chunk_size=5000)
+        )
+
+        return {
+            "event_id": event.id,
+            "generated_at": timezone.now(),
+            "algorithm": cls.BUNDLE_ALGORITHM,
+            "salt": salt.hex(),
+            "count": len(digests),
+            "digests": base64.b64encode(b"".join(digests)).decode("ascii"),
+        }
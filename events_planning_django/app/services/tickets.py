@@ -1,15 +1,29 @@
 from django.db import transaction
 from django.utils import timezone
-from app.models import Ticket, Order
+from app.models import Ticket, Order, Event
+from app.services.codes import TicketCodeService
+from app.services.availability import AvailabilityService
+from app.caching.invalidation import CacheInvalidation
 from logging import getLogger
-from datetime import datetime
-import uuid
 
 logger = getLogger("app")
 
 
 class TicketService:
 
+    @staticmethod
+    def inventory_changed(event_ids):
+        """Publish the availability of events whose tickets changed and
+        invalidate their cached ticket lists. Bulk updates skip the model
+        signals, so every bulk ticket write must go through here.
+
+        Args:
+            event_ids (Iterable[int]): The events whose tickets changed
+        """
+        event_ids = set(event_ids)
+        AvailabilityService.notify_changed(event_ids)
+        CacheInvalidation.tickets_changed(event_ids)
+
     @staticmethod
     @transaction.atomic
     def reserve_tickets(order: Order):
@@ -52,6 +66,7 @@ class TicketService:
         Ticket.objects.bulk_update(to_reserve_tickets, ["order_item", "reserved_until"])
         order.order_status = Order.Status.RESERVED
         order.save(update_fields=["order_status"])
+        TicketService.inventory_changed(item.event_id for item in items)
         logger.info("All tickets have been reserved successfully\n")
         logger.info(f"Attendee:{order.attendee.username}\n")
         logger.info(f"tickets amount:{estimated_tickets_count}")
@@ -78,6 +93,7 @@ class TicketService:
         Ticket.objects.bulk_update(tickets, ["attendee", "reserved_until"])
         order.order_status = Order.Status.PAID
         order.save()
+        TicketService.inventory_changed(t.event_id for t in tickets)
 
     @staticmethod
     def release_reservation(order):
@@ -94,27 +110,39 @@ class TicketService:
         Ticket.objects.bulk_update(tickets, ["order_item", "reserved_until"])
         order.order_status = Order.Status.CANCELLED
         order.save()
+        TicketService.inventory_changed(t.event_id for t in tickets)
 
     @staticmethod
+    @transaction.atomic
     def increase_tickets(event, amount):
         """Add tickets to an event when its total amount increases.
+
+        Each ticket gets a signed code built from the event ID and the next
+        serial numbers of the event, so codes never collide.
         Args:
             event (Event): The event to add tickets to
             amount (int): The number of tickets to add
         Returns:
             None
         """
-        event_date_time = event.date_time
-        timestamp = datetime.strftime(event_date_time, "%Y%m%d%H%M%S")
+        issued = (
+            Event.objects.select_for_update()
+            .values_list("tickets_issued", flat=True)
+            .get(id=event.id)
+        )
         tickets = [
             Ticket(
-                ticket_code=f"{event.id}-{event.organiser.id}-{timestamp}-{i+1}-{uuid.uuid4().hex[:6]}",
+                ticket_code=TicketCodeService.issue(event.id, serial),
                 event=event,
             )
-            for i in range(amount)
+            for serial in range(issued + 1, issued + amount + 1)
         ]
 
         Ticket.objects.bulk_create(tickets)
+        Event.objects.filter(id=event.id).update(tickets_issued=issued + amount)
+        # keep the in-memory instance in sync, it may be saved right after
+        event.tickets_issued = issued + amount
+        TicketService.inventory_changed([event.id])
         logger.info(f"Added {amount} tickets to event {event.title}")
 
     @staticmethod
@@ -126,13 +154,16 @@ class TicketService:
         Returns:
             None
         """
-        unsold_tickets = Ticket.objects.filter(event=event, attendee__isnull=True)[
-            :amount
-        ]
+        unsold_ids = list(
+            Ticket.objects.filter(event=event, attendee__isnull=True).values_list(
+                "id", flat=True
+            )[:amount]
+        )
         logger.info(
-            f"Removing {unsold_tickets.count()} unsold tickets from event {event.title}...\n"
+            f"Removing {len(unsold_ids)} unsold tickets from event {event.title}...\n"
         )
 
-        unsold_tickets.delete()
+        Ticket.objects.filter(id__in=unsold_ids).delete()
+        TicketService.inventory_changed([event.id])
 
         logger.info(f"Done!")
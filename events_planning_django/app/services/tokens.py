@@ -0,0 +1,184 @@
+import secrets
+import time
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from app.models import CustomUser
+from app.caching.tiered import tiered_cache
+
+
+class AccessTokenService:
+    """Issues short-lived signed access tokens and resolves their principal.
+
+    Tokens carry the user ID and type and are verified by signature alone.
+    Revocations and the user's principal, the few fields authorization
+    reads, live in the tiered cache, so an authenticated request costs at
+    most a single Redis round trip and no database query. Every write to
+    those keys goes through ``tiered_cache`` so other processes drop their
+    local copies.
+    """
+
+    SALT = "app.services.tokens.AccessTokenService"
+    PRINCIPAL_TIMEOUT = 60 * 5
+    # the user fields cached for authorization, never credentials
+    PRINCIPAL_FIELDS = ("id", "user_type", "is_active", "deleted_at")
+
+    @staticmethod
+    def ttl():
+        return settings.ACCESS_TOKEN_TTL
+
+    @staticmethod
+    def revoked_token_key(jti):
+        return f"auth:revoked:{jti}"
+
+    @staticmethod
+    def revoked_user_key(user_id):
+        return f"auth:revoked-user:{user_id}"
+
+    @staticmethod
+    def principal_key(user_id):
+        return f"auth:principal:{user_id}"
+
+    @classmethod
+    def issue(cls, user):
+        """Issue a signed access token for a user.
+
+        Args:
+            user (CustomUser): The user to issue the token for
+        Returns:
+            str: The signed token
+        """
+        payload = {
+            "uid": user.id,
+            "typ": user.user_type,
+            "jti": secrets.token_urlsafe(8),
+            "iat": int(time.time()),
+        }
+        return signing.dumps(payload, salt=cls.SALT, compress=True)
+
+    @classmethod
+    def verify(cls, token):
+        """Check a token's signature and age.
+
+        Raises:
+            ValueError: If the token is invalid or expired
+        Returns:
+            dict: The token payload
+        """
+        try:
+            return signing.loads(token, salt=cls.SALT, max_age=cls.ttl())
+        except signing.SignatureExpired:
+            raise ValueError("Token has expired.")
+        except signing.BadSignature:
+            raise ValueError("Invalid token.")
+
+    @classmethod
+    def lookup_keys(cls, payload):
+        return [
+            cls.revoked_token_key(payload["jti"]),
+            cls.revoked_user_key(payload["uid"]),
+            cls.principal_key(payload["uid"]),
+        ]
+
+    @classmethod
+    def resolve(cls, payload, cached):
+        """Turn a verified payload into its user.
+
+        Args:
+            payload (dict): The verified token payload
+            cached (dict): The cached values of ``lookup_keys(payload)``
+        Raises:
+            ValueError: If the token was revoked
+        Returns:
+            CustomUser | None: The user, or None if it must be loaded
+        """
+        revoked_token, revoked_user, principal = (
+            cached.get(key) for key in cls.lookup_keys(payload)
+        )
+        if revoked_token or (revoked_user and revoked_user >= payload["iat"]):
+            raise ValueError("Token has been revoked.")
+        if not isinstance(principal, dict):  # missing, or cached whole before
+            return None
+        if not principal["is_active"] or principal["deleted_at"]:
+            raise ValueError("User inactive or deleted.")
+        return cls.from_principal(principal)
+
+    @classmethod
+    def to_principal(cls, user):
+        return {name: getattr(user, name) for name in cls.PRINCIPAL_FIELDS}
+
+    @classmethod
+    def from_principal(cls, principal):
+        """Rebuild a user from its cached principal. Its other fields are
+        deferred, so they are loaded from the database if ever read."""
+        names = [  # from_db takes the values in the model's field order
+            field.attname
+            for field in CustomUser._meta.concrete_fields
+            if field.attname in principal
+        ]
+        return CustomUser.from_db(
+            CustomUser.objects.db, names, [principal[name] for name in names]
+        )
+
+    @classmethod
+    def load_principal(cls, user_id):
+        """Load a user from the database and cache it for later requests.
+
+        Raises:
+            ValueError: If the user does not exist or was soft deleted
+        """
+        try:
+            user = CustomUser.objects.get(id=user_id, is_active=True)
+        except CustomUser.DoesNotExist:
+            raise ValueError("User inactive or deleted.")
+        tiered_cache.set(
+            cls.principal_key(user_id), cls.to_principal(user), cls.PRINCIPAL_TIMEOUT
+        )
+        return user
+
+    @classmethod
+    async def aload_principal(cls, user_id):
+        """Async counterpart of ``load_principal``."""
+        try:
+            user = await CustomUser.objects.aget(id=user_id, is_active=True)
+        except CustomUser.DoesNotExist:
+            raise ValueError("User inactive or deleted.")
+        await cache.aset(
+            cls.principal_key(user_id), cls.to_principal(user), cls.PRINCIPAL_TIMEOUT
+        )
+        await tiered_cache.ainvalidate([cls.principal_key(user_id)])
+        return user
+
+    @classmethod
+    def authenticate(cls, token):
+        """Verify a token and return its user.
+
+        Raises:
+            ValueError: If the token is invalid, expired or revoked
+        Returns:
+            tuple: ``(user, payload)``
+        """
+        payload = cls.verify(token)
+        user = cls.resolve(
+            payload, tiered_cache.get_many(cls.lookup_keys(payload), negative=True)
+        )
+        if user is None:
+            user = cls.load_principal(payload["uid"])
+        return user, payload
+
+    @classmethod
+    def revoke(cls, payload):
+        """Revoke a single token until it would have expired anyway."""
+        remaining = payload["iat"] + cls.ttl() - int(time.time())
+        if remaining > 0:
+            tiered_cache.set(cls.revoked_token_key(payload["jti"]), 1, remaining)
+
+    @classmethod
+    def revoke_user(cls, user_id):
+        """Revoke every token issued to a user so far."""
+        tiered_cache.set(cls.revoked_user_key(user_id), int(time.time()), cls.ttl())
+        cls.forget_principal(user_id)
+
+    @classmethod
+    def forget_principal(cls, user_id):
+        tiered_cache.delete_many([cls.principal_key(user_id)])
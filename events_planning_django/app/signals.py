@@ -2,11 +2,14 @@ import logging
 import uuid
 import datetime
 from django.db import transaction
-from django.core.cache import cache
 from django.db.models.signals import post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import Event, Ticket, Order, OrderItem
+from .models import Event, Ticket, Order, OrderItem, CustomUser
 from app.services.tickets import TicketService
+from app.services.tokens import AccessTokenService
+from app.services.changes import ChangeFeedService
+from app.services.checkin import CheckInService
+from app.caching.invalidation import CacheInvalidation
 
 logger = logging.getLogger("app")
 
@@ -26,23 +29,21 @@ def generate_tickets(sender, instance: Event, created, **kwargs):
 
 
 @receiver(pre_save, sender=Event)
-def handle_ticket_amount_change(sender, instance: Event, **kwargs):
+def handle_ticket_amount_change(sender, instance: Event, update_fields=None, **kwargs):
     """Increase or decrease tickets when event.tickets_amount changes."""
-    if not instance.id:
+    if instance._state.adding:
         return  # new event, handled by post_save above
 
-    try:
-        old_instance = Event.objects.get(id=instance.id)
-    except Event.DoesNotExist:
+    if update_fields is not None and "tickets_amount" not in update_fields:
         return
 
-    old_amount = old_instance.tickets_amount
+    if not instance.has_changed("tickets_amount"):
+        return
+
+    old_amount = instance.get_saved_value("tickets_amount")
     new_amount = instance.tickets_amount
     diff = new_amount - old_amount
 
-    if diff == 0:
-        return
-
     logger.debug(f"Old tickets: {old_amount}, New: {new_amount}, Diff: {diff}")
 
     if diff > 0:
@@ -66,6 +67,56 @@ def delete_order_if_last_item(sender, instance, **kwargs):
         order.delete()
 
 
+# * ----------------------------------------------------------
+# * ACCESS TOKENS
+# * ----------------------------------------------------------
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_user_principal(sender, instance: CustomUser, **kwargs):
+    """Drop the cached principal of a changed user, and revoke the signed
+    tokens of users that were soft deleted or deactivated."""
+    if instance.deleted_at or not instance.is_active:
+        AccessTokenService.revoke_user(instance.id)
+    else:
+        AccessTokenService.forget_principal(instance.id)
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_deleted_user_tokens(sender, instance: CustomUser, **kwargs):
+    AccessTokenService.revoke_user(instance.id)
+
+
+# * ----------------------------------------------------------
+# * CHECK-IN
+# * ----------------------------------------------------------
+
+
+@receiver(post_save, sender=Ticket)
+def forget_undone_check_in(sender, instance: Ticket, created, **kwargs):
+    """Let a ticket be admitted again once its check-in is undone or its
+    code is re-issued."""
+    if created:
+        return
+    if instance.has_changed("ticket_code") or (
+        instance.checked_in_at is None and instance.has_changed("checked_in_at")
+    ):
+        CheckInService.forget(
+            instance.event_id, [instance.get_saved_value("ticket_code")]
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def forget_deleted_ticket_check_in(sender, instance: Ticket, **kwargs):
+    if instance.checked_in_at is not None:
+        CheckInService.forget(instance.event_id, [instance.ticket_code])
+
+
+@receiver(post_delete, sender=Event)
+def forget_deleted_event_check_ins(sender, instance, **kwargs):
+    CheckInService.forget(instance.id)
+
+
 # * -------------------
 # * Cache Invalidation
 # * -------------------
@@ -73,14 +124,49 @@ def delete_order_if_last_item(sender, instance, **kwargs):
 
 @receiver([post_delete, post_save], sender=Event)
 def invalidate_event_cache(sender, instance, **kwargs):
-    cache.delete_pattern("*list-events*")
+    CacheInvalidation.event_changed(instance)
 
 
 @receiver([post_delete, post_save], sender=Ticket)
 def invalidate_ticket_cache(sender, instance, **kwargs):
-    cache.delete_pattern("*list-tickets*")
+    CacheInvalidation.tickets_changed([instance.event_id])
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_organiser_cache(sender, instance: CustomUser, created, **kwargs):
+    if (
+        not created
+        and instance.user_type == CustomUser.UserType.ORGANISER
+        and instance.has_changed("username")
+    ):
+        CacheInvalidation.organiser_changed(instance)
 
 
 @receiver([post_delete, post_save], sender=Order)
 def invalidate_order_cache(sender, instance, **kwargs):
-    cache.delete_pattern("*list-orders*")
+    CacheInvalidation.order_changed(instance)
+
+
+@receiver(post_delete, sender=OrderItem)
+def invalidate_order_item_cache(sender, instance, **kwargs):
+    CacheInvalidation.order_items_changed([instance.event_id])
+
+
+# * -------------------
+# * Change Feed
+# * -------------------
+
+
+@receiver(post_delete, sender=Event)
+def record_event_tombstone(sender, instance, **kwargs):
+    ChangeFeedService.event_deleted(instance)
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_renamed_organiser_events(sender, instance: CustomUser, created, **kwargs):
+    if (
+        not created
+        and instance.user_type == CustomUser.UserType.ORGANISER
+        and instance.has_changed("username")
+    ):
+        ChangeFeedService.organiser_renamed(instance)
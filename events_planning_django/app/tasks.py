@@ -3,6 +3,9 @@ import datetime
 from django.db import transaction
 from django.utils import timezone
 from celery import shared_task
+from app.services.tickets import TicketService
+from app.services.changes import ChangeFeedService
+from app.caching.warming import HotPages
 import logging
 
 
@@ -29,14 +32,17 @@ def release_expired_tickets():
         return "No expired tickets."
 
     affected_orders = set()
+    affected_events = set()
     for ticket in expired_tickets:
         if ticket.order_item and ticket.order_item.order:
             affected_orders.add(ticket.order_item.order.id)
+        affected_events.add(ticket.event_id)
 
         ticket.order_item = None
         ticket.reserved_until = None
 
     Ticket.objects.bulk_update(expired_tickets, ["reserved_until", "order_item"])
+    TicketService.inventory_changed(affected_events)
     logger.info(f"[Celery] Released {expired_tickets.count()} expired tickets.")
 
     for order_id in affected_orders:
@@ -52,3 +58,19 @@ def release_expired_tickets():
             logger.info(f"[Celery] Marked Order # {order.id} as EXPIRED.")
 
     logger.info(f"{len(affected_orders)} orders.")
+
+
+@shared_task
+def warm_hot_pages(resource):
+    """Refill the response cache of the most requested pages of a resource."""
+    warmed = HotPages.warm(resource)
+    logger.info(f"[Celery] Warmed {warmed} {resource} pages.")
+    return warmed
+
+
+@shared_task
+def prune_event_tombstones():
+    """Forget deleted events no change feed cursor can still read."""
+    pruned = ChangeFeedService.prune_tombstones()
+    logger.info(f"[Celery] Pruned {pruned} event tombstones.")
+    return pruned
@@ -3,11 +3,21 @@ from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from app.models import Order, Ticket
+from rest_framework.permissions import IsAdminUser
+from app.models import Order, OrderItem, Ticket
 from app.factories import factories
 from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 from app.models import Event
+from app.apis.async_views import AsyncOrganiserDashboardView
+from app.services.codes import TicketCodeService
+from app.services.orders import OrderService
+from app.caching.metrics import CacheMetrics
 import json
+import asyncio
+import gzip
 
 pytestmark = pytest.mark.django_db(transaction=True, reset_sequences=True)
 
@@ -370,5 +380,698 @@ def test_order_list_cache_invalidated(auth_client, attendee, organiser):
     resp2 = auth_client.get(url)
     assert resp2.content != cached_content
     assert len(resp2.data) >= 1
+
+
+def test_order_list_cache_is_per_attendee(api_client, attendee, event):
+    """One attendee's cached orders are never served to another, and their
+    writes leave other attendees' entries in place."""
+    cache.clear()
+    other = factories.UserFactory(user_type="attendee").create()
+    factories.OrderFactory(attendee=attendee, order_status="pending").create()
+    tokens = {
+        user: Token.objects.create(user=user).key for user in (attendee, other)
+    }
+
+    def get_orders(user):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Token {tokens[user]}")
+        return api_client.get("/api/orders/")
+
+    own = get_orders(attendee)
+    assert "Authorization" in own["Vary"]
+    assert json.loads(get_orders(other).content)["results"] == []
+
+    factories.OrderFactory(attendee=other, order_status="pending").create()
+
+    cached = get_orders(attendee)
+    assert not hasattr(cached, "data")  # served from the cache
+    assert cached.content == own.content
+    assert len(json.loads(get_orders(other).content)["results"]) == 1
+
+
+def test_event_list_conditional_get(api_client, organiser, django_assert_num_queries):
+    """A matching If-None-Match gets a 304 without touching the database,
+    until the events change."""
+    cache.clear()
+    event = factories.EventFactory(organiser=organiser).create()
+
+    resp1 = api_client.get("/api/events/")
+    etag = resp1["ETag"]
+
+    with django_assert_num_queries(0):
+        resp2 = api_client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+    assert resp2.status_code == status.HTTP_304_NOT_MODIFIED
+    assert resp2["ETag"] == etag
+    assert resp2.content == b""
+
+    event.title = "Renamed"
+    event.save()
+
+    resp3 = api_client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+    assert resp3.status_code == status.HTTP_200_OK
+    assert resp3["ETag"] != etag
+
+
+def test_event_detail_etag_scoped_to_event(api_client, organiser):
+    """Changing one event leaves the ETag of another event's detail alone."""
+    cache.clear()
+    event = factories.EventFactory(organiser=organiser).create()
+    other = factories.EventFactory(organiser=organiser).create()
+
+    etag = api_client.get(f"/api/events/{event.id}/")["ETag"]
+    other.title = "Renamed"
+    other.save()
+
+    resp = api_client.get(f"/api/events/{event.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == status.HTTP_304_NOT_MODIFIED
     
     
+
+
+def test_equivalent_queries_share_an_entry(api_client, organiser):
+    """Parameter order, empty parameters and defaults do not split the cache."""
+    cache.clear()
+    factories.EventFactory(organiser=organiser).create()
+
+    etags = {
+        api_client.get(url)["ETag"]
+        for url in (
+            "/api/events/",
+            "/api/events/?page_size=10",
+            "/api/events/?search=&page_size=10",
+            "/api/events/?page_size=10&search=",
+        )
+    }
+    assert len(etags) == 1
+    assert api_client.get("/api/events/?page_size=5")["ETag"] not in etags
+
+
+def test_cache_metrics_per_prefix(api_client, organiser):
+    """Hits, misses and fills are counted per cached resource."""
+    cache.clear()
+    CacheMetrics.reset()
+    factories.EventFactory(organiser=organiser).create()
+    api_client.get("/api/events/")
+    api_client.get("/api/events/")
+
+    events = CacheMetrics.snapshot()["events"]
+    assert (events["hits"], events["misses"], events["fills"]) == (1, 1, 1)
+    assert events["hit_ratio"] == 0.5
+    assert events["avg_bytes"] > 0
+
+
+def test_async_cache_metrics_flush_without_blocking(monkeypatch):
+    """Async views flush their counters on the async Redis client."""
+    CacheMetrics.reset()
+    monkeypatch.setattr(CacheMetrics, "FLUSH_INTERVAL", 0)
+    flush = CacheMetrics.flush
+    monkeypatch.setattr(CacheMetrics, "flush", classmethod(lambda cls: 1 / 0))
+
+    asyncio.run(CacheMetrics.arecord("probe", hits=1, fill_ms=2.5))
+
+    assert not CacheMetrics._pending  # flushed as they were recorded
+    monkeypatch.setattr(CacheMetrics, "flush", flush)
+    probe = CacheMetrics.snapshot()["probe"]
+    assert (probe["hits"], probe["fill_ms"]) == (1, 2.5)
+
+
+def test_cache_stats_staff_only(api_client, organiser):
+    """Only staff can read the cache counters."""
+    api_client.force_authenticate(organiser)
+    assert api_client.get("/api/cache/stats/").status_code == status.HTTP_403_FORBIDDEN
+
+    organiser.is_staff = True
+    organiser.save()
+    resp = api_client.get("/api/cache/stats/")
+    assert resp.status_code == status.HTTP_200_OK
+    assert {"hits", "misses", "hit_ratio"} <= set(resp.data["local"])
+
+
+# * ---------------------------
+# * Keyset pagination
+# * ---------------------------
+
+def test_event_pages_follow_cursors(api_client, organiser):
+    """Cursors walk every event once in (date_time, id) order, ties included,
+    without counting or skipping rows."""
+    cache.clear()
+    same_time = timezone.now() + timezone.timedelta(days=3)
+    for days in (5, 0, 0, 0, 1):
+        factories.EventFactory(
+            organiser=organiser,
+            tickets_amount=1,
+            date_time=same_time + timezone.timedelta(days=days),
+        ).create()
+    expected = list(
+        Event.objects.order_by("date_time", "id").values_list("id", flat=True)
+    )
+
+    pages, url = [], "/api/events/?page_size=2"
+    with CaptureQueriesContext(connection) as queries:
+        while url:
+            body = api_client.get(url).json()
+            assert "count" not in body
+            pages.append([e["id"] for e in body["results"]])
+            url = body["next"]
+    assert [i for page in pages for i in page] == expected
+    assert pages[-1] and len(pages) == 3
+    sql = " ".join(q["sql"].upper() for q in queries.captured_queries)
+    assert "OFFSET" not in sql and "COUNT(" not in sql
+
+    second = api_client.get("/api/events/?page_size=2").json()["next"]
+    previous = api_client.get(api_client.get(second).json()["previous"]).json()
+    assert [e["id"] for e in previous["results"]] == pages[0]
+    assert previous["previous"] is None
+
+
+def test_cached_links_are_per_origin(api_client, event):
+    cache.clear()
+    factories.EventFactory(
+        organiser=event.organiser, date_time=event.date_time
+    ).create()
+
+    plain = api_client.get("/api/events/?page_size=1").json()
+    secure = api_client.get("/api/events/?page_size=1", secure=True).json()
+    assert plain["next"].startswith("http://testserver/")
+    assert secure["next"].startswith("https://testserver/")
+
+
+def test_pagination_count_and_invalid_cursor(auth_org_client, event):
+    resp = auth_org_client.get("/api/events/", {"count": "true"})
+    assert resp.data["count"] == 1
+
+    resp = auth_org_client.get("/api/tickets/", {"page_size": 4})
+    assert len(resp.data["results"]) == 4
+    assert resp.data["next"] is not None
+
+    resp = auth_org_client.get("/api/tickets/", {"cursor": "not-a-cursor"})
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_organiser_orders_are_scoped_to_their_events(auth_org_client, organiser, event):
+    other_event = factories.EventFactory(
+        organiser=factories.UserFactory(user_type="organiser").create(),
+        tickets_amount=1,
+    ).create()
+    attendee = factories.UserFactory(user_type="attendee").create()
+    mixed = factories.OrderFactory(attendee=attendee, order_status="paid").create()
+    for item_event in (event, event, other_event):
+        OrderItem.objects.create(order=mixed, event=item_event, ticket_price=1)
+    pending = factories.OrderFactory(attendee=attendee, order_status="pending").create()
+    OrderItem.objects.create(order=pending, event=event, ticket_price=1)
+    foreign = factories.OrderFactory(attendee=attendee, order_status="paid").create()
+    OrderItem.objects.create(order=foreign, event=other_event, ticket_price=1)
+
+    resp = auth_org_client.get("/api/orders/", {"expand": "items", "count": "true"})
+    assert resp.data["count"] == 2
+    assert [o["id"] for o in resp.data["results"]] == [mixed.id, pending.id]
+    assert [i["event"] for i in resp.data["results"][0]["items"]] == [event.title] * 2
+
+    resp = auth_org_client.get("/api/orders/", {"order_status": "paid"})
+    assert [o["id"] for o in resp.data["results"]] == [mixed.id]
+    resp = auth_org_client.get(f"/api/orders/{foreign.id}/")
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_organiser_order_cache_is_per_organiser(auth_org_client, organiser, event):
+    """Orders of other organisers' events leave an organiser's cached list in
+    place, orders of their own events invalidate it."""
+    cache.clear()
+    other_event = factories.EventFactory(
+        organiser=factories.UserFactory(user_type="organiser").create(),
+        event_status=Event.Status.UPCOMING,
+    ).create()
+    attendee = factories.UserFactory(user_type="attendee").create()
+
+    cached = auth_org_client.get("/api/orders/")
+    foreign = factories.OrderFactory(attendee=attendee, order_status="paid").create()
+    OrderItem.objects.create(order=foreign, event=other_event, ticket_price=1)
+
+    resp = auth_org_client.get("/api/orders/")
+    assert not hasattr(resp, "data")  # served from the cache
+    assert resp.content == cached.content
+
+    own = factories.OrderFactory(attendee=attendee, order_status="paid").create()
+    OrderItem.objects.create(order=own, event=event, ticket_price=1)
+    own.save()  # as the order service does once its items are created
+    resp = auth_org_client.get("/api/orders/")
+    assert [o["id"] for o in resp.data["results"]] == [own.id]
+
+    own.order_status = Order.Status.PENDING
+    own.save()
+    OrderService.update_order(
+        attendee,
+        own,
+        {
+            "items": [{"event_id": other_event.id, "quantity": 1}],
+            "payment_method": Order.PaymentMethod.CASH,
+        },
+    )
+    resp = auth_org_client.get("/api/orders/")
+    assert resp.data["results"] == []  # the order left their events
+
+
+# * ---------------------------
+# * Sparse fieldsets
+# * ---------------------------
+
+def test_ticket_relations_are_ids_until_expanded(
+    auth_org_client, event, django_assert_max_num_queries
+):
+    cache.clear()
+    resp = auth_org_client.get("/api/tickets/", {"page_size": 3})
+    ticket = resp.data["results"][0]
+    assert ticket["event"] == event.id and ticket["attendee"] is None
+
+    cache.clear()
+    with django_assert_max_num_queries(4):  # auth, generations, page
+        resp = auth_org_client.get(
+            "/api/tickets/",
+            {"fields": "id,event.title,event.organiser", "expand": "event"},
+        )
+    assert resp.data["results"][0] == {
+        "id": ticket["id"],
+        "event": {"title": event.title, "organiser": event.organiser.username},
+    }
+
+
+def test_event_fieldset_bypasses_fragments(api_client, event):
+    cache.clear()
+    resp = api_client.get("/api/events/", {"fields": "id,title"})
+    assert resp.data["results"] == [{"id": event.id, "title": event.title}]
+    assert api_client.get(f"/api/events/{event.id}/", {"fields": "id"}).data == {
+        "id": event.id
+    }
+    assert "description" in api_client.get("/api/events/").data["results"][0]
+
+
+def test_order_items_are_opt_in(auth_client, attendee, event):
+    order = factories.OrderFactory(attendee=attendee, order_status="pending").create()
+    OrderItem.objects.create(order=order, event=event, ticket_price=10, quantity=2)
+
+    assert "items" not in auth_client.get(f"/api/orders/{order.id}/").data
+    resp = auth_client.get(f"/api/orders/{order.id}/", {"expand": "items"})
+    assert resp.data["items"][0]["subtotal"] == event.ticket_price * 2
+
+
+def test_schema_documents_fieldsets(api_client):
+    resp = api_client.get(
+        "/api/schema/", HTTP_ACCEPT="application/vnd.oai.openapi+json"
+    )
+    paths = resp.json()["paths"]
+    params = {
+        path: {p["name"] for p in paths[path]["get"].get("parameters", [])}
+        for path in ("/api/events/", "/api/tickets/", "/api/orders/")
+    }
+    assert params["/api/events/"] >= {"fields"}
+    assert params["/api/tickets/"] >= {"fields", "expand"}
+    assert params["/api/orders/"] >= {"fields", "expand"}
+
+
+# * ---------------------------
+# * Query planning
+# * ---------------------------
+
+def count_queries(client, url, params=None):
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url, params).status_code == status.HTTP_200_OK
+    return len(queries)
+
+
+def test_list_endpoints_run_constant_queries(api_client, organiser, attendee):
+    """Adding rows to a page adds no queries, on any list endpoint."""
+    tokens = {
+        user: Token.objects.create(user=user).key for user in (organiser, attendee)
+    }
+    endpoints = [
+        (organiser, "/api/events/", None),
+        (organiser, f"/api/events/organiser/{organiser.id}/", None),
+        (organiser, "/api/tickets/", None),
+        (organiser, "/api/tickets/", {"expand": "event,attendee"}),
+        (organiser, "/api/orders/", {"expand": "items"}),
+        (attendee, "/api/orders/", {"expand": "items"}),
+        (organiser, "/api/async/events/", None),
+        (organiser, "/api/async/tickets/", {"expand": "event,attendee"}),
+    ]
+
+    def add_rows():
+        event = factories.EventFactory(organiser=organiser, tickets_amount=2).create()
+        Ticket.objects.filter(event=event).update(attendee=attendee)
+        order = factories.OrderFactory(
+            attendee=attendee, order_status="pending"
+        ).create()
+        OrderItem.objects.create(order=order, event=event, ticket_price=1)
+
+    def measure():
+        counts = []
+        for user, url, params in endpoints:
+            api_client.credentials(HTTP_AUTHORIZATION=f"Token {tokens[user]}")
+            counts.append(count_queries(api_client, url, params))
+        return counts
+
+    add_rows()
+    few = measure()
+    for _ in range(3):
+        add_rows()
+    assert measure() == few
+
+
+# * ---------------------------
+# * Gate check-in
+# * ---------------------------
+
+def test_checkin_batch(auth_org_client, event, attendee):
+    ticket = next(
+        t
+        for t in Ticket.objects.filter(event=event)
+        if TicketCodeService.is_valid(t.ticket_code, event_id=event.id)
+    )
+    ticket.attendee = attendee
+    ticket.save()
+
+    resp = auth_org_client.post(
+        f"/api/events/{event.id}/checkin/",
+        data={"codes": [ticket.ticket_code, "FORGED"]},
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["admitted"] == 1
+    assert resp.data["results"]["FORGED"] == "invalid"
+
+    resp = auth_org_client.get(f"/api/events/{event.id}/checkin-bundle/")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["count"] == 0
+
+
+def test_checkin_offline_scans_keep_their_time(auth_org_client, event, attendee):
+    cache.clear()  # codes admitted by earlier tests, events reuse their IDs
+    tickets = [
+        t
+        for t in Ticket.objects.filter(event=event).order_by("id")
+        if TicketCodeService.is_valid(t.ticket_code, event_id=event.id)
+    ][:2]
+    for ticket in tickets:
+        ticket.attendee = attendee
+        ticket.save()
+    times = [timezone.now() - timezone.timedelta(minutes=m) for m in (30, 10)]
+
+    resp = auth_org_client.post(
+        f"/api/events/{event.id}/checkin/",
+        data={
+            "scans": [
+                {"code": t.ticket_code, "scanned_at": at.isoformat()}
+                for t, at in zip(tickets, times)
+            ]
+        },
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.data["admitted"] == 2
+    for ticket, at in zip(tickets, times):
+        ticket.refresh_from_db()
+        assert ticket.checked_in_at == at
+
+    resp = auth_org_client.post(
+        f"/api/events/{event.id}/checkin/",
+        data={"codes": ["X"], "scans": [{"code": "X", "scanned_at": times[0]}]},
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_ticket_export_streams_to_the_owner(auth_org_client, event):
+    resp = auth_org_client.get(f"/api/events/{event.id}/export/")
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.streaming
+    assert resp["Content-Type"] == "text/csv"
+    lines = b"".join(resp.streaming_content).decode().splitlines()
+    assert len(lines) == 1 + Ticket.objects.filter(event=event).count()
+
+    resp = auth_org_client.get(
+        f"/api/events/{event.id}/export/", {"file_format": "ndjson"}
+    )
+    assert json.loads(next(iter(resp.streaming_content)).splitlines()[0])
+
+    resp = auth_org_client.get(f"/api/events/{event.id}/export/", {"file_format": "x"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_checkin_requires_event_owner(api_client, event):
+    other = factories.UserFactory(user_type="organiser").create()
+    token = Token.objects.create(user=other)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    resp = api_client.post(
+        f"/api/events/{event.id}/checkin/", data={"codes": ["X"]}, format="json"
+    )
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+    resp = api_client.get(f"/api/events/{event.id}/export/")
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
+# * ---------------------------
+# * Availability stream
+# * ---------------------------
+
+def test_availability_stream_sends_snapshot_then_updates(event):
+    from app.apis.streams import availability_events, broadcaster
+
+    async def read_two_frames():
+        stream = availability_events(event.id)
+        first = await stream.__anext__()
+        broadcaster.dispatch(event.id, {"event_id": event.id, "available": 0})
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(read_two_frames())
+
+    total = Ticket.objects.filter(event=event).count()
+    assert first.startswith("retry:")
+    assert f'"total": {total}' in first
+    assert '"available": 0' in second
+    assert event.id not in broadcaster.queues
+
+
+def test_availability_stream_unknown_event(api_client):
+    resp = api_client.get("/api/events/999/availability/stream/")
+    assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+
+# * ---------------------------
+# * Async read endpoints
+# * ---------------------------
+
+def test_async_event_endpoints_match_sync(api_client, event):
+    cache.clear()
+    params = {"page_size": 5, "count": "true"}
+    sync = api_client.get("/api/events/", params)
+    async_ = api_client.get("/api/async/events/", params)
+    assert async_.status_code == status.HTTP_200_OK
+    assert async_.json()["count"] == sync.json()["count"]
+    assert async_.json()["results"] == sync.json()["results"]
+
+    detail = api_client.get(f"/api/async/events/{event.id}/")
+    assert detail.json() == api_client.get(f"/api/events/{event.id}/").json()
+
+    assert api_client.get("/api/async/events/999/").status_code == 404
+
+
+def test_async_ticket_list_and_stats_match_sync(auth_org_client, event):
+    cache.clear()
+    params = {"event_id": event.id, "available_only": "true"}
+    sync = auth_org_client.get("/api/tickets/", params).json()
+    async_ = auth_org_client.get("/api/async/tickets/", params).json()
+    assert async_["results"] == sync["results"]
+    assert async_["next"].split("?")[1] == sync["next"].split("?")[1]
+
+    sync = auth_org_client.get("/api/stats/").json()
+    async_ = auth_org_client.get("/api/async/stats/").json()
+    assert async_ == sync
+
+
+def test_async_views_deny_refused_permissions(api_client, attendee, monkeypatch):
+    """Permissions returning False deny the request, not only those raising."""
+    monkeypatch.setattr(
+        AsyncOrganiserDashboardView, "permission_classes", [IsAdminUser]
+    )
+
+    resp = api_client.get("/api/async/stats/")
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    assert resp["WWW-Authenticate"] == "Bearer"
+
+    token = Token.objects.create(user=attendee)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    resp = api_client.get("/api/async/stats/")
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_async_event_list_served_compressed(api_client, event, settings):
+    cache.clear()
+    settings.RESPONSE_COMPRESSION = {"MIN_LENGTH": 1}
+    plain = api_client.get("/api/async/events/")
+    for _ in range(2):  # compressed on the first hit, then read back
+        resp = api_client.get("/api/async/events/", HTTP_ACCEPT_ENCODING="gzip")
+        assert resp["Content-Encoding"] == "gzip"
+        assert gzip.decompress(resp.content) == plain.content
+
+
+def test_async_ticket_list_requires_organiser(auth_client):
+    resp = auth_client.get("/api/async/tickets/")
+    assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    auth_client.credentials(HTTP_AUTHORIZATION="Token invalid")
+    resp = auth_client.get("/api/async/tickets/")
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+# * ---------------------------
+# * Change feed
+# * ---------------------------
+
+def test_event_change_feed(api_client, auth_client, event, settings):
+    settings.CHANGE_FEED = {
+        **settings.CHANGE_FEED,
+        "SETTLE_SECONDS": 0,
+        "AVAILABILITY_COALESCE_SECONDS": 0,
+    }
+    first = api_client.get("/api/events/changes/").json()
+    assert [e["id"] for e in first["events"]] == [event.id]
+    assert first["events"][0] == api_client.get(f"/api/events/{event.id}/").json()
+    assert first["availability"][0]["reserved"] == 0
+    assert not first["has_more"]
+
+    order = auth_client.post(
+        "/api/orders/",
+        {
+            "items": [{"event_id": event.id, "quantity": 2}],
+            "payment_method": Order.PaymentMethod.CASH,
+        },
+        format="json",
+    ).json()
+    auth_client.post(f"/api/orders/{order['id']}/checkout/")
+    changes = api_client.get("/api/events/changes/", {"cursor": first["cursor"]})
+    assert changes.json()["events"] == []
+    assert changes.json()["availability"][0]["reserved"] == 2
+
+    resp = api_client.get("/api/events/changes/", {"cursor": "nonsense"})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# * ---------------------------
+# * Batch requests
+# * ---------------------------
+
+def test_batch_matches_separate_calls(auth_org_client, event):
+    cache.clear()
+    paths = [
+        "/api/events/?page_size=5",
+        "/api/tickets/",
+        "/api/orders/",
+        "/api/stats/",
+        "/api/async/tickets/",
+    ]
+    resp = auth_org_client.post(
+        "/api/batch/",
+        {"requests": [{"id": str(i), "path": path} for i, path in enumerate(paths)]},
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_200_OK
+
+    responses = resp.json()["responses"]
+    assert [r["id"] for r in responses] == ["0", "1", "2", "3", "4"]
+    for path, result in zip(paths, responses):
+        separate = auth_org_client.get(path)
+        assert result["status"] == separate.status_code == status.HTTP_200_OK
+        assert result["body"] == separate.json()
+
+
+def test_batch_links_keep_the_scheme_under_asgi(event):
+    cache.clear()
+    factories.EventFactory(
+        organiser=event.organiser, date_time=event.date_time
+    ).create()
+
+    async def post_batch():
+        return await AsyncClient().post(
+            "/api/batch/",
+            {"requests": [{"path": "/api/events/?page_size=1"}]},
+            content_type="application/json",
+        )
+
+    batched = asyncio.run(post_batch()).json()["responses"][0]["body"]
+    assert batched["next"].startswith("http://testserver/api/events/?")
+    direct = APIClient().get("/api/events/?page_size=1").json()
+    assert direct["next"] == batched["next"]
+
+
+def test_batch_runs_writes_in_order(auth_client, attendee, event):
+    payload = {
+        "items": [{"event_id": event.id, "quantity": 1}],
+        "payment_method": Order.PaymentMethod.CASH,
+    }
+    resp = auth_client.post(
+        "/api/batch/",
+        {
+            "requests": [
+                {"method": "POST", "path": "/api/orders/", "body": payload},
+                {"path": "/api/orders/"},
+            ]
+        },
+        format="json",
+    )
+    created, listed = resp.json()["responses"]
+    assert created["status"] == status.HTTP_201_CREATED
+    assert [o["id"] for o in listed["body"]["results"]] == [created["body"]["id"]]
+
+
+def test_batch_results_are_per_request(api_client, event):
+    resp = api_client.post(
+        "/api/batch/",
+        {
+            "requests": [
+                {"path": f"/api/events/{event.id}/"},
+                {"path": "/api/stats/"},
+                {"path": "/api/nowhere/"},
+                {"path": "/api/batch/", "method": "POST"},
+                {"path": f"/api/events/{event.id}/availability/stream/"},
+            ]
+        },
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    statuses = [r["status"] for r in resp.json()["responses"]]
+    assert statuses == [200, 401, 404, 400, 400]
+
+
+def test_batch_size_is_limited(api_client, settings):
+    settings.BATCH_REQUESTS = {"MAX_REQUESTS": 2, "MAX_WORKERS": 2}
+    resp = api_client.post(
+        "/api/batch/",
+        {"requests": [{"path": "/api/events/"}] * 3},
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+# * ---------------------------
+# * Signed access tokens
+# * ---------------------------
+
+def test_signed_token_login_and_logout(api_client, organiser):
+    resp = api_client.post(
+        "/api/login/",
+        data={"username": organiser.username, "password": "password@123"},
+        format="json",
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert "sessionid" not in resp.cookies
+    token = resp.data["signed_token"]
+
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert api_client.get("/api/stats/").status_code == status.HTTP_200_OK
+    assert api_client.get("/api/async/stats/").status_code == status.HTTP_200_OK
+
+    assert api_client.post("/api/logout/").status_code == status.HTTP_200_OK
+    assert api_client.get("/api/stats/").status_code == status.HTTP_401_UNAUTHORIZED
+    assert api_client.get("/api/async/stats/").status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,101 @@
+import time
+import pytest
+from django.core import signing
+from django.core.cache import cache
+from app.models import CustomUser
+from app.services.tokens import AccessTokenService
+from app.factories import factories
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAccessTokenService:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def user(self):
+        return factories.UserFactory(user_type=CustomUser.UserType.ORGANISER).create()
+
+    def test_token_carries_user_id_and_type(self, user):
+        payload = AccessTokenService.verify(AccessTokenService.issue(user))
+
+        assert payload["uid"] == user.id
+        assert payload["typ"] == CustomUser.UserType.ORGANISER
+
+    def test_authenticate_uses_cached_principal(self, user, django_assert_num_queries):
+        token = AccessTokenService.issue(user)
+        AccessTokenService.authenticate(token)  # warms the principal cache
+
+        with django_assert_num_queries(0):
+            principal, _ = AccessTokenService.authenticate(token)
+
+        assert principal == user
+        assert principal.user_type == user.user_type
+
+    def test_principal_caches_no_credentials(self, user):
+        AccessTokenService.authenticate(AccessTokenService.issue(user))
+
+        cached = cache.get(AccessTokenService.principal_key(user.id))
+        assert cached == {
+            "id": user.id,
+            "user_type": user.user_type,
+            "is_active": True,
+            "deleted_at": None,
+        }
+
+    def test_saving_a_user_drops_their_principal(self, user):
+        token = AccessTokenService.issue(user)
+        AccessTokenService.authenticate(token)
+
+        user.first_name = "Changed"
+        user.save()
+
+        assert cache.get(AccessTokenService.principal_key(user.id)) is None
+        principal, _ = AccessTokenService.authenticate(token)
+        assert principal.first_name == "Changed"
+
+    def test_tampered_token_is_rejected(self, user):
+        token = AccessTokenService.issue(user)
+
+        with pytest.raises(ValueError, match="Invalid"):
+            AccessTokenService.verify(token[:-2] + "xx")
+
+    def test_expired_token_is_rejected(self, user, settings):
+        token = AccessTokenService.issue(user)
+        settings.ACCESS_TOKEN_TTL = -1
+
+        with pytest.raises(ValueError, match="expired"):
+            AccessTokenService.verify(token)
+
+    def test_revoked_token_is_rejected(self, user):
+        token = AccessTokenService.issue(user)
+        _, payload = AccessTokenService.authenticate(token)
+
+        AccessTokenService.revoke(payload)
+
+        with pytest.raises(ValueError, match="revoked"):
+            AccessTokenService.authenticate(token)
+        assert AccessTokenService.authenticate(AccessTokenService.issue(user))
+
+    def test_soft_delete_revokes_existing_tokens(self, user):
+        token = AccessTokenService.issue(user)
+        AccessTokenService.authenticate(token)
+
+        user.soft_delete()
+
+        with pytest.raises(ValueError, match="revoked"):
+            AccessTokenService.authenticate(token)
+
+    def test_deleted_user_cannot_authenticate_fresh_token(self, user):
+        payload = {"uid": user.id, "typ": user.user_type, "jti": "x"}
+        payload["iat"] = int(time.time()) + 1  # issued after the revocation
+        token = signing.dumps(payload, salt=AccessTokenService.SALT, compress=True)
+
+        user.soft_delete()
+
+        with pytest.raises(ValueError, match="deleted"):
+            AccessTokenService.authenticate(token)
@@ -0,0 +1,70 @@
+import json
+import pytest
+from django.db.models.signals import post_save
+from app.connections import get_redis
+from app.models import Ticket, Event, Order, CustomUser
+from app.services.availability import AvailabilityService
+from app.services.tickets import TicketService
+from app.signals import generate_tickets
+from app.factories import factories
+
+
+@pytest.fixture(autouse=True)
+def disconnect_ticket_generation():
+    post_save.disconnect(generate_tickets, sender=Event)
+    yield
+    post_save.connect(generate_tickets, sender=Event)
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+class TestAvailabilityService:
+
+    @pytest.fixture
+    def attendee(self):
+        return factories.UserFactory(user_type=CustomUser.UserType.ATTENDEE).create()
+
+    @pytest.fixture
+    def event(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        event = factories.EventFactory(organiser=organiser).create()
+        TicketService.increase_tickets(event, 10)
+        return event
+
+    @pytest.fixture
+    def order(self, attendee, event):
+        order = factories.OrderFactory(
+            attendee=attendee, order_status=Order.Status.PENDING
+        ).create()
+        factories.OrderItemFactory(order=order, event=event, quantity=3).create()
+        return order
+
+    def test_snapshot_counts_tickets(self, event, attendee):
+        ticket = Ticket.objects.filter(event=event).first()
+        ticket.attendee = attendee
+        ticket.save()
+
+        snapshot = AvailabilityService.snapshot([event.id, 999])
+
+        assert snapshot[event.id] == {
+            "event_id": event.id,
+            "total": 10,
+            "sold": 1,
+            "reserved": 0,
+            "available": 9,
+        }
+        assert snapshot[999]["total"] == 0
+
+    def test_reservation_publishes_availability(self, event, order):
+        pubsub = get_redis().pubsub()
+        pubsub.subscribe(AvailabilityService.channel(event.id))
+        pubsub.get_message(timeout=2)  # subscription confirmation
+        try:
+            TicketService.reserve_tickets(order)
+            message = pubsub.get_message(timeout=2)
+        finally:
+            pubsub.close()
+
+        assert json.loads(message["data"])["reserved"] == 3
+        assert json.loads(message["data"])["available"] == 7
@@ -0,0 +1,58 @@
+import pickle
+import pytest
+from django.core.cache import cache
+from django_redis.exceptions import CompressorError
+from app.caching.compressors import ThresholdCompressor, available_codecs
+from app.connections import get_redis
+
+
+class TestThresholdCompressor:
+
+    @pytest.fixture
+    def payload(self):
+        return pickle.dumps([{"title": f"Event {i}", "price": 10.5} for i in range(200)])
+
+    @pytest.mark.parametrize("codec", list(available_codecs()))
+    def test_round_trip(self, codec, payload):
+        compressor = ThresholdCompressor({"COMPRESS_CODEC": codec})
+        compressed = compressor.compress(payload)
+
+        assert len(compressed) < len(payload)
+        assert compressor.decompress(compressed) == payload
+
+    def test_small_values_are_left_alone(self):
+        compressor = ThresholdCompressor({"COMPRESS_MIN_LENGTH": 1024})
+        value = pickle.dumps({"small": True})
+
+        assert compressor.compress(value) == value
+        with pytest.raises(CompressorError):
+            compressor.decompress(value)  # read as stored by the cache client
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCompressedCache:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_large_values_are_stored_compressed(self):
+        value = {"results": ["x" * 50] * 200}
+        cache.set("big", value)
+
+        assert len(get_redis().get(cache.make_key("big"))) < 1024
+        assert cache.get("big") == value
+
+    def test_uncompressed_values_stay_readable(self):
+        value = {"legacy": "y" * 2000}
+        get_redis().set(cache.make_key("legacy"), pickle.dumps(value))
+
+        assert cache.get("legacy") == value
+
+    def test_counters_stay_raw(self):
+        cache.set("counter", 41)
+        get_redis().incr(cache.make_key("counter"))
+
+        assert cache.get("counter") == 42
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from django.core.cache import cache
+from app.caching.generations import CacheGenerations
+from app.caching.responses import build_response_key
+from app.factories import factories
+from app.models import CustomUser
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCacheGenerations:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_missing_counter_is_seeded_once(self):
+        key = CacheGenerations.key("events")
+
+        first = CacheGenerations.get_many([key])
+        assert CacheGenerations.get_many([key]) == first
+
+    def test_bump_changes_only_its_counters(self):
+        scoped = CacheGenerations.key("events", "organiser:1")
+        other = CacheGenerations.key("events", "organiser:2")
+        before = CacheGenerations.get_many([scoped, other])
+
+        CacheGenerations.bump(scoped)
+
+        after = CacheGenerations.get_many([scoped, other])
+        assert after[0] == before[0] + 1
+        assert after[1] == before[1]
+
+    def test_async_read_matches_sync_read(self):
+        keys = [CacheGenerations.key("tickets"), CacheGenerations.key("orders")]
+        CacheGenerations.bump(keys[0])
+
+        assert asyncio.run(CacheGenerations.aget_many(keys)) == (
+            CacheGenerations.get_many(keys)
+        )
+
+    def test_event_save_orphans_cached_responses(self):
+        organiser = factories.UserFactory(user_type=CustomUser.UserType.ORGANISER).create()
+        event = factories.EventFactory(organiser=organiser).create()
+        keys = [
+            CacheGenerations.key("events"),
+            CacheGenerations.key("events", f"organiser:{event.organiser_id}"),
+        ]
+        before = build_response_key("events", CacheGenerations.get_many(keys), "/x")
+
+        event.title = "Renamed"
+        event.save()
+
+        assert build_response_key(
+            "events", CacheGenerations.get_many(keys), "/x"
+        ) != before
@@ -0,0 +1,141 @@
+import datetime
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.db.models.signals import post_save
+from django.utils import timezone
+from app.models import Event, EventTombstone, CustomUser
+from app.services.availability import AvailabilityService
+from app.services.changes import ChangeFeedService
+from app.services.tickets import TicketService
+from app.signals import generate_tickets
+from app.factories import factories
+
+
+@pytest.fixture(autouse=True)
+def no_ticket_generation():
+    post_save.disconnect(generate_tickets, sender=Event)
+    yield
+    post_save.connect(generate_tickets, sender=Event)
+
+
+@pytest.fixture(autouse=True)
+def settled(settings):
+    settings.CHANGE_FEED = {
+        **settings.CHANGE_FEED,
+        "SETTLE_SECONDS": 0,
+        "AVAILABILITY_COALESCE_SECONDS": 0,
+    }
+
+
+def sync(cursor=None, page_size=None):
+    """Read the feed until it is drained, as a client would."""
+    events, deleted, availability = [], [], []
+    while True:
+        changes = ChangeFeedService.read(cursor, page_size)
+        events += [event.id for event in changes.events]
+        deleted += changes.deleted
+        availability += [s["event_id"] for s in changes.availability]
+        cursor = changes.cursor
+        if not changes.has_more:
+            return events, deleted, availability, cursor
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+class TestChangeFeedService:
+
+    @pytest.fixture
+    def organiser(self):
+        return factories.UserFactory(user_type=CustomUser.UserType.ORGANISER).create()
+
+    @pytest.fixture
+    def events(self, organiser):
+        return [factories.EventFactory(organiser=organiser).create() for _ in range(5)]
+
+    def test_first_sync_walks_every_event(self, events):
+        synced, deleted, availability, _ = sync(page_size=2)
+
+        assert synced == [event.id for event in events]
+        assert deleted == []
+        assert availability == synced  # each event comes with its availability
+
+    def test_later_syncs_only_return_changes(self, events):
+        *_, cursor = sync()
+        assert sync(cursor)[:3] == ([], [], [])
+
+        deleted_id = events[1].id
+        events[3].title = "Renamed"
+        events[3].save()
+        events[1].delete()
+        TicketService.increase_tickets(events[4], 3)
+
+        synced, deleted, availability, _ = sync(cursor)
+        assert synced == [events[3].id]
+        assert deleted == [deleted_id]
+        assert availability == [events[3].id, events[4].id]
+
+    def test_renamed_organiser_changes_their_events(self, organiser, events):
+        *_, cursor = sync()
+        organiser.username = "renamed"
+        organiser.save()
+
+        assert sync(cursor)[0] == [event.id for event in events]
+
+    def test_unsettled_rows_wait(self, events, settings):
+        *_, cursor = sync()
+        settings.CHANGE_FEED = {**settings.CHANGE_FEED, "SETTLE_SECONDS": 60}
+        events[0].save()
+
+        assert sync(cursor)[0] == []
+
+    def test_availability_stamps_are_coalesced(self, events, settings):
+        cache.clear()
+        settings.CHANGE_FEED = {
+            **settings.CHANGE_FEED,
+            "AVAILABILITY_COALESCE_SECONDS": 60,
+        }
+        changed_at = timezone.now()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                AvailabilityService.stamp([events[0].id])
+        events[0].refresh_from_db()
+
+        stamps = [q for q in queries if "availability_changed_at" in q["sql"]]
+        assert len(stamps) == 1
+        # covers the later changes of the window
+        assert events[0].availability_changed_at >= changed_at + datetime.timedelta(
+            seconds=60
+        )
+
+    def test_idle_cursor_moves_on(self, events):
+        *_, cursor = sync()
+        read_at = timezone.now()
+        positions = ChangeFeedService.decode_cursor(sync(cursor)[3])
+
+        # so it does not expire while nothing is deleted
+        assert all(changed_at >= read_at for changed_at, _ in positions.values())
+
+    def test_invalid_and_expired_cursors(self):
+        with pytest.raises(ValueError, match="Invalid"):
+            ChangeFeedService.read("not-a-cursor")
+
+        old = timezone.now() - datetime.timedelta(days=365)
+        cursor = ChangeFeedService.encode_cursor(
+            {stream: (old, 0) for stream in ("e", "d", "a")}
+        )
+        with pytest.raises(ValueError, match="expired"):
+            ChangeFeedService.read(cursor)
+
+    def test_prune_tombstones(self, events):
+        old, recent = events[0].id, events[1].id
+        events[0].delete()
+        events[1].delete()
+        EventTombstone.objects.filter(event_id=old).update(
+            deleted_at=timezone.now() - datetime.timedelta(days=365)
+        )
+
+        assert ChangeFeedService.prune_tombstones() == 1
+        assert list(EventTombstone.objects.values_list("event_id", flat=True)) == [
+            recent
+        ]
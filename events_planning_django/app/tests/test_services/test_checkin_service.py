@@ -0,0 +1,151 @@
+import base64
+import datetime
+import hashlib
+import pytest
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.utils import timezone
+from app.connections import get_redis
+from app.models import Ticket, Event, CustomUser
+from app.services.checkin import CheckInService
+from app.services.codes import TicketCodeService
+from app.services.tickets import TicketService
+from app.signals import generate_tickets
+from app.factories import factories
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    cache.clear()
+    post_save.disconnect(generate_tickets, sender=Event)
+    yield
+    cache.clear()
+    post_save.connect(generate_tickets, sender=Event)
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+class TestCheckInService:
+
+    @pytest.fixture
+    def attendee(self):
+        return factories.UserFactory(user_type=CustomUser.UserType.ATTENDEE).create()
+
+    @pytest.fixture
+    def event(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        event = factories.EventFactory(organiser=organiser).create()
+        TicketService.increase_tickets(event, 5)
+        return event
+
+    @pytest.fixture
+    def sold_codes(self, event, attendee):
+        tickets = list(Ticket.objects.filter(event=event).order_by("id")[:3])
+        for ticket in tickets:
+            ticket.attendee = attendee
+        Ticket.objects.bulk_update(tickets, ["attendee"])
+        return [t.ticket_code for t in tickets]
+
+    def test_check_in_admits_sold_tickets(self, event, sold_codes):
+        results = CheckInService.check_in(event, sold_codes)
+
+        assert set(results.values()) == {CheckInService.ADMITTED}
+        assert (
+            Ticket.objects.filter(event=event, checked_in_at__isnull=False).count()
+            == 3
+        )
+
+    def test_check_in_reports_every_rejection(self, event, sold_codes):
+        unsold = Ticket.objects.get(event=event, attendee__isnull=True, id=4)
+        forged = TicketCodeService.issue(event.id, 999)[:-1] + "A"
+        other_event = TicketCodeService.issue(event.id + 1, 1)
+
+        CheckInService.check_in(event, sold_codes[:1])
+        results = CheckInService.check_in(
+            event,
+            [
+                sold_codes[0],
+                sold_codes[1],
+                sold_codes[1],
+                unsold.ticket_code,
+                forged,
+                other_event,
+            ],
+        )
+
+        assert results == {
+            sold_codes[0]: CheckInService.DUPLICATE,
+            sold_codes[1]: CheckInService.ADMITTED,
+            unsold.ticket_code: CheckInService.NOT_SOLD,
+            forged: CheckInService.INVALID,
+            other_event: CheckInService.INVALID,
+        }
+
+    def test_second_scan_is_duplicate_without_query(
+        self, event, sold_codes, django_assert_num_queries
+    ):
+        CheckInService.check_in(event, sold_codes[:1])
+
+        with django_assert_num_queries(0):
+            results = CheckInService.check_in(event, sold_codes[:1])
+
+        assert results == {sold_codes[0]: CheckInService.DUPLICATE}
+
+    def test_already_checked_in_elsewhere(self, event, sold_codes):
+        CheckInService.check_in(event, sold_codes[:1])
+        CheckInService.forget(event.id)  # e.g. scanned through another process
+
+        results = CheckInService.check_in(event, sold_codes[:1])
+
+        assert results == {sold_codes[0]: CheckInService.ALREADY_CHECKED_IN}
+
+    def test_offline_scans_keep_their_own_time(self, event, sold_codes):
+        now = timezone.now()
+        scans = [
+            (code, now - datetime.timedelta(minutes=i))
+            for i, code in enumerate(sold_codes)
+        ]
+
+        results = CheckInService.check_in(event, scans)
+
+        assert set(results.values()) == {CheckInService.ADMITTED}
+        assert dict(
+            Ticket.objects.filter(event=event, checked_in_at__isnull=False)
+            .values_list("ticket_code", "checked_in_at")
+        ) == dict(scans)
+
+    def test_scan_set_expires_after_the_event(self, event, sold_codes):
+        CheckInService.check_in(event, sold_codes[:1])
+
+        expires_at = get_redis().expiretime(CheckInService.scanned_key(event.id))
+        assert expires_at == int(
+            (event.date_time + CheckInService.SCANNED_MARGIN).timestamp()
+        )
+
+    def test_undone_check_in_admits_again(self, event, sold_codes):
+        CheckInService.check_in(event, sold_codes[:1])
+        ticket = Ticket.objects.get(ticket_code=sold_codes[0])
+        ticket.checked_in_at = None
+        ticket.save()
+
+        results = CheckInService.check_in(event, sold_codes[:1])
+
+        assert results == {sold_codes[0]: CheckInService.ADMITTED}
+
+    def test_export_bundle_contains_hashes_of_valid_codes(self, event, sold_codes):
+        CheckInService.check_in(event, sold_codes[:1])
+
+        bundle = CheckInService.export_bundle(event)
+        raw = base64.b64decode(bundle["digests"])
+        size = CheckInService.BUNDLE_DIGEST_SIZE
+        digests = {raw[i : i + size] for i in range(0, len(raw), size)}
+        salt = bytes.fromhex(bundle["salt"])
+
+        def digest(code):
+            return hashlib.blake2b(
+                code.encode("ascii"), digest_size=size, salt=salt
+            ).digest()
+
+        assert bundle["count"] == 2
+        assert digests == {digest(code) for code in sold_codes[1:]}
@@ -0,0 +1,92 @@
+import json
+import pytest
+from django.db.models.signals import post_save
+from app.apis.compiled import CompiledSerializerMixin
+from app.apis.serializers import (
+    EventSerializer,
+    OrderSerializer,
+    TicketSerializer,
+    UserSerializer,
+)
+from app.models import CustomUser, Event, Order, OrderItem, Ticket
+from app.services.tickets import TicketService
+from app.signals import generate_tickets
+from app.factories import factories
+
+
+@pytest.fixture(autouse=True)
+def no_ticket_generation():
+    post_save.disconnect(generate_tickets, sender=Event)
+    yield
+    post_save.connect(generate_tickets, sender=Event)
+
+
+def render(serializer_class, instances, **kwargs):
+    serializer = serializer_class(**kwargs)
+    if isinstance(serializer, EventSerializer):  # leave the fragment cache out
+        return [serializer.serialize_fragment(instance) for instance in instances]
+    return [serializer.to_representation(instance) for instance in instances]
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+class TestCompiledSerializers:
+    """The compiled output is byte for byte DRF's."""
+
+    @pytest.fixture
+    def data(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        attendee = factories.UserFactory(
+            user_type=CustomUser.UserType.ATTENDEE
+        ).create()
+        event = factories.EventFactory(organiser=organiser).create()
+        TicketService.increase_tickets(event, 3)
+        Ticket.objects.filter(id=1).update(attendee=attendee)
+        order = factories.OrderFactory(attendee=attendee, order_status="paid").create()
+        OrderItem.objects.create(order=order, event=event, ticket_price=12.5, quantity=2)
+        return {
+            "events": list(Event.objects.all()),
+            "tickets": list(Ticket.objects.order_by("id")),
+            "orders": list(Order.objects.all()),
+            "users": list(CustomUser.objects.all()),
+        }
+
+    @pytest.mark.parametrize(
+        "serializer_class, rows, kwargs",
+        [
+            (EventSerializer, "events", {}),
+            (EventSerializer, "events", {"fields": ["id", "organiser"]}),
+            (UserSerializer, "users", {}),
+            (TicketSerializer, "tickets", {}),
+            (TicketSerializer, "tickets", {"expand": ["event", "attendee"]}),
+            (
+                TicketSerializer,
+                "tickets",
+                {"fields": ["id", "attendee.username"], "expand": ["attendee"]},
+            ),
+            (OrderSerializer, "orders", {}),
+            (OrderSerializer, "orders", {"expand": ["items"]}),
+        ],
+    )
+    def test_output_matches_drf(self, data, monkeypatch, serializer_class, rows, kwargs):
+        compiled = render(serializer_class, data[rows], **kwargs)
+
+        monkeypatch.setattr(CompiledSerializerMixin, "use_compiled", False)
+        reference = render(serializer_class, data[rows], **kwargs)
+
+        assert json.dumps(compiled, default=str) == json.dumps(reference, default=str)
+        assert [list(row) for row in compiled] == [list(row) for row in reference]
+
+    def test_fields_are_compiled_once_per_serializer(self, data, monkeypatch):
+        serializer = TicketSerializer(data["tickets"], many=True)
+        calls = []
+        compile_fields = CompiledSerializerMixin.compile_fields
+        monkeypatch.setattr(
+            CompiledSerializerMixin,
+            "compile_fields",
+            lambda self: calls.append(self) or compile_fields(self),
+        )
+
+        assert len(serializer.data) == 3
+        assert len(calls) == 1
@@ -0,0 +1,67 @@
+import pytest
+from django.core.cache import cache
+from app.apis.serializers import EventSerializer
+from app.caching.fragments import FragmentCache
+from app.factories import factories
+from app.models import CustomUser, Event
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFragmentCache:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def organiser(self):
+        return factories.UserFactory(user_type=CustomUser.UserType.ORGANISER).create()
+
+    @pytest.fixture
+    def events(self, organiser):
+        for _ in range(3):
+            factories.EventFactory(organiser=organiser).create()
+        return Event.objects.select_related("organiser").order_by("id")
+
+    def test_list_matches_uncached_output(self, events):
+        expected = [EventSerializer().serialize_fragment(e) for e in events]
+
+        assert EventSerializer(events, many=True).data == expected
+        assert EventSerializer(events, many=True).data == expected  # from cache
+
+    def test_only_misses_are_serialized(self, events, monkeypatch):
+        EventSerializer(events, many=True).data
+        edited = events[0]
+        edited.title = "Renamed"
+        edited.save()
+
+        serialized = []
+        original = EventSerializer.serialize_fragment
+        monkeypatch.setattr(
+            EventSerializer,
+            "serialize_fragment",
+            lambda self, e: serialized.append(e.id) or original(self, e),
+        )
+        data = EventSerializer(events.all(), many=True).data
+
+        assert serialized == [edited.id]
+        assert data[0]["title"] == "Renamed"
+
+    def test_organiser_rename_drops_fragments(self, organiser, events):
+        EventSerializer(events, many=True).data
+
+        organiser.username = "renamed-organiser"
+        organiser.save()
+
+        data = EventSerializer(events.all(), many=True).data
+        assert {e["organiser"] for e in data} == {"renamed-organiser"}
+
+    def test_detail_uses_the_same_fragment(self, events):
+        event = events[0]
+        EventSerializer(events, many=True).data
+
+        assert cache.get(FragmentCache.keys(EventSerializer(), [event])[0]) == (
+            EventSerializer(event).data
+        )
@@ -0,0 +1,46 @@
+import pytest
+from django.db.models import Prefetch
+from app.apis.planner import QueryPlanner
+from app.apis.serializers import EventSerializer, OrderSerializer, TicketSerializer
+from app.models import Event, Order, Ticket
+
+
+class TestQueryPlanner:
+
+    def test_event_joins_the_organiser_for_its_username(self):
+        plan = QueryPlanner.plan(EventSerializer(), Event)
+
+        assert plan.select_related == {"organiser"}
+        assert {"organiser", "organiser__username", "updated_at"} <= plan.only
+        assert "tickets_issued" not in plan.only
+
+    def test_unexpanded_relations_are_read_from_foreign_keys(self):
+        plan = QueryPlanner.plan(TicketSerializer(), Ticket)
+
+        assert plan.select_related == set()
+        assert plan.only == {"id", "event", "attendee", "created_at", "updated_at"}
+
+    def test_expanded_relations_are_joined_with_their_fields_only(self):
+        serializer = TicketSerializer(
+            fields=["id", "event.title", "event.organiser"], expand=["event"]
+        )
+        plan = QueryPlanner.plan(serializer, Ticket)
+
+        assert plan.select_related == {"event", "event__organiser"}
+        assert "event__organiser__username" in plan.only
+        assert "event__description" not in plan.only
+
+    def test_to_many_relations_get_a_planned_prefetch(self):
+        plan = QueryPlanner.plan(OrderSerializer(expand=["items"]), Order)
+        (prefetch,) = plan.prefetch_related
+
+        assert isinstance(prefetch, Prefetch)
+        assert prefetch.prefetch_through == "items"
+        # OrderItemSerializer renders the event with str(), loaded in full
+        assert prefetch.queryset.query.select_related == {"event": {}}
+
+    def test_unexpanded_to_many_relations_are_not_prefetched(self):
+        plan = QueryPlanner.plan(OrderSerializer(), Order)
+
+        assert plan.prefetch_related == []
+        assert plan.select_related == {"attendee"}
@@ -0,0 +1,63 @@
+import datetime
+import decimal
+import io
+import json
+import uuid
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from app.apis.renderers import ORJSONParser, ORJSONRenderer
+
+
+class TestORJSONRenderer:
+
+    @pytest.fixture
+    def payload(self):
+        return {
+            "results": [
+                {
+                    "id": 1,
+                    "title": "Café concert",
+                    "date_time": datetime.datetime(
+                        2026, 5, 1, 20, 30, 15, 123456, tzinfo=datetime.timezone.utc
+                    ),
+                    "latitude": decimal.Decimal("52.370216"),
+                    "code": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+                    "status": gettext_lazy("Upcoming"),
+                    "duration": datetime.timedelta(hours=2),
+                }
+            ],
+            "counts": {1: 10, 2: 0},
+            "next": None,
+        }
+
+    def test_matches_drf_json_renderer(self, payload):
+        rendered = ORJSONRenderer().render(payload)
+
+        assert json.loads(rendered) == json.loads(JSONRenderer().render(payload))
+        assert b'"2026-05-01T20:30:15.123456Z"' in rendered
+        assert b"52.370216" in rendered
+
+    def test_indented_responses_fall_back(self, payload):
+        rendered = ORJSONRenderer().render(
+            payload, "application/json; indent=2", {}
+        )
+        assert rendered.startswith(b"{\n  ")
+
+    def test_empty_body(self):
+        assert ORJSONRenderer().render(None) == b""
+
+
+class TestORJSONParser:
+
+    def test_round_trip(self):
+        body = ORJSONRenderer().render({"codes": ["A", "B"], "at": timezone.now()})
+        parsed = ORJSONParser().parse(io.BytesIO(body))
+
+        assert parsed["codes"] == ["A", "B"]
+
+    def test_malformed_body(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"codes": ['))
@@ -0,0 +1,115 @@
+import itertools
+import random
+import threading
+import time
+import pytest
+from django.core.cache import cache
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from app.caching.generations import CacheGenerations
+from app.caching.responses import CachedResponse, cache_response
+from app.caching.warming import HotPages
+from app.connections import get_redis
+from app.factories import factories
+from app.models import CustomUser
+
+
+class ProbeView(APIView):
+    """Counts how often the cached action actually runs."""
+
+    calls = 0
+    delay = 0
+
+    @cache_response("probe", 60)
+    def get(self, request):
+        type(self).calls += 1
+        time.sleep(self.delay)
+        return Response({"calls": type(self).calls})
+
+
+def get_probe():
+    response = ProbeView.as_view()(APIRequestFactory().get("/probe/"))
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        cache.clear()
+        ProbeView.calls, ProbeView.delay = 0, 0
+        yield
+        cache.clear()
+
+    def test_concurrent_misses_fill_once(self):
+        ProbeView.delay = 0.3
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(get_probe()))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert ProbeView.calls == 1
+        assert {r.content for r in responses} == {b'{"calls":1}'}
+
+    def test_stale_entry_served_while_refilling(self):
+        get_probe()
+        CacheGenerations.bump(CacheGenerations.key("probe"))
+        ProbeView.delay = 0.3
+        filler = threading.Thread(target=get_probe)
+        filler.start()
+        time.sleep(0.1)
+
+        started = time.monotonic()
+        stale = get_probe()
+        assert time.monotonic() - started < 0.2
+        assert stale.content == b'{"calls":1}'
+
+        filler.join()
+        assert get_probe().content == b'{"calls":2}'
+
+    def test_early_refresh_chance_grows_near_expiry(self):
+        now = time.time()
+        fresh = CachedResponse(b"", 200, "application/json", 0.05, now + 3600)
+        expiring = CachedResponse(b"", 200, "application/json", 0.05, now - 1)
+
+        assert not fresh.should_refresh()
+        assert expiring.should_refresh()
+
+    def test_hot_pages_are_warmed(self, monkeypatch):
+        monkeypatch.setattr(HotPages, "SAMPLE_RATE", 1)
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        client = APIClient()
+        client.get("/api/events/?page_size=10")
+
+        factories.EventFactory(organiser=organiser, title="Fresh Event").create()
+        # recorded in normalized form, without the default page size
+        assert HotPages.top("events") == ["http://testserver/api/events/"]
+        assert HotPages.warm("events") == 1
+
+        resp = client.get("/api/events/?page_size=10")
+        assert not hasattr(resp, "data")  # served from the cache
+        assert b"Fresh Event" in resp.content
+
+    def test_hot_pages_are_sampled_and_trimmed(self, monkeypatch):
+        monkeypatch.setattr(HotPages, "KEEP", 2)
+        draws = itertools.count()
+        monkeypatch.setattr(random, "randrange", lambda n: next(draws) % n)
+        for url in ["/c"] * 30 + ["/b"] * 20 + ["/a"] * 10:
+            HotPages.record("probe", url)
+
+        # counted one time in SAMPLE_RATE, the quietest page dropped
+        assert get_redis().zrevrange(HotPages.key("probe"), 0, -1, withscores=True) == [
+            (b"/c", 30),
+            (b"/b", 20),
+        ]
@@ -0,0 +1,117 @@
+import gzip
+import json
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from app.caching.responses import cache_response
+from app.compression import ResponseCompressor
+from app.middleware import CompressionMiddleware
+
+BODY = json.dumps([{"id": i, "title": "Event"} for i in range(200)]).encode()
+
+
+class LargeView(APIView):
+    @cache_response("large", 60)
+    def get(self, request):
+        return Response([{"id": i, "title": "Event"} for i in range(200)])
+
+
+def get_large(**headers):
+    response = LargeView.as_view()(APIRequestFactory().get("/large/", **headers))
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+def request_with(accept_encoding):
+    return APIRequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+
+
+class TestResponseCompressor:
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("", None),
+            ("gzip", "gzip"),
+            ("gzip;q=0, identity", None),
+            ("deflate, *;q=0.5", "gzip"),
+            ("identity, *;q=0", None),
+            ("GZIP ; q=0.8", "gzip"),
+        ],
+    )
+    def test_negotiates_accept_encoding(self, header, expected):
+        assert ResponseCompressor.negotiate(request_with(header)) == expected
+
+    def test_prefers_the_server_order_on_ties(self):
+        request = request_with("gzip, br, zstd")
+        assert ResponseCompressor.negotiate(request) == next(
+            iter(ResponseCompressor.encodings)
+        )
+
+    def test_compresses_above_the_threshold(self):
+        middleware = CompressionMiddleware(lambda request: HttpResponse(BODY))
+        response = middleware(request_with("gzip"))
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"] == "Accept-Encoding"
+        assert int(response["Content-Length"]) == len(response.content)
+        assert gzip.decompress(response.content) == BODY
+
+    @override_settings(RESPONSE_COMPRESSION={"MIN_LENGTH": len(BODY) + 1})
+    def test_skips_small_responses(self):
+        middleware = CompressionMiddleware(lambda request: HttpResponse(BODY))
+        response = middleware(request_with("gzip"))
+
+        assert not response.has_header("Content-Encoding")
+        assert response.content == BODY
+
+    def test_skips_streaming_responses(self):
+        middleware = CompressionMiddleware(
+            lambda request: StreamingHttpResponse(iter([BODY]))
+        )
+        response = middleware(request_with("gzip"))
+
+        assert not response.has_header("Content-Encoding")
+        assert b"".join(response.streaming_content) == BODY
+
+
+@pytest.mark.django_db
+class TestCachedResponseCompression:
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    def test_compressed_body_is_cached(self, monkeypatch):
+        filled = get_large(HTTP_ACCEPT_ENCODING="gzip")
+        assert filled["Content-Encoding"] == "gzip"
+        assert filled["ETag"].startswith('W/"')
+
+        compress = ResponseCompressor.compress
+        calls = []
+        monkeypatch.setattr(
+            ResponseCompressor,
+            "compress",
+            lambda content, encoding: calls.append(encoding)
+            or compress(content, encoding),
+        )
+        hit = get_large(HTTP_ACCEPT_ENCODING="gzip")
+
+        assert calls == []
+        assert hit.content == filled.content
+        assert json.loads(gzip.decompress(hit.content)) == json.loads(
+            get_large().content
+        )
+
+    def test_weak_etag_still_revalidates(self):
+        etag = get_large(HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        response = get_large(HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
@@ -0,0 +1,78 @@
+import pytest
+from django.db.models.signals import post_save
+from app.models import Ticket, Event, CustomUser
+from app.services.codes import TicketCodeService
+from app.services.tickets import TicketService
+from app.signals import generate_tickets
+from app.factories import factories
+
+
+class TestTicketCodeService:
+
+    def test_issue_and_decode_round_trip(self):
+        code = TicketCodeService.issue(42, 1337)
+
+        assert len(code) == TicketCodeService.CODE_LENGTH
+        assert TicketCodeService.decode(code) == (42, 1337)
+
+    def test_codes_are_unique_per_serial(self):
+        codes = {TicketCodeService.issue(1, serial) for serial in range(1, 5001)}
+        assert len(codes) == 5000
+
+    def test_decode_rejects_forged_code(self):
+        code = TicketCodeService.issue(7, 1)
+        forged = TicketCodeService.issue(7, 2)[:16] + code[16:]
+
+        with pytest.raises(ValueError):
+            TicketCodeService.decode(forged)
+
+    @pytest.mark.parametrize("code", ["", "not-a-code", "A" * 23, None])
+    def test_decode_rejects_malformed_code(self, code):
+        with pytest.raises(ValueError):
+            TicketCodeService.decode(code)
+
+    def test_is_valid_checks_event(self):
+        code = TicketCodeService.issue(3, 10)
+
+        assert TicketCodeService.is_valid(code)
+        assert TicketCodeService.is_valid(code, event_id=3)
+        assert not TicketCodeService.is_valid(code, event_id=4)
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+class TestIncreaseTicketsCodes:
+
+    @pytest.fixture(autouse=True)
+    def disconnect_ticket_generation(self):
+        post_save.disconnect(generate_tickets, sender=Event)
+        yield
+        post_save.connect(generate_tickets, sender=Event)
+
+    @pytest.fixture
+    def event(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        return factories.EventFactory(organiser=organiser).create()
+
+    def test_serials_continue_across_increases(self, event):
+        TicketService.increase_tickets(event, 3)
+        TicketService.increase_tickets(event, 2)
+
+        serials = sorted(
+            TicketCodeService.decode(code)[1]
+            for code in Ticket.objects.filter(event=event).values_list(
+                "ticket_code", flat=True
+            )
+        )
+        event.refresh_from_db()
+        assert serials == [1, 2, 3, 4, 5]
+        assert event.tickets_issued == 5
+
+    def test_serials_are_not_reused_after_decrease(self, event):
+        TicketService.increase_tickets(event, 3)
+        TicketService.decrease_unsold_tickets(event, 3)
+        TicketService.increase_tickets(event, 1)
+
+        code = Ticket.objects.get(event=event).ticket_code
+        assert TicketCodeService.decode(code) == (event.id, 4)
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import pytest
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from app.models import Ticket, Event, CustomUser
+from app.services.exports import TicketExportService
+from app.services.tickets import TicketService
+from app.signals import generate_tickets
+from app.factories import factories
+
+
+@pytest.fixture(autouse=True)
+def no_ticket_generation():
+    post_save.disconnect(generate_tickets, sender=Event)
+    yield
+    post_save.connect(generate_tickets, sender=Event)
+
+
+@pytest.mark.django_db(transaction=True, reset_sequences=True)
+class TestTicketExportService:
+
+    @pytest.fixture
+    def event(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        event = factories.EventFactory(organiser=organiser).create()
+        TicketService.increase_tickets(event, 7)
+        attendee = factories.UserFactory(
+            user_type=CustomUser.UserType.ATTENDEE
+        ).create()
+        Ticket.objects.filter(event=event, id__lte=2).update(attendee=attendee)
+        return event
+
+    def test_csv_has_a_header_and_a_row_per_ticket(self, event, monkeypatch):
+        monkeypatch.setattr(TicketExportService, "ROWS_PER_WRITE", 3)
+
+        chunks = list(TicketExportService.stream(event))
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+
+        assert len(chunks) == 3  # header and 7 rows, 3 lines per chunk
+        assert [int(r["ticket_id"]) for r in rows] == list(range(1, 8))
+        assert rows[0]["attendee_username"] and not rows[-1]["attendee_username"]
+        assert rows[0]["event_title"] == event.title
+
+    def test_csv_neutralises_formulas(self, event):
+        CustomUser.objects.filter(tickets__event=event).update(
+            username="=1+1", first_name="@SUM(A1)", last_name="-2"
+        )
+
+        exported = "".join(TicketExportService.stream(event))
+        rows = list(csv.DictReader(io.StringIO(exported)))
+        lines = "".join(
+            TicketExportService.stream(event, TicketExportService.NDJSON, True)
+        ).splitlines()
+
+        assert rows[0]["attendee_username"] == "'=1+1"
+        assert rows[0]["attendee_first_name"] == "'@SUM(A1)"
+        assert rows[0]["attendee_last_name"] == "'-2"
+        assert json.loads(lines[0])["attendee_username"] == "=1+1"
+
+    def test_ndjson_sold_only(self, event):
+        lines = "".join(
+            TicketExportService.stream(event, TicketExportService.NDJSON, True)
+        ).splitlines()
+
+        rows = [json.loads(line) for line in lines]
+        assert [r["ticket_id"] for r in rows] == [1, 2]
+        assert set(rows[0]) == set(TicketExportService.columns())
+
+    def test_unsupported_format(self, event):
+        with pytest.raises(ValueError):
+            next(TicketExportService.stream(event, "xlsx"))
+
+    def test_command_writes_the_export(self, event, tmp_path):
+        output = tmp_path / "tickets.csv"
+        call_command("export_tickets", event.id, "--sold-only", "-o", str(output))
+
+        rows = list(csv.DictReader(output.open()))
+        assert [int(r["ticket_id"]) for r in rows] == [1, 2]
@@ -0,0 +1,83 @@
+import time
+import pytest
+from django.core.cache import cache
+from app.caching.tiered import LocalCache, TieredCache
+
+
+def wait_until(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class TestLocalCache:
+
+    def test_least_recently_used_entry_is_evicted(self):
+        local = LocalCache(max_entries=2, timeout=60)
+        local.set_many({"a": 1, "b": 2})
+        local.get_many(["a"])
+        local.set_many({"c": 3})
+
+        assert local.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+        assert local.stats()["evictions"] == 1
+
+    def test_expired_entries_miss(self):
+        local = LocalCache(max_entries=10, timeout=-1)
+        local.set_many({"a": 1})
+
+        assert local.get_many(["a"]) == {}
+        assert local.stats()["misses"] == 1
+
+    def test_fill_racing_a_deletion_is_discarded(self):
+        local = LocalCache(max_entries=10, timeout=60)
+        version = local.version
+        local.delete_many(["a"])
+        local.set_many({"a": "stale"}, version)
+
+        assert local.get_many(["a"]) == {}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTieredCache:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def processes(self):
+        """Two tiers standing in for two processes sharing Redis."""
+        tiers = [TieredCache(100, 60), TieredCache(100, 60)]
+        for tier in tiers:
+            tier.ensure_listener()
+            wait_until(lambda: tier.listening)
+        return tiers
+
+    def test_hits_are_served_locally(self, processes):
+        tier, _ = processes
+        cache.set("k", "v")
+        tier.get_many(["k"])
+        cache.set("k", "changed behind its back")
+
+        assert tier.get_many(["k"]) == {"k": "v"}
+        assert tier.stats()["hits"] == 1
+
+    def test_writes_invalidate_other_processes(self, processes):
+        writer, reader = processes
+        writer.set("k", "old", 60)
+        assert reader.get_many(["k"]) == {"k": "old"}
+
+        writer.set("k", "new", 60)
+
+        wait_until(lambda: reader.get_many(["k"]) == {"k": "new"})
+
+    def test_negative_entries_are_invalidated_by_writes(self, processes):
+        writer, reader = processes
+        assert reader.get_many(["revoked"], negative=True) == {}
+
+        writer.set("revoked", 1, 60)
+
+        wait_until(lambda: reader.get_many(["revoked"], negative=True) == {"revoked": 1})
@@ -0,0 +1,65 @@
+import pytest
+from django.core.cache import cache
+from app.factories import factories
+from app.models import CustomUser, Event, Ticket
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTrackedFields:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def event(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        factories.EventFactory(organiser=organiser, tickets_amount=3).create()
+        return Event.objects.get()
+
+    def test_changes_are_known_without_a_query(self, event, django_assert_num_queries):
+        event.tickets_amount = 5
+
+        with django_assert_num_queries(0):
+            assert event.has_changed("tickets_amount")
+            assert not event.has_changed("organiser")
+            assert event.get_saved_value("tickets_amount") == 3
+
+    def test_save_resets_the_saved_values(self, event):
+        event.tickets_amount = 5
+        event.save()
+
+        assert event.changed_fields() == []
+        assert Ticket.objects.filter(event=event).count() == 5
+
+    def test_deferred_fields_fall_back_to_a_query(
+        self, event, django_assert_num_queries
+    ):
+        deferred = Event.objects.only("id", "title").get(id=event.id)
+
+        with django_assert_num_queries(1):
+            assert deferred.get_saved_value("tickets_amount") == 3
+
+    def test_saving_other_fields_skips_the_ticket_resize(self, event, monkeypatch):
+        monkeypatch.setattr(
+            "app.services.tickets.TicketService.increase_tickets",
+            lambda *args, **kwargs: pytest.fail("tickets resized"),
+        )
+        event.title = "Renamed"
+
+        event.save()
+
+        assert Ticket.objects.filter(event=event).count() == 3
+
+    def test_saving_other_fields_does_not_select_the_event(
+        self, event, django_assert_num_queries
+    ):
+        event.title = "Renamed"
+
+        # the UPDATE, and the attendee lookup of the cache flush
+        with django_assert_num_queries(2):
+            event.save()
@@ -0,0 +1,73 @@
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from app.caching.collector import TransactionCollector
+from app.caching.generations import CacheGenerations
+from app.factories import factories
+from app.models import CustomUser
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTransactionCollector:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+        yield
+        cache.clear()
+
+    @pytest.fixture
+    def flushed(self):
+        """Record what the test kind flushes."""
+        flushed = []
+        TransactionCollector.register(
+            "test", lambda items, pipe: flushed.append(sorted(items))
+        )
+        yield flushed
+        TransactionCollector.handlers.pop("test")
+
+    def test_items_are_flushed_once_on_commit(self, flushed):
+        with transaction.atomic():
+            TransactionCollector.add("test", [1, 2])
+            TransactionCollector.add("test", [2, 3])
+            assert flushed == []
+
+        assert flushed == [[1, 2, 3]]
+
+    def test_items_are_flushed_at_once_outside_transactions(self, flushed):
+        TransactionCollector.add("test", [1])
+        TransactionCollector.add("test", [2])
+
+        assert flushed == [[1], [2]]
+
+    def test_rolled_back_transaction_does_not_block_later_flushes(self, flushed):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                TransactionCollector.add("test", [1])
+                raise RuntimeError
+
+        with transaction.atomic():
+            TransactionCollector.add("test", [2])
+
+        assert flushed == [[1, 2]]  # the stale item costs a spurious flush only
+
+    def test_flush_is_idempotent(self, flushed):
+        with transaction.atomic():
+            TransactionCollector.add("test", [1])
+            TransactionCollector.flush()
+            TransactionCollector.flush()
+
+        assert flushed == [[1]]
+
+    def test_saving_many_events_bumps_counters_once(self):
+        organiser = factories.UserFactory(
+            user_type=CustomUser.UserType.ORGANISER
+        ).create()
+        key = CacheGenerations.key("events")
+        [before] = CacheGenerations.get_many([key])
+
+        with transaction.atomic():
+            for _ in range(5):
+                factories.EventFactory(organiser=organiser).create()
+
+        assert CacheGenerations.get_many([key]) == [before + 1]
@@ -27,6 +27,10 @@ app.conf.beat_schedule = {
         'task': 'app.tasks.release_expired_tickets',
         'schedule': 60.0, 
     },
+    'prune_event_tombstones_daily': {
+        'task': 'app.tasks.prune_event_tombstones',
+        'schedule': 60.0 * 60 * 24,
+    },
     'debug_heartbeat': {
         'task': 'events_planning_django.celery.check_schedule',
         'schedule': 5.0,  
@@ -57,6 +57,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # outermost after security, to compress what the others send
+    "app.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,10 +88,45 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
         # "rest_framework.authentication.BasicAuthentication",
+        "app.apis.authentication.SignedTokenAuthentication",
         "rest_framework.authentication.TokenAuthentication",
     ],
+    # orjson, with DRF's JSON classes as fallback; see manage.py bench_renderers
+    "DEFAULT_RENDERER_CLASSES": [
+        "app.apis.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "app.apis.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Lifetime in seconds of the signed access tokens issued on login
+ACCESS_TOKEN_TTL = 60 * 15
+
+# responses of at least MIN_LENGTH bytes are sent brotli, zstd or gzip
+# compressed, as negotiated with Accept-Encoding; see app.compression
+RESPONSE_COMPRESSION = {"MIN_LENGTH": 1024}
+
+# /api/batch/ sub-requests per batch, and threads running its reads at once
+BATCH_REQUESTS = {"MAX_REQUESTS": 20, "MAX_WORKERS": 4}
+
+# /api/events/changes/: rows per stream and page, how long rows settle before
+# being read, how long cursors stay valid (deletions are kept a day longer),
+# and the window in which availability changes share one stamp per event
+CHANGE_FEED = {
+    "PAGE_SIZE": 100,
+    "MAX_PAGE_SIZE": 500,
+    "SETTLE_SECONDS": 5,
+    "TOMBSTONE_DAYS": 30,
+    "AVAILABILITY_COALESCE_SECONDS": 5,
+}
+
+# in-process cache tier in front of Redis, see app.caching.tiered
+TIERED_CACHE = {"MAX_ENTRIES": 10_000, "TIMEOUT": 30}
+
 
 CACHES = {
     "default": {
@@ -97,6 +134,10 @@ CACHES = {
         "LOCATION": REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # values of 1 KiB or more are stored zstd, lz4 or zlib compressed,
+            # whichever is installed first; see manage.py bench_cache_codec
+            "COMPRESSOR": "app.caching.compressors.ThresholdCompressor",
+            "COMPRESS_MIN_LENGTH": 1024,
         },
     }
 }
@@ -112,6 +153,10 @@ SPECTACULAR_SETTINGS = {
     "SWAGGER_UI_DIST": "SIDECAR",
     "SWAGGER_UI_FAVICON_HREF": "SIDECAR",
     "REDOC_DIST": "SIDECAR",
+    # the Swagger UI served at / would otherwise widen the common prefix,
+    # and with it every operation ID and tag
+    "SCHEMA_PATH_PREFIX": "/api/",
+    "GET_LIB_DOC_EXCLUDES": "app.apis.schema.get_lib_doc_excludes",
     "SECURITY": [{"TokenAuth": []}],
     "SECURITY_DEFINITIONS": {
         "TokenAuth": {